@@ -0,0 +1,262 @@
+"""
+Performance benchmarks of WildfirePy, run against a local `USGSMirror`.
+
+WildfirePy has to be installed, e.g. with `pip install -e .`. Usage::
+
+    python benchmarks/run.py                       # run all benchmarks
+    python benchmarks/run.py -k download           # run benchmarks whose name contains "download"
+    python benchmarks/run.py --compare benchmarks/results/<previous>.json
+
+Results are saved as `json` to `benchmarks/results/`, with the commit and
+the machine they were measured on, and can be compared with an earlier run.
+"""
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+from wildfirepy.net.usgs import ModisBurntAreaDownloader
+from wildfirepy.net.util import (Listing, MODISHtmlParser, RequestScheduler, URLOpenerWithRedirect,
+                                 USGSMirror)
+from pathlib import Path
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+RESULTS = Path(__file__).parent / 'results'
+BENCHMARKS = {}
+
+
+def benchmark(function):
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+def timeit(function, repeat=5, number=1):
+    """
+    Returns the best time, in seconds, of `number` calls of `function`.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def random_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-60, 70, n), rng.uniform(-180, 180, n)
+
+
+@benchmark
+def coordinate_conversion():
+    converter = SinusoidalCoordinate()
+    latitude, longitude = random_points(100000)
+    scalar = timeit(lambda: [converter(lat, lon)
+                             for lat, lon in zip(latitude[:2000], longitude[:2000])])
+    vectorized = timeit(lambda: converter.get_modis_grid_coords(latitude, longitude))
+    return {'scalar_points_per_s': 2000 / scalar,
+            'vectorized_points_per_s': latitude.size / vectorized}
+
+
+@benchmark
+def import_time(repeat=10):
+    """
+    Startup time of fresh interpreters importing WildfirePy, over that of an empty interpreter.
+    """
+    def run(code):
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], check=True)
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    baseline = run('pass')
+    count = 'import sys, wildfirepy; print(len(sys.modules))'
+    loaded = subprocess.run([sys.executable, '-c', count], stdout=subprocess.PIPE,
+                            check=True).stdout
+    version = run('import wildfirepy; getattr(wildfirepy, "__version__", None)')
+    downloader = run('from wildfirepy.net.usgs import ModisBurntAreaDownloader')
+    return {'wildfirepy_ms': (run('import wildfirepy') - baseline) * 1000,
+            'net_usgs_ms': (run('import wildfirepy.net.usgs') - baseline) * 1000,
+            'modis_downloader_ms': (downloader - baseline) * 1000,
+            'coordinates_util_ms': (run('import wildfirepy.coordinates.util') - baseline) * 1000,
+            'version_ms': (version - baseline) * 1000,
+            'modules_after_import': int(loaded)}
+
+
+@benchmark
+def listing_parse():
+    with USGSMirror() as mirror:
+        mirror.add_modis(months=[(2020, 2)])
+        html = mirror.get_content('/MOTA/MCD64A1.006/2020.02.01/').decode('cp1252')
+    seconds = timeit(lambda: Listing.from_html(html))
+    return {'files': len(Listing.from_html(html)), 'seconds': seconds}
+
+
+@benchmark
+def get_filename_lookup():
+    converter = SinusoidalCoordinate()
+    with USGSMirror() as mirror:
+        base_url = mirror.add_modis(months=[(2020, 2)])
+        parser = MODISHtmlParser(product='MCD64A1', session=URLOpenerWithRedirect())
+        parser(base_url + '2020.02.01/')
+    tiles = [converter(lat, lon) for lat, lon in zip(*random_points(1000))]
+    tiles = [(h, v) for h, v in tiles
+             if parser.listing.get(tile=f'h{h:02d}v{v:02d}', extension='hdf')]
+    seconds = timeit(lambda: [parser.get_filename(h, v) for h, v in tiles])
+    return {'lookups_per_s': len(tiles) / seconds}
+
+
+@benchmark
+def single_download(size=64 * 1024 ** 2):
+    with USGSMirror() as mirror, tempfile.TemporaryDirectory() as directory:
+        mirror.add_file('/data.hdf', size)
+        mirror.get_content('/data.hdf')
+        downloader = ModisBurntAreaDownloader()
+        seconds = timeit(lambda: downloader.fetch(mirror.url + '/data.hdf', path=directory,
+                                                  filename='data.hdf'), repeat=3)
+    return {'bytes': size, 'seconds': seconds, 'mb_per_s': size / seconds / 1024 ** 2}
+
+
+@benchmark
+def bulk_download_scaling(workers=(1, 2, 4, 8, 16), latency=0.02):
+    latitude, longitude = random_points(64, seed=1)
+    results = {}
+    with USGSMirror(latency=latency) as mirror:
+        base_url = mirror.add_modis(months=[(2020, 2)], size=256 * 1024)
+        for max_workers in workers:
+            with tempfile.TemporaryDirectory() as directory:
+                downloader = ModisBurntAreaDownloader()
+                downloader.base_url = base_url
+                requests = [(2020, 2, lat, lon) for lat, lon in zip(latitude, longitude)]
+                started = time.perf_counter()
+                batch = downloader.get_batch(requests, max_workers=max_workers, path=directory)
+                seconds = time.perf_counter() - started
+            files = len({result.path for result in batch if result.path is not None})
+            results[str(max_workers)] = {'files': files, 'seconds': seconds,
+                                         'files_per_s': files / seconds}
+    return {'latency': latency, 'workers': results}
+
+
+@benchmark
+def rate_limited_download(max_requests=4, max_workers=16, latency=0.02):
+    latitude, longitude = random_points(64, seed=1)
+    results = {}
+    # A decrease of 1 keeps the limit fixed, so that the adaptive limit can be compared
+    # with retries alone.
+    for name, decrease in [('fixed', 1.0), ('adaptive', 0.5)]:
+        with USGSMirror(latency=latency, max_requests=max_requests) as mirror, \
+                tempfile.TemporaryDirectory() as directory:
+            scheduler = RequestScheduler(max_connections=max_workers, backoff=0.05, retries=10,
+                                         decrease=decrease)
+            downloader = ModisBurntAreaDownloader(scheduler=scheduler)
+            downloader.base_url = mirror.add_modis(months=[(2020, 2)], size=256 * 1024)
+            requests = [(2020, 2, lat, lon) for lat, lon in zip(latitude, longitude)]
+            started = time.perf_counter()
+            batch = downloader.get_batch(requests, max_workers=max_workers, path=directory)
+            seconds = time.perf_counter() - started
+            files = len({result.path for result in batch if result.path is not None})
+            results[name] = {'files': files, 'seconds': seconds, 'files_per_s': files / seconds,
+                             'rejected': mirror.rejected, 'connections': scheduler.connections}
+    return {'max_requests': max_requests, 'latency': latency, 'schedulers': results}
+
+
+@benchmark
+def burned_pixel_extraction(tiles=8, burned=0.05):
+    from pyhdf.SD import SD, SDC
+    from wildfirepy.io.extract import extract_burned_pixels
+
+    rng = np.random.default_rng(0)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(tiles):
+            shape = (2400, 2400)
+            burn_date = np.where(rng.random(shape) < burned, rng.integers(1, 367, shape), 0)
+            name = f'MCD64A1.A2020032.h{10 + i:02d}v05.006.2020102113321.hdf'
+            paths.append(str(Path(directory, name)))
+            qa = rng.integers(0, 256, shape)
+            file = SD(paths[-1], SDC.WRITE | SDC.CREATE)
+            for name, dtype, values in (('Burn Date', SDC.INT16, burn_date.astype(np.int16)),
+                                        ('QA', SDC.UINT8, qa.astype(np.uint8))):
+                dataset = file.create(name, dtype, shape)
+                dataset[:] = values
+                dataset.endaccess()
+            file.end()
+
+        for max_workers in (1, 2, 4):
+            seconds = timeit(lambda: extract_burned_pixels(paths, max_workers=max_workers),
+                             repeat=3)
+            results[str(max_workers)] = {'seconds': seconds, 'tiles_per_s': tiles / seconds}
+        pixels = extract_burned_pixels(paths[:1], max_workers=1)
+    return {'pixels_per_tile': len(pixels), 'bytes_per_pixel': pixels.itemsize, 'workers': results}
+
+
+def get_commit():
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, cwd=Path(__file__).parent).stdout
+        return output.decode().strip()
+    except OSError:
+        return ''
+
+
+def flatten(results, prefix=''):
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{prefix}{key}.'))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(previous, current):
+    old = flatten(previous['results'])
+    print(f"{'':50s} {previous['commit']:>14s} {current['commit']:>14s}")
+    for key, value in flatten(current['results']).items():
+        if key in old and isinstance(value, (int, float)) and old[key]:
+            print(f'{key:50s} {old[key]:14.4g} {value:14.4g} {value / old[key]:8.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', dest='keyword', default='',
+                        help="Only run benchmarks whose name contains this.")
+    parser.add_argument('--output', default=None,
+                        help="File to save the results to.")
+    parser.add_argument('--compare', default=None,
+                        help="Results of an earlier run to compare with.")
+    args = parser.parse_args()
+
+    results = {}
+    for name, function in BENCHMARKS.items():
+        if args.keyword in name:
+            print(f'Running {name}...')
+            results[name] = function()
+
+    date = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+    run = {'commit': get_commit(), 'date': date,
+           'python': platform.python_version(), 'machine': platform.platform(),
+           'processor': platform.processor(), 'results': results}
+    output = RESULTS / f"{date.replace(':', '')}-{run['commit']}.json"
+    if args.output:
+        output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(run, indent=2))
+    print(json.dumps(results, indent=2))
+    print(f'Results saved to {output}')
+
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text()), run)
+
+
+if __name__ == '__main__':
+    main()
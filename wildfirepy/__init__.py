@@ -1,10 +1,25 @@
-from wildfirepy import net
-from wildfirepy import coordinates
+import importlib
 
-__all__ = ['net', 'coordinates']
+__all__ = ['net', 'coordinates', 'io']
 
-from pkg_resources import get_distribution, DistributionNotFound
-try:
-    __version__ = get_distribution(__name__).version
-except DistributionNotFound:
-    pass  # package is not installed
+# Whether the version was looked up already, so that it is only looked up once, installed or not.
+_version_looked_up = False
+
+
+def __getattr__(name):
+    # Subpackages are imported on first use, so that short-lived scripts only pay for what they use.
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name == '__version__' and not _version_looked_up:
+        from importlib.metadata import version, PackageNotFoundError
+        globals()['_version_looked_up'] = True
+        try:
+            globals()['__version__'] = version(__name__)
+            return globals()['__version__']
+        except PackageNotFoundError:
+            pass  # package is not installed
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,3 +1,14 @@
-from wildfirepy.coordinates import util
+import importlib
 
-__all__ = ['util']
+__all__ = ['util', 'tiles', 'footprints']
+
+
+def __getattr__(name):
+    # Submodules are imported on first use.
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,255 @@
+from pathlib import Path
+import json
+import math
+import os
+import tempfile
+import numpy as np
+
+__all__ = ['GranuleFootprintIndex', 'swath_footprint']
+
+
+class GranuleFootprintIndex:
+    """
+    Description
+    -----------
+    Spatial index of the footprints of VIIRS swath granules, such as the
+    downloaded `VNP03MODLL` `h5` files.
+
+    The latitude and longitude arrays of a granule are read only once, when it
+    is added. The swath is split along track into `segments` blocks of scans,
+    and the bounding box of every block is kept; blocks crossing the
+    antimeridian are split in two. Boxes are registered in a regular grid of
+    `cell_size` degrees, so point and bounding box queries only look at the
+    boxes of a few grid cells and never reopen a file.
+    The index can be saved to, and loaded from, a `json` file.
+
+    Parameters
+    ----------
+    cell_size: `float`
+        Size of the cells of the grid, in degrees.
+    segments: `int`
+        Number of along track blocks each swath is split into.
+
+    Examples
+    --------
+    >>> index = GranuleFootprintIndex()
+    >>> index.add(downloader.get_h5(year=2020, month=2, date=1, hours=6, minutes=42))
+    >>> index.query_point(28.7041, 77.1025)
+    >>> index.save('~/.wildfirepy/footprints.json')
+    """
+    LATITUDE = 'Latitude'
+    LONGITUDE = 'Longitude'
+
+    def __init__(self, cell_size=1.0, segments=8):
+        self.cell_size = cell_size
+        self.segments = segments
+        self.footprints = {}
+        self.paths = {}
+        self._grid = {}
+
+    def __len__(self):
+        return len(self.footprints)
+
+    def __contains__(self, name):
+        return name in self.footprints
+
+    def add(self, path, name=None):
+        """
+        Reads the geolocation arrays of the `h5` file at `path` and adds its footprint.
+        Parameters
+        ----------
+        path: `str`
+            Path to the `h5` file.
+        name: `str`
+            Name of the granule in the index. Defaults to the name of the file.
+        Returns
+        -------
+        name: `str`
+            Name of the granule in the index.
+        """
+        try:
+            import h5py
+        except ImportError:
+            raise ImportError("Reading VIIRS granules requires `h5py` to be installed.") from None
+
+        with h5py.File(path, 'r') as file:
+            latitude = _find_dataset(file, self.LATITUDE)[()]
+            longitude = _find_dataset(file, self.LONGITUDE)[()]
+
+        name = Path(path).name if name is None else name
+        self.add_footprint(name, swath_footprint(latitude, longitude, self.segments))
+        self.paths[name] = Path(path).absolute().as_posix()
+        return name
+
+    def add_footprint(self, name, boxes):
+        """
+        Adds a granule from the bounding boxes of its footprint.
+        Parameters
+        ----------
+        name: `str`
+            Name of the granule in the index.
+        boxes: iterable
+            (lat_min, lat_max, lon_min, lon_max) boxes covering the granule, in degrees,
+            with `lon_min <= lon_max`.
+        """
+        if name in self.footprints:
+            self.remove(name)
+
+        self.footprints[name] = [tuple(float(value) for value in box) for box in boxes]
+        for box in self.footprints[name]:
+            for cell in self._cells(*box):
+                self._grid.setdefault(cell, set()).add(name)
+
+    def remove(self, name):
+        """
+        Removes a granule from the index.
+        """
+        for box in self.footprints.pop(name):
+            for cell in self._cells(*box):
+                names = self._grid.get(cell)
+                if names is not None:
+                    names.discard(name)
+                    if not names:
+                        del self._grid[cell]
+        self.paths.pop(name, None)
+
+    def query_point(self, latitude, longitude):
+        """
+        Returns the sorted names of the granules whose footprint contains a point.
+        Parameters
+        ----------
+        latitude: `float`
+            latitude of the point.
+        longitude: `float`
+            longitude of the point.
+        """
+        names = self._grid.get(self._cell(latitude, longitude), ())
+        return sorted(name for name in names
+                      if any(lat_min <= latitude <= lat_max and lon_min <= longitude <= lon_max
+                             for lat_min, lat_max, lon_min, lon_max in self.footprints[name]))
+
+    def query_bbox(self, lat_min, lat_max, lon_min, lon_max):
+        """
+        Returns the sorted names of the granules whose footprint intersects a bounding box.
+        Bounding boxes crossing the antimeridian can be given with `lon_min > lon_max`.
+        Parameters
+        ----------
+        lat_min, lat_max: `float`
+            Latitude bounds of the box, in degrees.
+        lon_min, lon_max: `float`
+            Longitude bounds of the box, in degrees.
+        """
+        if lat_min > lat_max:
+            raise ValueError("lat_min must not be greater than lat_max.")
+
+        if lon_min > lon_max:
+            queries = [(lat_min, lat_max, lon_min, 180), (lat_min, lat_max, -180, lon_max)]
+        else:
+            queries = [(lat_min, lat_max, lon_min, lon_max)]
+
+        found = set()
+        for query in queries:
+            candidates = set()
+            for cell in self._cells(*query):
+                candidates |= self._grid.get(cell, set())
+            found.update(name for name in candidates - found
+                         if any(_intersects(box, query) for box in self.footprints[name]))
+        return sorted(found)
+
+    def save(self, path):
+        """
+        Writes the index to the `json` file at `path`.
+        """
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = {'cell_size': self.cell_size, 'segments': self.segments,
+                   'footprints': self.footprints, 'paths': self.paths}
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(content, file)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads an index written by `save` from the `json` file at `path`.
+        """
+        content = json.loads(Path(path).expanduser().read_text())
+        index = cls(cell_size=content['cell_size'], segments=content['segments'])
+        for name, boxes in content['footprints'].items():
+            index.add_footprint(name, boxes)
+        index.paths.update(content['paths'])
+        return index
+
+    def _cell(self, latitude, longitude):
+        rows = math.ceil(180 / self.cell_size)
+        columns = math.ceil(360 / self.cell_size)
+        return (min(max(int((latitude + 90) // self.cell_size), 0), rows - 1),
+                min(max(int((longitude + 180) // self.cell_size), 0), columns - 1))
+
+    def _cells(self, lat_min, lat_max, lon_min, lon_max):
+        row_min, column_min = self._cell(lat_min, lon_min)
+        row_max, column_max = self._cell(lat_max, lon_max)
+        return [(row, column) for row in range(row_min, row_max + 1)
+                for column in range(column_min, column_max + 1)]
+
+
+def swath_footprint(latitude, longitude, segments=8):
+    """
+    Returns the bounding boxes of the footprint of a swath.
+    Parameters
+    ----------
+    latitude: array-like
+        Latitudes of the pixels of the swath, along track first.
+        Values outside [-90, 90] are treated as fill values.
+    longitude: array-like
+        Longitudes of the pixels of the swath.
+        Values outside [-180, 180] are treated as fill values.
+    segments: `int`
+        Number of along track blocks the swath is split into.
+    Returns
+    -------
+    boxes: `list`
+        (lat_min, lat_max, lon_min, lon_max) boxes, in degrees.
+    """
+    latitude = np.asarray(latitude, dtype=np.float64)
+    longitude = np.asarray(longitude, dtype=np.float64)
+    if latitude.shape != longitude.shape:
+        raise ValueError("latitude and longitude must have the same shape.")
+
+    boxes = []
+    for lat, lon in zip(np.array_split(latitude, segments), np.array_split(longitude, segments)):
+        valid = (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+        if not valid.any():
+            continue
+        lat, lon = lat[valid], lon[valid]
+        boxes.extend(_longitude_ranges(lat.min(), lat.max(), lon))
+    return boxes
+
+
+def _longitude_ranges(lat_min, lat_max, longitude):
+    # A block crossing the antimeridian is narrower when longitudes are taken in [0, 360).
+    wrapped = np.mod(longitude, 360)
+    if wrapped.max() - wrapped.min() < longitude.max() - longitude.min() and wrapped.max() > 180:
+        return [(lat_min, lat_max, wrapped.min(), 180.0),
+                (lat_min, lat_max, -180.0, wrapped.max() - 360)]
+    return [(lat_min, lat_max, longitude.min(), longitude.max())]
+
+
+def _intersects(box, query):
+    return (box[0] <= query[1] and query[0] <= box[1] and
+            box[2] <= query[3] and query[2] <= box[3])
+
+
+def _find_dataset(file, name):
+    found = []
+
+    def visit(path, item):
+        if path.rsplit('/', 1)[-1].lower() == name.lower() and hasattr(item, 'shape'):
+            found.append(item)
+            return True
+
+    file.visititems(visit)
+    if not found:
+        raise ValueError(f"No {name} dataset in {file.filename}.")
+    return found[0]
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from wildfirepy.coordinates.footprints import GranuleFootprintIndex, swath_footprint
+
+
+def make_swath(lat_min, lat_max, lon_min, lon_max, shape=(40, 30)):
+    latitude, longitude = np.meshgrid(np.linspace(lat_max, lat_min, shape[0]),
+                                      np.linspace(lon_min, lon_max, shape[1]), indexing='ij')
+    return latitude, (longitude + 180) % 360 - 180
+
+
+@pytest.fixture
+def granule(tmpdir):
+    h5py = pytest.importorskip('h5py')
+    latitude, longitude = make_swath(20, 35, 70, 90)
+    latitude[0, 0] = longitude[0, 0] = -999.9
+    path = tmpdir / 'VNP03MODLL.A2020032.0642.001.2020033040609.h5'
+    with h5py.File(path, 'w') as file:
+        fields = file.create_group('HDFEOS/SWATHS/VNP_750M_GEOLOCATION/Geolocation Fields')
+        fields['Latitude'] = latitude
+        fields['Longitude'] = longitude
+    return path
+
+
+def test_swath_footprint_antimeridian():
+    boxes = swath_footprint(*make_swath(-20, -10, 170, 190), segments=1)
+
+    assert boxes == [(-20, -10, 170, 180), (-20, -10, -180, pytest.approx(-170))]
+
+
+def test_add_and_query(granule):
+    index = GranuleFootprintIndex()
+    name = index.add(granule)
+
+    assert name == 'VNP03MODLL.A2020032.0642.001.2020033040609.h5'
+    assert index.query_point(28.7041, 77.1025) == [name]
+    assert index.query_point(-17.71, 178.07) == []
+    assert index.query_bbox(34, 40, 89, 100) == [name]
+    assert index.query_bbox(36, 40, 70, 90) == []
+
+
+def test_query_antimeridian():
+    index = GranuleFootprintIndex()
+    index.add_footprint('fiji', swath_footprint(*make_swath(-20, -10, 170, 190)))
+    index.add_footprint('delhi', swath_footprint(*make_swath(20, 35, 70, 90)))
+
+    assert index.query_point(-17.71, 178.07) == ['fiji']
+    assert index.query_point(-17.71, -175) == ['fiji']
+    assert index.query_bbox(-30, 30, 175, -175) == ['fiji']
+    assert index.query_bbox(-30, 30, 0, 180) == ['delhi', 'fiji']
+
+    index.remove('fiji')
+    assert index.query_point(-17.71, 178.07) == []
+
+
+def test_save_and_load(tmpdir, granule):
+    index = GranuleFootprintIndex(cell_size=2)
+    name = index.add(granule)
+    index.save(tmpdir / 'footprints.json')
+
+    loaded = GranuleFootprintIndex.load(tmpdir / 'footprints.json')
+
+    assert loaded.cell_size == 2
+    assert name in loaded
+    assert loaded.paths[name] == index.paths[name]
+    assert loaded.query_point(28.7041, 77.1025) == [name]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from wildfirepy.coordinates.tiles import get_tile_index
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+
+
+@pytest.fixture
+def index():
+    return get_tile_index()
+
+
+def test_valid_tiles(index):
+    # The MODIS Sinusoidal grid has 460 tiles that are not entirely fill.
+    assert len(index.valid_tiles()) == 460
+    assert index.is_valid(24, 6)
+    assert not index.is_valid(0, 0)
+    assert not index.is_valid(36, 0)
+
+
+def test_footprint(index):
+    lat_min, lat_max, lon_min, lon_max = index.footprint(24, 6)
+
+    assert lat_min == pytest.approx(20)
+    assert lat_max == pytest.approx(30)
+    assert lon_min < 77.1025 < lon_max
+
+    with pytest.raises(ValueError):
+        index.footprint(0, 0)
+
+
+def test_bbox_matches_forward_projection(index):
+    converter = SinusoidalCoordinate()
+    lat, lon = np.meshgrid(np.linspace(20.5, 31.5, 50), np.linspace(70.5, 89.5, 50))
+    h, v, _, _ = converter.get_modis_grid_coords(lat.ravel(), lon.ravel())
+
+    tiles = set(index.tiles_in_bbox(lat_min=20.5, lat_max=31.5, lon_min=70.5, lon_max=89.5))
+
+    assert set(zip(h.tolist(), v.tolist())) == tiles
+
+
+def test_bbox_across_antimeridian(index):
+    tiles = index.tiles_in_bbox(lat_min=-5, lat_max=5, lon_min=175, lon_max=-175)
+
+    assert set(tiles) == {(0, 8), (0, 9), (35, 8), (35, 9)}
+
+
+def test_polygon_is_subset_of_bbox(index):
+    latitude = [20.5, 20.5, 31.5]
+    longitude = [70.5, 89.5, 89.5]
+
+    in_polygon = set(index.tiles_in_polygon(latitude, longitude))
+    in_bbox = set(index.tiles_in_bbox(20.5, 31.5, 70.5, 89.5))
+
+    assert (24, 6) in in_polygon
+    assert (24, 5) not in in_polygon
+    assert in_polygon < in_bbox
+
+
+def test_available_tiles(index):
+    restricted = index.with_available([(24, 6), (0, 0)])
+
+    assert restricted.valid_tiles() == [(24, 6)]
+    assert restricted.tiles_in_bbox(20.5, 31.5, 70.5, 89.5) == [(24, 6)]
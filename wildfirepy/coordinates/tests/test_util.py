@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+
+
+@pytest.fixture
+def converter():
+    return SinusoidalCoordinate()
+
+
+@pytest.fixture
+def obs_coordinates():
+    return {'latitude': [28.7041, 30.3244, -33.8688, 37.7749],
+            'longitude': [77.1025, 78.0418, 151.2093, -122.4194]}
+
+
+def test_batch_matches_scalar(converter, obs_coordinates):
+    h, v, row, col = converter.get_modis_grid_coords(**obs_coordinates)
+
+    points = zip(obs_coordinates['latitude'], obs_coordinates['longitude'])
+    expected = [converter(lat, lon) for lat, lon in points]
+
+    assert list(zip(h.tolist(), v.tolist())) == expected
+
+
+def test_batch_cells_inside_tile(converter, obs_coordinates):
+    _, _, row, col = converter.get_modis_grid_coords(**obs_coordinates)
+
+    assert ((row >= 0) & (row < converter.CELLS)).all()
+    assert ((col >= 0) & (col < converter.CELLS)).all()
+
+
+def test_batch_scalar_input(converter):
+    h, v, row, col = converter.get_modis_grid_coords(latitude=28.7041, longitude=77.1025)
+
+    assert (int(h), int(v)) == (24, 6)
+    assert np.ndim(row) == np.ndim(col) == 0
+
+
+def test_get_pixel_bounds():
+    coords = SinusoidalCoordinate()
+    row_start, row_stop, col_start, col_stop = coords.get_pixel_bounds(20.33, 29.71, 70.2, 79.9)
+
+    latitude, longitude = np.meshgrid(np.linspace(20.33, 29.71, 21), np.linspace(70.2, 79.9, 21))
+    h, v, row, col = coords.get_modis_grid_coords(latitude, longitude)
+    rows, cols = v * coords.CELLS + row, h * coords.CELLS + col
+
+    assert rows.min() == row_start and rows.max() == row_stop - 1
+    assert cols.min() == col_start and cols.max() == col_stop - 1
+
+    with pytest.raises(ValueError):
+        coords.get_pixel_bounds(20, 30, 170, -170)
+
+
+def test_projection_is_shared():
+    assert SinusoidalCoordinate().MODIS_GRID is SinusoidalCoordinate().MODIS_GRID
@@ -0,0 +1,253 @@
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+from functools import lru_cache
+import numpy as np
+
+
+__all__ = ['ModisTileIndex', 'get_tile_index']
+
+
+class ModisTileIndex:
+    """
+    Precomputed index of the geographic footprints of the MODIS Sinusoidal tiles.
+
+    The footprint of every tile of the 36x18 grid is computed once, from the
+    part of the tile that lies on the projected globe. Tiles that are
+    completely off the globe are marked as invalid.
+    Region queries are answered exactly in projected space, using only the
+    precomputed tile bounds.
+
+    Parameters
+    ----------
+    converter: `wildfirepy.coordinates.util.SinusoidalCoordinate`
+        Converter whose grid definition and `MODIS_GRID` projection are used.
+        A new one is created by default.
+    available: iterable of (`int`, `int`)
+        (h, v) pairs of the tiles for which data exists, for example the tiles
+        listed on a product's directory page. By default, every tile on the
+        globe is considered available.
+
+    Examples
+    --------
+    >>> index = get_tile_index()
+    >>> index.footprint(24, 6)
+    >>> index.tiles_in_bbox(lat_min=20, lat_max=32, lon_min=70, lon_max=90)
+    """
+    def __init__(self, converter=None, available=None):
+        self.converter = SinusoidalCoordinate() if converter is None else converter
+        c = self.converter
+
+        v, h = np.mgrid[0:c.VERTICAL_TILES, 0:c.HORIZONTAL_TILES]
+        self.x_min = h * c.TILE_WIDTH - c.EARTH_WIDTH * 0.5
+        self.x_max = self.x_min + c.TILE_WIDTH
+        self.y_max = c.EARTH_WIDTH * 0.25 - v * c.TILE_HEIGHT
+        self.y_min = self.y_max - c.TILE_HEIGHT
+
+        # Part of each tile that lies on the globe: |x| <= EARTH_WIDTH / 2 * cos(lat).
+        nearest_x = np.where(self.x_min * self.x_max < 0, 0,
+                             np.minimum(np.abs(self.x_min), np.abs(self.x_max)))
+        y_limit = np.arccos(np.clip(nearest_x / (c.EARTH_WIDTH * 0.5), 0, 1)) * c.EARTH_RADIUS
+        y_low = np.maximum(self.y_min, -y_limit)
+        y_high = np.minimum(self.y_max, y_limit)
+        self.on_globe = y_low < y_high
+
+        _, self.lat_min = c.MODIS_GRID(np.zeros_like(y_low), y_low, inverse=True)
+        _, self.lat_max = c.MODIS_GRID(np.zeros_like(y_high), y_high, inverse=True)
+
+        # Longitudes grow in magnitude with latitude, so the extremes are reached
+        # at the lowest and highest absolute latitudes of the tile.
+        y_equator = np.where(y_low * y_high < 0, 0, np.where(np.abs(y_low) < np.abs(y_high),
+                                                             y_low, y_high))
+        y_pole = np.where(np.abs(y_low) > np.abs(y_high), y_low, y_high)
+        longitudes = [self._longitude(x, y) for x in (self.x_min, self.x_max)
+                      for y in (y_equator, y_pole)]
+        self.lon_min = np.min(longitudes, axis=0)
+        self.lon_max = np.max(longitudes, axis=0)
+
+        self.valid = self.on_globe.copy()
+        if available is not None:
+            mask = np.zeros_like(self.valid)
+            for th, tv in available:
+                mask[tv, th] = True
+            self.valid &= mask
+
+    def _longitude(self, x, y):
+        limit = self.converter.EARTH_WIDTH * 0.5 * np.cos(y / self.converter.EARTH_RADIUS)
+        x = np.clip(x, -limit, limit)
+        lon, _ = self.converter.MODIS_GRID(x, y, inverse=True)
+        # Points on the edge of the globe may be wrapped to the other side.
+        return np.where(x < 0, -np.abs(lon), np.abs(lon))
+
+    def with_available(self, available):
+        """
+        Returns a new index restricted to the given tiles.
+        Parameters
+        ----------
+        available: iterable of (`int`, `int`)
+            (h, v) pairs of the tiles for which data exists.
+        """
+        return ModisTileIndex(converter=self.converter, available=available)
+
+    def is_valid(self, h, v):
+        """
+        Returns `True` if the tile lies on the globe and is available.
+        Parameters
+        ----------
+        h: `int`
+            Sinusoidal grid longitude
+        v: `int`
+            Sinusoidal grid latitude
+        """
+        if not (0 <= h < self.converter.HORIZONTAL_TILES and
+                0 <= v < self.converter.VERTICAL_TILES):
+            return False
+        return bool(self.valid[v, h])
+
+    def valid_tiles(self):
+        """
+        Returns list of (h, v) pairs of all the valid tiles.
+        """
+        v, h = np.nonzero(self.valid)
+        return list(zip(h.tolist(), v.tolist()))
+
+    def footprint(self, h, v):
+        """
+        Returns the geographic bounding box of the part of the tile that lies on the globe.
+        Parameters
+        ----------
+        h: `int`
+            Sinusoidal grid longitude
+        v: `int`
+            Sinusoidal grid latitude
+        Returns
+        -------
+        bounds: `tuple`
+            (lat_min, lat_max, lon_min, lon_max), in degrees.
+        """
+        if not self.is_valid(h, v):
+            raise ValueError(f"Tile h{h}v{v} is not a valid tile.")
+
+        return (float(self.lat_min[v, h]), float(self.lat_max[v, h]),
+                float(self.lon_min[v, h]), float(self.lon_max[v, h]))
+
+    def tiles_in_bbox(self, lat_min, lat_max, lon_min, lon_max):
+        """
+        Returns all valid tiles that intersect a bounding box.
+        Bounding boxes crossing the antimeridian can be given with `lon_min > lon_max`.
+        Parameters
+        ----------
+        lat_min, lat_max: `float`
+            Latitude bounds of the box, in degrees.
+        lon_min, lon_max: `float`
+            Longitude bounds of the box, in degrees.
+        Returns
+        -------
+        tiles: `list`
+            (h, v) pairs of the intersecting tiles.
+        """
+        if lat_min > lat_max:
+            raise ValueError("lat_min must not be greater than lat_max.")
+
+        if lon_min > lon_max:
+            mask = (self._bbox_mask(lat_min, lat_max, lon_min, 180) |
+                    self._bbox_mask(lat_min, lat_max, -180, lon_max))
+        else:
+            mask = self._bbox_mask(lat_min, lat_max, lon_min, lon_max)
+
+        v, h = np.nonzero(mask & self.valid)
+        return list(zip(h.tolist(), v.tolist()))
+
+    def _bbox_mask(self, lat_min, lat_max, lon_min, lon_max):
+        radius = self.converter.EARTH_RADIUS
+        y_low = np.maximum(self.y_min, np.radians(lat_min) * radius)
+        y_high = np.minimum(self.y_max, np.radians(lat_max) * radius)
+        overlap = y_low <= y_high
+
+        # Over the shared latitudes, the box spans x = lon * R * cos(lat).
+        cos_low = np.cos(y_low / radius)
+        cos_high = np.cos(y_high / radius)
+        cos_max = np.where(y_low * y_high < 0, 1, np.maximum(cos_low, cos_high))
+        cos_min = np.minimum(cos_low, cos_high)
+        x_west = np.radians(lon_min) * radius * np.where(lon_min < 0, cos_max, cos_min)
+        x_east = np.radians(lon_max) * radius * np.where(lon_max > 0, cos_max, cos_min)
+
+        return overlap & (x_west <= self.x_max) & (x_east >= self.x_min)
+
+    def tiles_in_polygon(self, latitude, longitude, resolution=0.5):
+        """
+        Returns all valid tiles that intersect a polygon.
+        Polygons crossing the antimeridian are not supported.
+        Parameters
+        ----------
+        latitude: array-like
+            Latitudes of the vertices of the polygon, in degrees.
+        longitude: array-like
+            Longitudes of the vertices of the polygon, in degrees.
+        resolution: `float`
+            Maximum length, in degrees, of the segments the edges are split
+            into before being projected.
+        Returns
+        -------
+        tiles: `list`
+            (h, v) pairs of the intersecting tiles.
+        """
+        latitude = np.asarray(latitude, dtype=np.float64)
+        longitude = np.asarray(longitude, dtype=np.float64)
+        if latitude.shape != longitude.shape or latitude.size < 3:
+            raise ValueError("A polygon needs at least three vertices.")
+
+        candidates = self.tiles_in_bbox(latitude.min(), latitude.max(),
+                                        longitude.min(), longitude.max())
+
+        # Edges are straight in geographic coordinates but curved once projected.
+        lat_next = np.roll(latitude, -1)
+        lon_next = np.roll(longitude, -1)
+        steps = np.maximum(np.ceil(np.maximum(np.abs(lat_next - latitude),
+                                              np.abs(lon_next - longitude)) / resolution), 1)
+        fractions = [np.arange(n) / n for n in steps.astype(int)]
+        lat = np.concatenate([a + f * (b - a) for a, b, f in zip(latitude, lat_next, fractions)])
+        lon = np.concatenate([a + f * (b - a) for a, b, f in zip(longitude, lon_next, fractions)])
+        x, y = self.converter.MODIS_GRID(lon, lat)
+        x, y = np.asarray(x), np.asarray(y)
+
+        return [(h, v) for h, v in candidates
+                if _polygon_intersects_rect(x, y, self.x_min[v, h], self.x_max[v, h],
+                                            self.y_min[v, h], self.y_max[v, h])]
+
+
+def _polygon_intersects_rect(x, y, x_min, x_max, y_min, y_max):
+    if ((x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)).any():
+        return True
+
+    x_next = np.roll(x, -1)
+    y_next = np.roll(y, -1)
+
+    # A rectangle completely inside the polygon contains none of its vertices.
+    cx, cy = (x_min + x_max) * 0.5, (y_min + y_max) * 0.5
+    crosses = (y > cy) != (y_next > cy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = x + (cy - y) * (x_next - x) / (y_next - y)
+    if np.count_nonzero(crosses & (cx < x_cross)) % 2 == 1:
+        return True
+
+    # Otherwise an edge has to cross the rectangle (Liang-Barsky clipping).
+    dx = x_next - x
+    dy = y_next - y
+    t_low = np.zeros_like(x)
+    t_high = np.ones_like(x)
+    for p, q in ((-dx, x - x_min), (dx, x_max - x), (-dy, y - y_min), (dy, y_max - y)):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = q / p
+        parallel_outside = (p == 0) & (q < 0)
+        t_low = np.where(p < 0, np.maximum(t_low, t), t_low)
+        t_high = np.where(p > 0, np.minimum(t_high, t), t_high)
+        t_high = np.where(parallel_outside, -1, t_high)
+
+    return bool((t_low <= t_high).any())
+
+
+@lru_cache(maxsize=None)
+def get_tile_index():
+    """
+    Returns the shared `ModisTileIndex`, building it on the first call.
+    """
+    return ModisTileIndex()
@@ -1,4 +1,5 @@
-from pyproj import Proj
+from functools import lru_cache
+import numpy as np
 import math
 
 
@@ -14,6 +15,9 @@ class SinusoidalCoordinate:
     >>> coord = SinusoidalCoordinate()
     >>> h, v = coords(latitude=30.3244, longitude=78.0418)
 
+    >>> h, v, row, col = coords.get_modis_grid_coords(latitude=[30.3244, 28.7041],
+    ...                                               longitude=[78.0418, 77.1025])
+
     References
     ----------
     [1] https://modis-land.gsfc.nasa.gov/MODLAND_grid.html
@@ -29,7 +33,13 @@ class SinusoidalCoordinate:
         self.TILE_WIDTH = self.EARTH_WIDTH / self.HORIZONTAL_TILES
         self.TILE_HEIGHT = self.TILE_WIDTH
         self.CELL_SIZE = self.TILE_WIDTH / self.CELLS
-        self.MODIS_GRID = Proj(f'+proj=sinu +R={self.EARTH_RADIUS} +nadgrids=@null +wktext')
+
+    @property
+    def MODIS_GRID(self):
+        """
+        Sinusoidal projection of the grid, created on first use and shared by all converters.
+        """
+        return _get_projection(self.EARTH_RADIUS)
 
     def __call__(self, latitude, longitude):
         return self.get_modis_grid_coord(latitude, longitude)
@@ -42,3 +52,136 @@ class SinusoidalCoordinate:
               self.VERTICAL_TILES * self.TILE_HEIGHT) / self.TILE_HEIGHT
 
         return int(h), int(v)
+
+    def get_modis_grid_coords(self, latitude, longitude):
+        """
+        Vectorized version of `get_modis_grid_coord`.
+        Projects all the points in a single call and also returns the position
+        of the 500m cell inside the tile.
+        Parameters
+        ----------
+        latitude: array-like
+            latitudes of the observations, in degrees.
+        longitude: array-like
+            longitudes of the observations, in degrees.
+        Returns
+        -------
+        h, v, row, col: `numpy.ndarray`
+            Horizontal and vertical tile numbers, and the row and column of
+            the cell inside the tile. All arrays are of integer type and are
+            clipped to the bounds of the grid.
+        """
+        latitude = np.asarray(latitude, dtype=np.float64)
+        longitude = np.asarray(longitude, dtype=np.float64)
+        x, y = self.MODIS_GRID(longitude, latitude)
+
+        # Distance of the point from the top-left corner of the grid.
+        x = self.EARTH_WIDTH * 0.5 + np.asarray(x)
+        y = self.VERTICAL_TILES * self.TILE_HEIGHT - self.EARTH_WIDTH * 0.25 - np.asarray(y)
+
+        h = np.clip(np.floor(x / self.TILE_WIDTH), 0, self.HORIZONTAL_TILES - 1)
+        v = np.clip(np.floor(y / self.TILE_HEIGHT), 0, self.VERTICAL_TILES - 1)
+        col = np.clip(np.floor((x - h * self.TILE_WIDTH) / self.CELL_SIZE), 0, self.CELLS - 1)
+        row = np.clip(np.floor((y - v * self.TILE_HEIGHT) / self.CELL_SIZE), 0, self.CELLS - 1)
+
+        return h.astype(np.int64), v.astype(np.int64), row.astype(np.int64), col.astype(np.int64)
+
+    def get_geographic_coords(self, h, v, row=None, col=None):
+        """
+        Inverse of `get_modis_grid_coords`.
+        Converts positions on the MODIS Sinusoidal grid to latitude and longitude.
+        Parameters
+        ----------
+        h: array-like
+            Horizontal tile numbers.
+        v: array-like
+            Vertical tile numbers.
+        row: array-like
+            Row of the cell inside the tile. Defaults to the centre of the tile.
+        col: array-like
+            Column of the cell inside the tile. Defaults to the centre of the tile.
+        Returns
+        -------
+        latitude, longitude: `numpy.ndarray`
+            Coordinates of the centre of the cells, in degrees. Positions that
+            fall outside the projected globe are returned as `nan`.
+        """
+        x, y = self.get_projected_coords(h, v, row, col)
+
+        # On a sphere the projection is y = R * lat and x = R * lon * cos(lat), so
+        # its inverse is computed directly, which is much faster than through pyproj.
+        latitude = y / self.EARTH_RADIUS
+        cos_latitude = np.cos(latitude)
+        outside = np.abs(x) > self.EARTH_WIDTH * 0.5 * cos_latitude
+        with np.errstate(divide='ignore', invalid='ignore'):
+            longitude = np.degrees(x / (self.EARTH_RADIUS * cos_latitude))
+
+        longitude = np.where(outside, np.nan, longitude)
+        latitude = np.where(outside, np.nan, np.degrees(latitude))
+        return latitude, longitude
+
+    def get_pixel_bounds(self, lat_min, lat_max, lon_min, lon_max):
+        """
+        Returns the window of 500m cells of the whole MODIS grid that covers a bounding box.
+        Rows and columns are counted from the top-left corner of the grid,
+        so the cell at `row`, `col` of tile `h`, `v` is at
+        `v * CELLS + row`, `h * CELLS + col`.
+        Parameters
+        ----------
+        lat_min, lat_max: `float`
+            Latitude bounds of the box, in degrees.
+        lon_min, lon_max: `float`
+            Longitude bounds of the box, in degrees. Boxes crossing the
+            antimeridian are not supported.
+        Returns
+        -------
+        row_start, row_stop, col_start, col_stop: `int`
+            Bounds of the window, stop excluded.
+        """
+        if lat_min > lat_max or lon_min > lon_max:
+            raise ValueError("Minimum bounds must not be greater than maximum bounds.")
+
+        # Over the box, x = lon * R * cos(lat) is widest at the latitude closest to the equator.
+        cos_low, cos_high = np.cos(np.radians([lat_min, lat_max]))
+        cos_max = 1 if lat_min <= 0 <= lat_max else max(cos_low, cos_high)
+        cos_min = min(cos_low, cos_high)
+        x_west = math.radians(lon_min) * self.EARTH_RADIUS * (cos_max if lon_min < 0 else cos_min)
+        x_east = math.radians(lon_max) * self.EARTH_RADIUS * (cos_max if lon_max > 0 else cos_min)
+        y_north = math.radians(lat_max) * self.EARTH_RADIUS
+        y_south = math.radians(lat_min) * self.EARTH_RADIUS
+
+        rows = self.VERTICAL_TILES * self.CELLS
+        cols = self.HORIZONTAL_TILES * self.CELLS
+
+        def cell(distance, count):
+            return min(max(int(distance // self.CELL_SIZE), 0), count - 1)
+
+        row_start = cell(self.EARTH_WIDTH * 0.25 - y_north, rows)
+        row_stop = cell(self.EARTH_WIDTH * 0.25 - y_south, rows) + 1
+        col_start = cell(self.EARTH_WIDTH * 0.5 + x_west, cols)
+        col_stop = cell(self.EARTH_WIDTH * 0.5 + x_east, cols) + 1
+        return row_start, row_stop, col_start, col_stop
+
+    def get_projected_coords(self, h, v, row=None, col=None):
+        """
+        Returns the Sinusoidal projection coordinates, in meters, of the given
+        positions on the MODIS grid.
+        See `get_geographic_coords` for a description of the parameters.
+        """
+        h = np.asarray(h, dtype=np.float64)
+        v = np.asarray(v, dtype=np.float64)
+        col = self.CELLS * 0.5 if col is None else np.asarray(col, dtype=np.float64) + 0.5
+        row = self.CELLS * 0.5 if row is None else np.asarray(row, dtype=np.float64) + 0.5
+
+        x = h * self.TILE_WIDTH + col * self.CELL_SIZE - self.EARTH_WIDTH * 0.5
+        y = (self.VERTICAL_TILES * self.TILE_HEIGHT - self.EARTH_WIDTH * 0.25 -
+             v * self.TILE_HEIGHT - row * self.CELL_SIZE)
+        return x, y
+
+
+@lru_cache(maxsize=None)
+def _get_projection(radius):
+    # pyproj is slow to import and a `Proj` is slow to create, so both are deferred and done once.
+    # A `Proj` can be shared across threads, as pyproj gives every thread its own PROJ context.
+    from pyproj import Proj
+    return Proj(f'+proj=sinu +R={radius} +nadgrids=@null +wktext')
@@ -0,0 +1,14 @@
+import importlib
+
+__all__ = ['hdf', 'mosaic', 'cube', 'extract', 'arrow']
+
+
+def __getattr__(name):
+    # Submodules are imported on first use.
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,178 @@
+from wildfirepy.io.extract import BURNED_PIXEL, iter_burned_pixels
+from pathlib import Path
+import os
+import uuid
+import numpy as np
+
+__all__ = ['BurnRecordWriter', 'export_burned_pixels', 'read_burn_records']
+
+# Columns of the files; the product, year and month are in the names of the partitions.
+_COLUMNS = ['h', 'v', 'row', 'col', 'burn_date', 'qa', 'latitude', 'longitude']
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Columnar export requires `pyarrow` to be installed.") from None
+    return pyarrow, pyarrow.parquet
+
+
+class BurnRecordWriter:
+    """
+    Description
+    -----------
+    Streams burned pixels, as returned by `wildfirepy.io.extract.burned_pixels`,
+    to a Parquet dataset partitioned by product, year and month.
+
+    Pixels are written as record batches as soon as they are given, to one
+    file per month, in `product=<product>/year=<year>/month=<month>/`
+    directories, so the whole export is never held in memory, and a month
+    is read back by reading only its own directory. Files are written under
+    a hidden name, and only appear in the dataset once the writer is closed.
+    If the `with` block of the writer raises, the files are deleted instead,
+    so that a failed export leaves nothing in the dataset.
+    Several writers can add to the same dataset, as every writer names its
+    files uniquely.
+
+    Parameters
+    ----------
+    root: `str`
+        Directory of the dataset.
+    product: `str`
+        Name of the product of the pixels.
+    compression: `str`
+        Parquet compression codec.
+
+    Examples
+    --------
+    >>> with BurnRecordWriter('burned') as writer:
+    ...     for pixels in iter_burned_pixels(paths):
+    ...         writer.write(pixels)
+    >>> read_burn_records('burned', year=2020, month=2).to_pandas()
+    """
+    def __init__(self, root, product='MCD64A1', compression='zstd'):
+        self.pa, self.pq = _import_pyarrow()
+        self.root = Path(root)
+        self.product = product
+        self.compression = compression
+        self.rows = 0
+        self.schema = self.pa.schema([(name, self.pa.from_numpy_dtype(BURNED_PIXEL[name]))
+                                      for name in _COLUMNS])
+        self._name = f'part-{uuid.uuid4().hex}.parquet'
+        self._writers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _get_directory(self, year, month):
+        return self.root / f'product={self.product}' / f'year={year}' / f'month={month}'
+
+    def _get_writer(self, year, month):
+        writer = self._writers.get((year, month))
+        if writer is None:
+            directory = self._get_directory(year, month)
+            directory.mkdir(parents=True, exist_ok=True)
+            writer = self.pq.ParquetWriter(str(directory / ('.' + self._name)), self.schema,
+                                           compression=self.compression)
+            self._writers[year, month] = writer
+        return writer
+
+    def write(self, pixels):
+        """
+        Writes an array of burned pixels, of any number of months.
+        """
+        if not len(pixels):
+            return
+        months = pixels['year'].astype(np.int32) * 100 + pixels['month']
+        for key in np.unique(months).tolist():
+            part = pixels[months == key]
+            columns = [self.pa.array(part[name]) for name in _COLUMNS]
+            batch = self.pa.RecordBatch.from_arrays(columns, schema=self.schema)
+            self._get_writer(*divmod(key, 100)).write_batch(batch)
+        self.rows += len(pixels)
+
+    def close(self):
+        """
+        Completes the files, and adds them to the dataset.
+        """
+        for (year, month), writer in self._writers.items():
+            writer.close()
+            directory = self._get_directory(year, month)
+            os.replace(directory / ('.' + self._name), directory / self._name)
+        self._writers = {}
+
+    def abort(self):
+        """
+        Closes the files, and deletes them instead of adding them to the dataset.
+        """
+        for (year, month), writer in self._writers.items():
+            writer.close()
+            (self._get_directory(year, month) / ('.' + self._name)).unlink()
+        self._writers = {}
+
+
+def export_burned_pixels(paths, root, product='MCD64A1', max_workers=None):
+    """
+    Extracts the burned pixels of many `hdf` tiles in a pool of processes,
+    and streams them to a Parquet dataset, one tile at a time.
+    Parameters
+    ----------
+    paths: iterable of `str`
+        Paths to the `hdf` files, whose names hold their date and tile.
+    root: `str`
+        Directory of the dataset. See `BurnRecordWriter`.
+    product: `str`
+        Name of the product of the tiles.
+    max_workers: `int`
+        Maximum number of worker processes. See `wildfirepy.io.extract.extract_burned_pixels`.
+    Returns
+    -------
+    rows: `int`
+        Number of burned pixels written.
+    """
+    with BurnRecordWriter(root, product=product) as writer:
+        for pixels in iter_burned_pixels(paths, max_workers=max_workers):
+            writer.write(pixels)
+    return writer.rows
+
+
+def read_burn_records(root, *, product=None, year=None, month=None, columns=None):
+    """
+    Reads burned pixels back from a dataset written by `BurnRecordWriter`.
+    Only the files of the partitions that match the filters are read.
+    Parameters
+    ----------
+    root: `str`
+        Directory of the dataset.
+    product: `str`
+        If given, only the pixels of this product are read.
+    year: `int`
+        If given, only the pixels of this year are read.
+    month: `int`
+        If given, only the pixels of this month are read.
+    columns: `list` of `str`
+        Columns to read. All of them, and the `product`, `year` and `month`
+        of the partitions, by default.
+    Returns
+    -------
+    table: `pyarrow.Table`
+        The pixels.
+    """
+    _import_pyarrow()
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(str(root), format='parquet', partitioning='hive')
+    condition = None
+    for name, value in (('product', product), ('year', year), ('month', month)):
+        if value is not None:
+            expression = ds.field(name) == value
+            condition = expression if condition is None else condition & expression
+    return dataset.to_table(columns=columns, filter=condition)
@@ -0,0 +1,203 @@
+from pathlib import Path
+import json
+import os
+import tempfile
+import numpy as np
+
+__all__ = ['TimeSeriesCube']
+
+
+class TimeSeriesCube:
+    """
+    Description
+    -----------
+    A chunked on-disk (month, row, col) cube of monthly rasters of a region.
+
+    The cube is stored in a directory, as `.npy` chunks of
+    (`chunks[0]` months, `chunks[1]` rows, `chunks[2]` columns) that are
+    read and written as memory maps, and a small `json` manifest.
+    A new month is appended by writing only its own slice of the chunks of
+    the current block of months; earlier months are never rewritten, and the
+    month becomes visible once the manifest is updated. Months are appended
+    without gaps, so the position of a month along the time axis is its
+    number of months after the first month of the cube.
+    Reading the time series of a pixel, or of a small window, only opens the
+    chunks that hold it.
+
+    Parameters
+    ----------
+    path: `str`
+        Directory of an existing cube. New cubes are made with `create`.
+
+    Examples
+    --------
+    >>> cube = TimeSeriesCube.create('delhi', shape=(1000, 1000), dtype='int16', fill_value=-2)
+    >>> cube.append(2020, 2, raster)
+    >>> cube.time_series(500, 500)
+    """
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, path):
+        self.path = Path(path)
+        manifest = json.loads((self.path / self.MANIFEST).read_text())
+        self.rows, self.cols = manifest['shape']
+        self.dtype = np.dtype(manifest['dtype'])
+        self.chunks = tuple(manifest['chunks'])
+        self.fill_value = manifest['fill_value']
+        self.origin = tuple(manifest['origin'])
+        self.months = [tuple(month) for month in manifest['months']]
+
+    @classmethod
+    def create(cls, path, shape, dtype, chunks=(12, 512, 512), fill_value=0, origin=(0, 0)):
+        """
+        Creates an empty cube.
+        Parameters
+        ----------
+        path: `str`
+            Directory of the cube.
+        shape: `tuple`
+            (rows, cols) of the rasters.
+        dtype: `numpy.dtype`
+            Type of the rasters.
+        chunks: `tuple`
+            Number of months, rows and columns of each chunk.
+        fill_value:
+            Value of the months of a block that have not been appended yet.
+        origin: `tuple`
+            Position of the top-left cell of the rasters, e.g. in the whole
+            MODIS grid. Only kept for reference.
+        """
+        path = Path(path)
+        if (path / cls.MANIFEST).exists():
+            raise FileExistsError(f"A cube already exists at {path}.")
+        path.mkdir(parents=True, exist_ok=True)
+
+        fill_value = np.asarray(fill_value, dtype=dtype).item()
+        cls._write_manifest(path, {'shape': list(shape), 'dtype': np.dtype(dtype).str,
+                                   'chunks': list(chunks), 'fill_value': fill_value,
+                                   'origin': list(origin), 'months': []})
+        return cls(path)
+
+    @property
+    def shape(self):
+        """
+        (months, rows, cols) of the cube.
+        """
+        return len(self.months), self.rows, self.cols
+
+    def _chunk_path(self, block, row_block, col_block):
+        return self.path / f't{block:04d}_r{row_block:04d}_c{col_block:04d}.npy'
+
+    def _row_blocks(self):
+        return range(-(-self.rows // self.chunks[1]))
+
+    def _col_blocks(self):
+        return range(-(-self.cols // self.chunks[2]))
+
+    def append(self, year, month, raster):
+        """
+        Appends the raster of a month, which must be the month right after
+        the last month of the cube.
+        Parameters
+        ----------
+        year: `int`
+            Year of the raster.
+        month: `int`
+            Month of the raster.
+        raster: array-like
+            (rows, cols) raster, e.g. a `numpy.memmap`. It is read one chunk at a time.
+        """
+        if self.months and (year, month) != _next_month(*self.months[-1]):
+            last_year, last_month = self.months[-1]
+            raise ValueError(f"{year}-{month:02d} is not the month after the last month "
+                             f"of the cube, {last_year}-{last_month:02d}.")
+        if tuple(np.shape(raster)) != (self.rows, self.cols):
+            raise ValueError(f"raster must be of shape {(self.rows, self.cols)}.")
+
+        time_chunk, row_chunk, col_chunk = self.chunks
+        block, index = divmod(len(self.months), time_chunk)
+        for row_block in self._row_blocks():
+            for col_block in self._col_blocks():
+                rows = slice(row_block * row_chunk, min((row_block + 1) * row_chunk, self.rows))
+                cols = slice(col_block * col_chunk, min((col_block + 1) * col_chunk, self.cols))
+                path = self._chunk_path(block, row_block, col_block)
+                if index == 0 or not path.exists():
+                    chunk = np.lib.format.open_memmap(path, mode='w+', dtype=self.dtype,
+                                                      shape=(time_chunk, rows.stop - rows.start,
+                                                             cols.stop - cols.start))
+                    chunk[:] = self.fill_value
+                else:
+                    chunk = np.lib.format.open_memmap(path, mode='r+')
+                chunk[index] = raster[rows, cols]
+                chunk.flush()
+                del chunk
+
+        months = self.months + [(year, month)]
+        self._write_manifest(self.path, {'shape': [self.rows, self.cols], 'dtype': self.dtype.str,
+                                         'chunks': list(self.chunks),
+                                         'fill_value': self.fill_value,
+                                         'origin': list(self.origin),
+                                         'months': [list(m) for m in months]})
+        self.months = months
+
+    def read(self, rows=slice(None), cols=slice(None), months=slice(None)):
+        """
+        Reads a window of the cube.
+        Parameters
+        ----------
+        rows: `slice`
+            Rows of the window.
+        cols: `slice`
+            Columns of the window.
+        months: `slice`
+            Positions, in `months`, of the months of the window.
+        Returns
+        -------
+        data: `numpy.ndarray`
+            (months, rows, cols) array.
+        """
+        times = range(*months.indices(len(self.months)))
+        rows = range(*rows.indices(self.rows))
+        cols = range(*cols.indices(self.cols))
+        if times.step != 1 or rows.step != 1 or cols.step != 1:
+            raise ValueError("Only contiguous windows can be read.")
+
+        data = np.empty((len(times), len(rows), len(cols)), dtype=self.dtype)
+        if not data.size:
+            return data
+
+        time_chunk, row_chunk, col_chunk = self.chunks
+        for block in range(times.start // time_chunk, (times.stop - 1) // time_chunk + 1):
+            for row_block in range(rows.start // row_chunk, (rows.stop - 1) // row_chunk + 1):
+                for col_block in range(cols.start // col_chunk, (cols.stop - 1) // col_chunk + 1):
+                    t0, t1 = _overlap(times, block, time_chunk)
+                    r0, r1 = _overlap(rows, row_block, row_chunk)
+                    c0, c1 = _overlap(cols, col_block, col_chunk)
+                    chunk = np.load(self._chunk_path(block, row_block, col_block), mmap_mode='r')
+                    t, r, c = block * time_chunk, row_block * row_chunk, col_block * col_chunk
+                    window = (slice(t0 - times.start, t1 - times.start),
+                              slice(r0 - rows.start, r1 - rows.start),
+                              slice(c0 - cols.start, c1 - cols.start))
+                    data[window] = chunk[t0 - t:t1 - t, r0 - r:r1 - r, c0 - c:c1 - c]
+        return data
+
+    def time_series(self, row, col):
+        """
+        Returns the values of a pixel for every month of the cube.
+        """
+        return self.read(slice(row, row + 1), slice(col, col + 1))[:, 0, 0]
+
+    @classmethod
+    def _write_manifest(cls, path, manifest):
+        fd, tmp = tempfile.mkstemp(dir=path, prefix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(manifest, file)
+        os.replace(tmp, path / cls.MANIFEST)
+
+
+def _next_month(year, month):
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _overlap(indices, block, size):
+    return max(indices.start, block * size), min(indices.stop, (block + 1) * size)
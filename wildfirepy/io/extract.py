@@ -0,0 +1,122 @@
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+from wildfirepy.io.hdf import read_hdf
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+import datetime
+import re
+import numpy as np
+
+__all__ = ['BURNED_PIXEL', 'burned_pixels', 'extract_burned_pixels', 'iter_burned_pixels']
+
+BURNED_PIXEL = np.dtype([('year', np.uint16), ('month', np.uint8),
+                         ('h', np.uint8), ('v', np.uint8), ('row', np.uint16), ('col', np.uint16),
+                         ('burn_date', np.int16), ('qa', np.uint8),
+                         ('latitude', np.float32), ('longitude', np.float32)])
+"""
+Type of the burned pixels returned by `burned_pixels` and `extract_burned_pixels`:
+the month and tile of the file, the row and column of the pixel in the tile,
+its burn date, as a day of the year, its QA flags, and the coordinates of
+its centre, in degrees.
+"""
+
+_NAME = re.compile(r'\.A(?P<year>\d{4})(?P<day>\d{3})\.h(?P<h>\d{2})v(?P<v>\d{2})\.')
+_converter = SinusoidalCoordinate()
+
+
+def burned_pixels(path, year=None, month=None, h=None, v=None, dataset='Burn Date', qa='QA'):
+    """
+    Returns the burned pixels of an MCD64A1 tile.
+    The burn date layer is scanned with vectorized operations, and the
+    coordinates of the pixels are computed with the inverse of the
+    sinusoidal projection, for all the pixels at once.
+    Parameters
+    ----------
+    path: `str`
+        Path to the `hdf` file.
+    year: `int`
+        Year of the tile. Read from the name of the file by default.
+    month: `int`
+        Month of the tile. Read from the name of the file by default.
+    h: `int`
+        Horizontal tile number. Read from the name of the file by default.
+    v: `int`
+        Vertical tile number. Read from the name of the file by default.
+    dataset: `str`
+        Name of the burn date dataset.
+    qa: `str`
+        Name of the QA dataset. If `None`, the QA flags are not read, and are 0.
+    Returns
+    -------
+    pixels: `numpy.ndarray`
+        Array of type `BURNED_PIXEL`, with one element per pixel with a
+        positive burn date; unburned, missing and water pixels are left out.
+    """
+    name = _NAME.search(Path(path).name)
+    if name is None and None in (year, month, h, v):
+        raise ValueError(f"The month and tile of {path} must be given, "
+                         "as they are not in its name.")
+    if name is not None:
+        date = (datetime.date(int(name.group('year')), 1, 1) +
+                datetime.timedelta(int(name.group('day')) - 1))
+    year = date.year if year is None else year
+    month = date.month if month is None else month
+    h = int(name.group('h')) if h is None else h
+    v = int(name.group('v')) if v is None else v
+
+    arrays = read_hdf(path, [dataset] if qa is None else [dataset, qa])
+    burn_date = arrays[dataset]
+    rows, cols = np.nonzero(burn_date > 0)
+
+    pixels = np.empty(rows.size, dtype=BURNED_PIXEL)
+    pixels['year'] = year
+    pixels['month'] = month
+    pixels['h'] = h
+    pixels['v'] = v
+    pixels['row'] = rows
+    pixels['col'] = cols
+    pixels['burn_date'] = burn_date[rows, cols]
+    pixels['qa'] = 0 if qa is None else arrays[qa][rows, cols]
+    pixels['latitude'], pixels['longitude'] = _converter.get_geographic_coords(h, v, rows, cols)
+    return pixels
+
+
+def extract_burned_pixels(paths, max_workers=None, dataset='Burn Date', qa='QA'):
+    """
+    Returns the burned pixels of many MCD64A1 tiles, scanned in parallel by a pool of processes.
+    Decoding and scanning a tile is CPU-bound, so every tile is handled by
+    its own worker process, and only its compact array of burned pixels is
+    sent back.
+    Parameters
+    ----------
+    paths: iterable of `str`
+        Paths to the `hdf` files, whose names hold their year and tile,
+        e.g. as downloaded by `ModisBurntAreaDownloader.get_batch`.
+    max_workers: `int`
+        Maximum number of worker processes. Defaults to the number of
+        processors. With `1`, tiles are scanned in the calling process.
+    dataset: `str`
+        Name of the burn date dataset.
+    qa: `str`
+        Name of the QA dataset, or `None` to leave the QA flags out.
+    Returns
+    -------
+    pixels: `numpy.ndarray`
+        Array of type `BURNED_PIXEL`, with the pixels of every file, in the order of `paths`.
+    """
+    arrays = list(iter_burned_pixels(paths, max_workers=max_workers, dataset=dataset, qa=qa))
+    return np.concatenate(arrays) if arrays else np.empty(0, dtype=BURNED_PIXEL)
+
+
+def iter_burned_pixels(paths, max_workers=None, dataset='Burn Date', qa='QA'):
+    """
+    Same as `extract_burned_pixels`, but yields the array of every file, in
+    the order of `paths`, as soon as it is ready, instead of concatenating them.
+    """
+    paths = [str(path) for path in paths]
+    scan = partial(burned_pixels, dataset=dataset, qa=qa)
+    if max_workers == 1 or len(paths) <= 1:
+        yield from map(scan, paths)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        yield from pool.map(scan, paths)
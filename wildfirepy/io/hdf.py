@@ -0,0 +1,120 @@
+from collections import OrderedDict
+import threading
+
+__all__ = ['ArrayCache', 'read_hdf']
+
+
+def read_hdf(path, datasets, window=None):
+    """
+    Reads scientific datasets from an HDF4 file, such as a MODIS `hdf` tile.
+    Parameters
+    ----------
+    path: `str`
+        Path to the `hdf` file.
+    datasets: iterable of `str`
+        Names of the datasets, e.g. `Burn Date` and `QA`.
+    window: `tuple`
+        If given, a (row, column) pair of `slice`s; only this part of the
+        datasets is decoded.
+    Returns
+    -------
+    arrays: `dict`
+        `numpy.ndarray` of every dataset, by name.
+    """
+    try:
+        from pyhdf.SD import SD, SDC
+    except ImportError:
+        raise ImportError("Reading MODIS tiles requires `pyhdf` to be installed.") from None
+
+    file = SD(str(path), SDC.READ)
+    try:
+        arrays = {}
+        for name in datasets:
+            dataset = file.select(name)
+            arrays[name] = dataset[:] if window is None else dataset[window]
+            dataset.endaccess()
+        return arrays
+    finally:
+        file.end()
+
+
+class ArrayCache:
+    """
+    Description
+    -----------
+    A thread-safe in-memory cache of decoded arrays, with a memory budget.
+
+    Values are `numpy.ndarray`s, or `dict`s of them, whose total size in
+    bytes is tracked; when the cache grows beyond `max_bytes`, the least
+    recently used values are dropped.
+
+    Parameters
+    ----------
+    max_bytes: `int`
+        Memory budget of the cache, in bytes.
+
+    Examples
+    --------
+    >>> cache = ArrayCache(max_bytes=512 * 1024 ** 2)
+    >>> arrays = cache.get_or_load(path, lambda: read_hdf(path, ['Burn Date', 'QA']))
+    """
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __len__(self):
+        return len(self._values)
+
+    @staticmethod
+    def _size(value):
+        if isinstance(value, dict):
+            return sum(array.nbytes for array in value.values())
+        return value.nbytes
+
+    def get(self, key):
+        """
+        Returns the value cached under `key`, or `None` if there is none.
+        """
+        with self._lock:
+            value = self._values.get(key)
+            if value is not None:
+                self._values.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """
+        Caches `value` under `key`, and drops the least recently used values
+        if the cache is over budget. The latest value is always kept.
+        """
+        with self._lock:
+            if key in self._values:
+                self.nbytes -= self._size(self._values.pop(key))
+            self._values[key] = value
+            self.nbytes += self._size(value)
+            while self.nbytes > self.max_bytes and len(self._values) > 1:
+                _, dropped = self._values.popitem(last=False)
+                self.nbytes -= self._size(dropped)
+
+    def get_or_load(self, key, loader):
+        """
+        Returns the value cached under `key`, calling `loader` and caching its
+        result if there is none.
+        """
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """
+        Drops all the cached values.
+        """
+        with self._lock:
+            self._values.clear()
+            self.nbytes = 0
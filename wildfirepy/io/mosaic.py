@@ -0,0 +1,87 @@
+from wildfirepy.io.hdf import read_hdf
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import numpy as np
+
+__all__ = ['build_mosaic']
+
+
+def build_mosaic(tiles, bounds, dataset, output, fill_value=0, dtype=None, cells=2400,
+                 max_workers=4):
+    """
+    Writes a raster of a region of the MODIS grid from the `hdf` files of its tiles.
+
+    The raster is preallocated as a memory-mapped `.npy` file and every tile
+    is decoded and written into it on its own, reading only the part of the
+    tile inside the region, so at most twice `max_workers` tiles are in memory
+    at once, whatever the size of the region.
+    The HDF4 library is not thread-safe, and holds the GIL while decoding, so
+    tiles are decoded by a pool of processes; only the copy of their window
+    into the raster is done by the calling process.
+
+    Parameters
+    ----------
+    tiles: `dict`
+        Path to the `hdf` file of every (h, v) tile of the region.
+        Tiles that are missing are left filled with `fill_value`.
+    bounds: `tuple`
+        (row_start, row_stop, col_start, col_stop) window of the region, in
+        cells of the whole grid, as returned by `SinusoidalCoordinate.get_pixel_bounds`.
+    dataset: `str`
+        Name of the dataset to read, e.g. `Burn Date`.
+    output: `str`
+        Path to the `.npy` file to write.
+    fill_value:
+        Value of the cells that are not covered by any tile.
+    dtype: `numpy.dtype`
+        Type of the raster. Defaults to the type of the dataset.
+    cells: `int`
+        Number of cells along each side of a tile.
+    max_workers: `int`
+        Maximum number of worker processes decoding tiles.
+        With `1`, tiles are decoded in the calling process.
+    Returns
+    -------
+    mosaic: `numpy.memmap`
+        The raster, backed by `output`.
+    """
+    row_start, row_stop, col_start, col_stop = bounds
+    if dtype is None:
+        if not tiles:
+            raise ValueError("dtype must be given when there are no tiles.")
+        sample = next(iter(tiles.values()))
+        dtype = read_hdf(sample, [dataset], window=(slice(0, 1), slice(0, 1)))[dataset].dtype
+
+    mosaic = np.lib.format.open_memmap(output, mode='w+', dtype=dtype,
+                                       shape=(row_stop - row_start, col_stop - col_start))
+    if fill_value != 0:
+        mosaic[:] = fill_value
+
+    reads = []
+    for (h, v), path in tiles.items():
+        top, bottom = max(row_start, v * cells), min(row_stop, (v + 1) * cells)
+        left, right = max(col_start, h * cells), min(col_stop, (h + 1) * cells)
+        if top < bottom and left < right:
+            target = (slice(top - row_start, bottom - row_start),
+                      slice(left - col_start, right - col_start))
+            window = (slice(top - v * cells, bottom - v * cells),
+                      slice(left - h * cells, right - h * cells))
+            reads.append((target, str(path), window))
+
+    if max_workers == 1 or len(reads) <= 1:
+        for target, path, window in reads:
+            mosaic[target] = read_hdf(path, [dataset], window=window)[dataset]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            # Tiles are submitted a few at a time, so that decoded tiles do not pile up.
+            pending = deque()
+            for target, path, window in reads:
+                pending.append((target, pool.submit(read_hdf, path, [dataset], window=window)))
+                if len(pending) > max_workers:
+                    target, future = pending.popleft()
+                    mosaic[target] = future.result()[dataset]
+            for target, future in pending:
+                mosaic[target] = future.result()[dataset]
+
+    mosaic.flush()
+    return mosaic
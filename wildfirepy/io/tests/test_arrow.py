@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from wildfirepy.io.extract import BURNED_PIXEL
+
+pytest.importorskip('pyarrow')
+from wildfirepy.io.arrow import BurnRecordWriter, export_burned_pixels, read_burn_records  # noqa: E402
+
+
+def make_pixels(year, month, n):
+    pixels = np.zeros(n, dtype=BURNED_PIXEL)
+    pixels['year'], pixels['month'] = year, month
+    pixels['h'], pixels['v'] = 24, 6
+    pixels['row'] = np.arange(n)
+    pixels['burn_date'] = 32
+    pixels['latitude'] = 28.7
+    return pixels
+
+
+def test_writer_partitions_by_month(tmpdir):
+    with BurnRecordWriter(tmpdir) as writer:
+        writer.write(np.concatenate([make_pixels(2020, 2, 3), make_pixels(2020, 3, 2)]))
+        writer.write(make_pixels(2020, 2, 4))
+        # Files are only visible once the writer is closed.
+        assert not list(tmpdir.visit('part-*.parquet'))
+
+    assert writer.rows == 9
+    files = tmpdir.visit('part-*.parquet')
+    partitions = sorted(path.relto(tmpdir).rsplit('/', 1)[0] for path in files)
+    assert partitions == ['product=MCD64A1/year=2020/month=2', 'product=MCD64A1/year=2020/month=3']
+
+    february = read_burn_records(tmpdir, year=2020, month=2)
+    assert february.num_rows == 7
+    assert sorted(february.column('row').to_pylist()) == [0, 0, 1, 1, 2, 2, 3]
+    assert set(february.column('month').to_pylist()) == {2}
+    assert february.schema.field('row').type == 'uint16'
+
+    assert read_burn_records(tmpdir, product='MCD64A1', columns=['burn_date']).num_rows == 9
+    assert read_burn_records(tmpdir, year=2021).num_rows == 0
+
+    # Reading a month does not open the files of other months.
+    broken = tmpdir.join('product=MCD64A1', 'year=2020', 'month=3', 'part-broken.parquet')
+    broken.write('not parquet')
+    assert read_burn_records(tmpdir, year=2020, month=2).num_rows == 7
+
+
+def test_failed_export_leaves_no_files(tmpdir):
+    with pytest.raises(RuntimeError):
+        with BurnRecordWriter(tmpdir) as writer:
+            writer.write(make_pixels(2020, 2, 3))
+            raise RuntimeError("The extraction failed.")
+
+    assert not [path for path in tmpdir.visit() if path.isfile()]
+    assert read_burn_records(tmpdir).num_rows == 0
+
+
+def test_export_burned_pixels(tmpdir):
+    SD = pytest.importorskip('pyhdf.SD')
+    path = str(tmpdir / 'MCD64A1.A2020032.h24v06.006.2020102113321.hdf')
+    file = SD.SD(path, SD.SDC.WRITE | SD.SDC.CREATE)
+    for name, kind, value in (('Burn Date', SD.SDC.INT16, 40), ('QA', SD.SDC.UINT8, 3)):
+        dataset = file.create(name, kind, (10, 10))
+        dtype = np.int16 if value == 40 else np.uint8
+        dataset[:] = np.where(np.eye(10, dtype=bool), value, 0).astype(dtype)
+        dataset.endaccess()
+    file.end()
+
+    assert export_burned_pixels([path], tmpdir / 'burned', max_workers=1) == 10
+
+    table = read_burn_records(tmpdir / 'burned', year=2020, month=2)
+    assert table.column('qa').to_pylist() == [3] * 10
+    assert table.column('row').to_pylist() == table.column('col').to_pylist() == list(range(10))
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from wildfirepy.io.cube import TimeSeriesCube
+
+
+@pytest.fixture
+def cube(tmpdir):
+    cube = TimeSeriesCube.create(tmpdir / 'cube', shape=(5, 7), dtype='int16', chunks=(2, 2, 3),
+                                 fill_value=-2, origin=(10, 20))
+    for month in range(1, 4):
+        cube.append(2020, month, np.arange(35, dtype=np.int16).reshape(5, 7) + 100 * month)
+    return cube
+
+
+def test_append_and_read(tmpdir, cube):
+    reopened = TimeSeriesCube(tmpdir / 'cube')
+
+    assert reopened.shape == (3, 5, 7)
+    assert reopened.months == [(2020, 1), (2020, 2), (2020, 3)]
+    assert reopened.origin == (10, 20)
+    assert reopened.time_series(4, 6).tolist() == [134, 234, 334]
+    assert (reopened.read(slice(1, 4), slice(2, 7), slice(1, 3)) ==
+            (np.arange(35).reshape(5, 7)[1:4, 2:7] + np.array([200, 300])[:, None, None])).all()
+
+
+def test_append_touches_only_current_block(tmpdir, cube):
+    first_block = (tmpdir / 'cube' / 't0000_r0000_c0000.npy').mtime()
+    cube.append(2020, 4, np.zeros((5, 7), dtype=np.int16))
+
+    assert (tmpdir / 'cube' / 't0000_r0000_c0000.npy').mtime() == first_block
+    assert np.load(str(tmpdir / 'cube' / 't0001_r0000_c0000.npy')).tolist() == \
+        [[[300, 301, 302], [307, 308, 309]], [[0, 0, 0], [0, 0, 0]]]
+    assert cube.time_series(0, 0).tolist() == [100, 200, 300, 0]
+
+
+def test_append_checks_order_and_shape(cube):
+    with pytest.raises(ValueError):
+        cube.append(2020, 3, np.zeros((5, 7)))
+    with pytest.raises(ValueError):
+        cube.append(2020, 5, np.zeros((5, 7)))
+    with pytest.raises(ValueError):
+        cube.append(2020, 4, np.zeros((5, 6)))
+    assert cube.months == [(2020, 1), (2020, 2), (2020, 3)]
+
+
+def test_append_across_years(tmpdir):
+    cube = TimeSeriesCube.create(tmpdir / 'years', shape=(1, 1), dtype='int16')
+    cube.append(2019, 12, np.ones((1, 1)))
+    cube.append(2020, 1, np.ones((1, 1)))
+
+    assert cube.months == [(2019, 12), (2020, 1)]
+
+
+def test_create_existing(tmpdir, cube):
+    with pytest.raises(FileExistsError):
+        TimeSeriesCube.create(tmpdir / 'cube', shape=(5, 7), dtype='int16')
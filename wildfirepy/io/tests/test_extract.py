@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+from wildfirepy.io.extract import BURNED_PIXEL, burned_pixels, extract_burned_pixels
+
+
+def write_tile(path, burn_date):
+    SD = pytest.importorskip('pyhdf.SD')
+    file = SD.SD(str(path), SD.SDC.WRITE | SD.SDC.CREATE)
+    dataset = file.create('Burn Date', SD.SDC.INT16, burn_date.shape)
+    dataset[:] = burn_date
+    dataset.endaccess()
+    dataset = file.create('QA', SD.SDC.UINT8, burn_date.shape)
+    dataset[:] = (np.arange(burn_date.size) % 256).reshape(burn_date.shape).astype(np.uint8)
+    dataset.endaccess()
+    file.end()
+    return str(path)
+
+
+@pytest.fixture
+def tiles(tmpdir):
+    delhi = np.zeros((40, 50), dtype=np.int16)
+    delhi[3, 4] = 45
+    delhi[10, 20] = 60
+    delhi[0, :] = -2
+    delhi[1, :] = -1
+    fiji = np.zeros((40, 50), dtype=np.int16)
+    fiji[39, 49] = 366
+    return [write_tile(tmpdir / 'MCD64A1.A2020032.h24v06.006.2020102113321.hdf', delhi),
+            write_tile(tmpdir / 'MCD64A1.A2019335.h34v10.006.2020102114146.hdf', fiji)]
+
+
+def test_burned_pixels(tiles):
+    pixels = burned_pixels(tiles[0])
+
+    assert pixels.dtype == BURNED_PIXEL
+    assert pixels[['row', 'col', 'burn_date', 'qa']].tolist() == [(3, 4, 45, 154), (10, 20, 60, 8)]
+    assert pixels[['year', 'month', 'h', 'v']].tolist() == [(2020, 2, 24, 6)] * 2
+
+    latitude, longitude = SinusoidalCoordinate().get_geographic_coords(24, 6, [3, 10], [4, 20])
+    assert np.allclose(pixels['latitude'], latitude) and np.allclose(pixels['longitude'], longitude)
+
+
+def test_burned_pixels_needs_tile(tmpdir):
+    path = write_tile(tmpdir / 'tile.hdf', np.ones((2, 2), dtype=np.int16))
+
+    with pytest.raises(ValueError):
+        burned_pixels(path)
+    pixels = burned_pixels(path, year=2020, month=3, h=1, v=2, qa=None)
+    assert pixels[['year', 'month', 'h', 'v', 'qa']].tolist() == [(2020, 3, 1, 2, 0)] * 4
+
+
+def test_extract_burned_pixels_in_processes(tiles):
+    pixels = extract_burned_pixels(tiles, max_workers=2)
+
+    assert pixels[['year', 'month', 'h', 'v', 'burn_date']].tolist() == \
+        [(2020, 2, 24, 6, 45), (2020, 2, 24, 6, 60), (2019, 12, 34, 10, 366)]
+    assert np.array_equal(pixels, extract_burned_pixels(tiles, max_workers=1))
+    assert len(extract_burned_pixels([])) == 0
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from wildfirepy.io.hdf import ArrayCache, read_hdf
+
+
+def test_read_hdf(tmpdir):
+    SD = pytest.importorskip('pyhdf.SD')
+    path = str(tmpdir / 'tile.hdf')
+    file = SD.SD(path, SD.SDC.WRITE | SD.SDC.CREATE)
+    dataset = file.create('Burn Date', SD.SDC.INT16, (3, 4))
+    dataset[:] = np.arange(12, dtype=np.int16).reshape(3, 4)
+    dataset.endaccess()
+    file.end()
+
+    arrays = read_hdf(path, ['Burn Date'])
+
+    assert arrays['Burn Date'].dtype == np.int16
+    assert arrays['Burn Date'][2, 3] == 11
+
+
+def test_array_cache_evicts_least_recently_used():
+    cache = ArrayCache(max_bytes=250)
+    cache.put('a', np.zeros(100, dtype=np.uint8))
+    cache.put('b', {'x': np.zeros(50, dtype=np.uint8), 'y': np.zeros(50, dtype=np.uint8)})
+    cache.get('a')
+    cache.put('c', np.zeros(100, dtype=np.uint8))
+
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    assert cache.nbytes == 200
+
+    loads = []
+    cache.get_or_load('d', lambda: loads.append(1) or np.zeros(300, dtype=np.uint8))
+    cache.get_or_load('d', lambda: loads.append(1) or np.zeros(300, dtype=np.uint8))
+
+    assert loads == [1]
+    assert len(cache) == 1
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from wildfirepy.io.mosaic import build_mosaic
+
+
+def write_tile(path, values):
+    SD = pytest.importorskip('pyhdf.SD')
+    file = SD.SD(str(path), SD.SDC.WRITE | SD.SDC.CREATE)
+    dataset = file.create('Burn Date', SD.SDC.INT16, values.shape)
+    dataset[:] = values
+    dataset.endaccess()
+    file.end()
+    return str(path)
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_build_mosaic(tmpdir, max_workers):
+    tiles = {(0, 0): write_tile(tmpdir / 'h00v00.hdf', np.full((4, 4), 1, dtype=np.int16)),
+             (1, 0): write_tile(tmpdir / 'h01v00.hdf', np.full((4, 4), 7, dtype=np.int16)),
+             (1, 1): write_tile(tmpdir / 'h01v01.hdf', np.arange(16, dtype=np.int16).reshape(4, 4))}
+
+    mosaic = build_mosaic(tiles, (2, 7, 1, 6), 'Burn Date', str(tmpdir / 'mosaic.npy'),
+                          fill_value=-2, cells=4, max_workers=max_workers)
+
+    assert isinstance(mosaic, np.memmap)
+    assert mosaic.dtype == np.int16
+    assert np.load(str(tmpdir / 'mosaic.npy')).tolist() == [
+        [1, 1, 1, 7, 7],
+        [1, 1, 1, 7, 7],
+        [-2, -2, -2, 0, 1],
+        [-2, -2, -2, 4, 5],
+        [-2, -2, -2, 8, 9],
+    ]
+
+
+def test_build_mosaic_without_tiles(tmpdir):
+    with pytest.raises(ValueError):
+        build_mosaic({}, (0, 2, 0, 2), 'Burn Date', str(tmpdir / 'mosaic.npy'))
+
+    mosaic = build_mosaic({}, (0, 2, 0, 2), 'Burn Date', str(tmpdir / 'mosaic.npy'),
+                          fill_value=-2, dtype=np.int16)
+    assert (mosaic == -2).all()
@@ -1,4 +1,14 @@
-from wildfirepy.net import util
-from wildfirepy.net import usgs
+import importlib
 
 __all__ = ['usgs', 'util']
+
+
+def __getattr__(name):
+    # Submodules are imported on first use.
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
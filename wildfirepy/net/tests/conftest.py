@@ -0,0 +1,8 @@
+import pytest
+from wildfirepy.net.util import USGSMirror
+
+
+@pytest.fixture
+def usgs_server():
+    with USGSMirror() as mirror:
+        yield mirror
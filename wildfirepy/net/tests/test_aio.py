@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import pytest
+from urllib.error import HTTPError
+from wildfirepy.net.usgs import AsyncModisBurntAreaDownloader
+from wildfirepy.net.util import (AsyncHtmlParser, AsyncURLOpenerWithRedirect, ListingCache,
+                                 USGSMirror)
+
+pytest.importorskip('aiohttp')
+
+
+def test_redirect_with_cookies():
+    async def read(url):
+        async with AsyncURLOpenerWithRedirect(top_level_url=url) as opener:
+            first = await (await opener(url + '/data.hdf')).read()
+            second = await (await opener(url + '/data.hdf')).read()
+            return first, second
+
+    with USGSMirror(login=True) as mirror:
+        mirror.add_file('/data.hdf', b'data')
+
+        assert asyncio.run(read(mirror.url)) == (b'data', b'data')
+        assert mirror.hits['/login?next=/data.hdf'] == 1
+        assert mirror.hits['/data.hdf'] == 3
+
+
+def test_http_error(usgs_server):
+    async def read():
+        async with AsyncURLOpenerWithRedirect() as opener:
+            await opener(usgs_server.url + '/missing')
+
+    with pytest.raises(HTTPError):
+        asyncio.run(read())
+
+
+def test_concurrent_get_hdf(tmpdir, usgs_server):
+    usgs_server.add_directory('/MOTA/MCD64A1.006/2020.02.01/', {
+        'MCD64A1.A2020032.h24v06.006.2020102113321.hdf': b'delhi',
+        'MCD64A1.A2020032.h34v10.006.2020102114146.hdf': b'fiji',
+    })
+
+    async def download():
+        async with AsyncModisBurntAreaDownloader() as downloader:
+            downloader.base_url = usgs_server.url + '/MOTA/MCD64A1.006/'
+            points = [(28.7041, 77.1025), (-17.7134, 178.0650), (0, 0)]
+            return await asyncio.gather(*[downloader.get_hdf(year=2020, month=2, latitude=lat,
+                                                             longitude=lon, path=tmpdir)
+                                          for lat, lon in points], return_exceptions=True)
+
+    delhi, fiji, ocean = asyncio.run(download())
+
+    assert open(delhi, 'rb').read() == b'delhi'
+    assert open(fiji, 'rb').read() == b'fiji'
+    assert isinstance(ocean, ValueError)
+    assert usgs_server.hits['/MOTA/MCD64A1.006/2020.02.01/'] == 1
+
+
+def test_cache_is_used_off_the_event_loop(tmpdir, usgs_server):
+    usgs_server.add_directory('/MOTA/MCD64A1.006/2020.02.01/', {
+        'MCD64A1.A2020032.h24v06.006.2020102113321.hdf': b'delhi',
+    })
+    threads = []
+
+    class RecordingCache(ListingCache):
+        def get_fresh(self, url):
+            threads.append(threading.current_thread())
+            return super().get_fresh(url)
+
+        def store(self, *args, **kwargs):
+            threads.append(threading.current_thread())
+            return super().store(*args, **kwargs)
+
+    async def list_twice():
+        async with AsyncURLOpenerWithRedirect() as opener:
+            cache = RecordingCache(path=tmpdir)
+            parser = AsyncHtmlParser('MCD64A1', cache=cache, url_opener=opener)
+            url = usgs_server.url + '/MOTA/MCD64A1.006/2020.02.01/'
+            first = await parser.get_listing(url)
+            second = await parser.get_listing(url)
+            return first, second
+
+    first, second = asyncio.run(list_twice())
+
+    assert len(first) == len(second) == 1
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
+    assert usgs_server.hits['/MOTA/MCD64A1.006/2020.02.01/'] == 1
@@ -0,0 +1,61 @@
+import pytest
+from wildfirepy.net.util import ListingCache, MODISHtmlParser, URLOpenerWithRedirect, USGSMirror
+
+HDF = 'MCD64A1.A2020032.h35v10.006.2020102114146.hdf'
+
+
+@pytest.fixture
+def server():
+    with USGSMirror() as mirror:
+        mirror.add_directory('/MOTA/MCD64A1.006/', {HDF: 10})
+        mirror.add_directory('/MOTA/MCD64A1.006/2020.02.01/', {HDF: 10})
+        yield mirror
+
+
+def is_conditional(server):
+    return [headers.get('If-None-Match') is not None for _, headers in server.requests]
+
+
+def test_historical_listing_is_not_refetched(tmpdir, server):
+    parser = MODISHtmlParser(product="MCD64A1", cache=ListingCache(path=tmpdir, ttl=0))
+    url = server.url + '/MOTA/MCD64A1.006/2020.02.01/'
+
+    parser(url)
+    parser(url)
+
+    assert len(server.requests) == 1
+    assert parser.get_filename(35, 10) == HDF
+
+
+def test_expired_listing_is_revalidated(tmpdir, server):
+    cache = ListingCache(path=tmpdir, ttl=0)
+    parser = MODISHtmlParser(product="MCD64A1", cache=cache)
+    url = server.url + '/MOTA/MCD64A1.006/'
+
+    parser(url)
+    parser(url)
+
+    assert is_conditional(server) == [False, True]
+    assert server.hits['/MOTA/MCD64A1.006/'] == 2
+    assert parser.get_all_hdf_files() == [HDF]
+
+
+def test_ttl(tmpdir):
+    cache = ListingCache(path=tmpdir, ttl=60, historical_ttl=3600)
+
+    assert cache.get_ttl('https://e4ftl01.cr.usgs.gov/MOTA/MCD64A1.006/') == 60
+    assert cache.get_ttl('https://e4ftl01.cr.usgs.gov/MOTA/MCD64A1.006/2001.01.01/') == 3600
+
+
+def test_listing_removed_during_revalidation_is_refetched(tmpdir, server):
+    cache = ListingCache(path=tmpdir, ttl=0)
+    opener = URLOpenerWithRedirect()
+    url = server.url + '/MOTA/MCD64A1.006/'
+    page = cache.get(url, opener)
+
+    def invalidating_opener(url, headers=None):
+        cache.invalidate(url)
+        return opener(url, headers=headers)
+
+    assert cache.get(url, invalidating_opener) == page
+    assert is_conditional(server) == [False, True, False]
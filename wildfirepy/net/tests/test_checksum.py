@@ -0,0 +1,83 @@
+import os
+import subprocess
+import pytest
+from wildfirepy.net.usgs import ModisBurntAreaDownloader
+from wildfirepy.net.util import PosixChecksum, parse_sidecar
+
+HDF = 'MCD64A1.A2020032.h24v06.006.2020102113321.hdf'
+HDF_URL = '/MOTA/MCD64A1.006/2020.02.01/' + HDF
+
+
+def get_cksum_size(file):
+    result = subprocess.run(['cksum', file], stdout=subprocess.PIPE)
+    output = result.stdout.decode('utf-8').split()
+    return output
+
+
+def sidecar(checksum, size):
+    return (f'<GranuleMetaDataFile><DataFiles><DataFileContainer><FileSize>{size}</FileSize>'
+            f'<ChecksumType>CKSUM</ChecksumType><Checksum>{checksum}</Checksum>'
+            '</DataFileContainer></DataFiles></GranuleMetaDataFile>').encode()
+
+
+@pytest.mark.parametrize('size', [0, 1, 255, 256, 100000])
+def test_posix_checksum(tmpdir, size):
+    data = os.urandom(size)
+    file = tmpdir.join('data')
+    file.write_binary(data)
+    digest = PosixChecksum()
+    for i in range(0, size, 4096):
+        digest.update(data[i:i + 4096])
+
+    checksum, filesize, _ = get_cksum_size(file)
+
+    assert (str(digest.checksum), str(digest.size)) == (checksum, filesize)
+
+
+def test_parse_sidecar():
+    assert parse_sidecar(sidecar(1234, 5678)) == (1234, 5678)
+
+
+@pytest.fixture
+def downloader(usgs_server):
+    data = os.urandom(10000)
+    digest = PosixChecksum()
+    digest.update(data)
+    usgs_server.add_directory('/MOTA/MCD64A1.006/2020.02.01/', {
+        HDF: data,
+        HDF + '.xml': sidecar(digest.checksum, digest.size),
+    })
+    downloader = ModisBurntAreaDownloader()
+    downloader.base_url = usgs_server.url + '/MOTA/MCD64A1.006/'
+    return downloader
+
+
+def test_get_hdf_verified(tmpdir, usgs_server, downloader):
+    path = downloader.get_hdf(year=2020, month=2, latitude=28.7041, longitude=77.1025,
+                              path=tmpdir, verify=True)
+
+    assert open(path, 'rb').read() == usgs_server.files[HDF_URL]
+    assert usgs_server.hits[HDF_URL] == 1
+
+
+def test_get_hdf_checksum_mismatch(tmpdir, usgs_server, downloader):
+    usgs_server.files[HDF_URL + '.xml'] = sidecar(1234, 10000)
+
+    with pytest.raises(ValueError):
+        downloader.get_hdf(year=2020, month=2, latitude=28.7041, longitude=77.1025,
+                           path=tmpdir, verify=True, retries=1)
+
+    assert usgs_server.hits[HDF_URL] == 2
+    assert not tmpdir.join(HDF).exists()
+
+
+def test_get_hdf_without_checksum(tmpdir, usgs_server, downloader):
+    usgs_server.files[HDF_URL + '.xml'] = (
+        b'<GranuleMetaDataFile><DataFiles><DataFileContainer><FileSize>10000</FileSize>'
+        b'</DataFileContainer></DataFiles></GranuleMetaDataFile>')
+
+    with pytest.raises(ValueError):
+        downloader.get_hdf(year=2020, month=2, latitude=28.7041, longitude=77.1025,
+                           path=tmpdir, verify=True)
+
+    assert usgs_server.hits[HDF_URL] == 0
@@ -0,0 +1,94 @@
+from http.client import IncompleteRead
+from pathlib import Path
+import pytest
+from wildfirepy.net.usgs import AbstractUSGSDownloader
+from wildfirepy.net.util import EarthdataSession, RequestScheduler, USGSMirror
+
+DATA = bytes(range(256)) * 4096
+
+
+@pytest.fixture
+def server():
+    """
+    Serves `DATA` under `/file.hdf`, and under `/broken.hdf`, whose
+    connection drops half way through the body of the first response.
+    """
+    with USGSMirror() as mirror:
+        mirror.add_file('/file.hdf', DATA)
+        mirror.add_file('/broken.hdf', DATA)
+        mirror.interrupt('/broken.hdf')
+        yield mirror
+
+
+def get_ranges(server):
+    return [headers.get('Range') for _, headers in server.requests]
+
+
+@pytest.fixture
+def downloader():
+    # Interrupted downloads are not retried, so that they are seen by the tests.
+    return AbstractUSGSDownloader(scheduler=RequestScheduler(retries=0))
+
+
+def test_fetch_streams_to_file(tmpdir, server, downloader):
+    path = downloader.fetch(server.url + '/file.hdf', path=tmpdir, filename='file.hdf',
+                            chunk_size=1000)
+
+    assert Path(path).read_bytes() == DATA
+    assert not Path(tmpdir, 'file.hdf.part').exists()
+
+
+def test_interrupted_fetch_leaves_no_file(tmpdir, server, downloader):
+    with pytest.raises(IncompleteRead):
+        downloader.fetch(server.url + '/broken.hdf', path=tmpdir, filename='file.hdf')
+
+    assert not Path(tmpdir, 'file.hdf').exists()
+    assert not Path(tmpdir, 'file.hdf.part').exists()
+
+
+def test_interrupted_fetch_keeps_partial_file_on_resume(tmpdir, server, downloader):
+    with pytest.raises(IncompleteRead):
+        downloader.fetch(server.url + '/broken.hdf', path=tmpdir, filename='file.hdf', resume=True)
+
+    assert Path(tmpdir, 'file.hdf.part').read_bytes() == DATA[:len(DATA) // 2]
+
+
+def test_resume(tmpdir, server, downloader):
+    Path(tmpdir, 'file.hdf.part').write_bytes(DATA[:1000])
+
+    path = downloader.fetch(server.url + '/file.hdf', path=tmpdir, filename='file.hdf', resume=True)
+
+    assert Path(path).read_bytes() == DATA
+    assert get_ranges(server) == ['bytes=1000-']
+    assert server.sent == len(DATA) - 1000
+
+
+def test_resume_complete_partial_file(tmpdir, server, downloader):
+    Path(tmpdir, 'file.hdf.part').write_bytes(DATA)
+
+    path = downloader.fetch(server.url + '/file.hdf', path=tmpdir, filename='file.hdf', resume=True)
+
+    assert Path(path).read_bytes() == DATA
+    assert server.sent == 0
+
+
+def test_resume_ignored_by_server(tmpdir, downloader):
+    Path(tmpdir, 'file.hdf.part').write_bytes(b'x' * 1000)
+
+    with USGSMirror(ranges=False) as server:
+        server.add_file('/file.hdf', DATA)
+        path = downloader.fetch(server.url + '/file.hdf', path=tmpdir, filename='file.hdf',
+                                resume=True)
+
+    assert Path(path).read_bytes() == DATA
+    assert get_ranges(server) == ['bytes=1000-']
+
+
+def test_session_download_retried_after_dropped_connection(tmpdir, server):
+    session_downloader = AbstractUSGSDownloader(session=EarthdataSession(),
+                                                scheduler=RequestScheduler(backoff=0))
+
+    path = session_downloader.fetch(server.url + '/broken.hdf', path=tmpdir, filename='data.hdf')
+
+    assert Path(path).read_bytes() == DATA
+    assert server.hits['/broken.hdf'] == 2
@@ -0,0 +1,64 @@
+import pytest
+from wildfirepy.net.usgs import ModisBurntAreaDownloader
+from wildfirepy.net.util import URLOpenerWithRedirect, USGSMirror, ListingCache, MODISHtmlParser
+from wildfirepy.net.util.instrument import StageAggregator, add_hook, remove_hook
+
+
+@pytest.fixture
+def events():
+    events = []
+    add_hook(events.append)
+    yield events
+    remove_hook(events.append)
+
+
+def test_download_stages(tmpdir):
+    with USGSMirror(login=True) as mirror, StageAggregator() as stages:
+        opener = URLOpenerWithRedirect(top_level_url=mirror.url)
+        downloader = ModisBurntAreaDownloader(session=opener)
+        downloader.base_url = mirror.add_modis(months=[(2020, 2)], tiles=[(24, 6)], size=10000)
+        downloader.get_hdf(year=2020, month=2, latitude=28.7041, longitude=77.1025, path=tmpdir)
+
+    report = stages.report()
+
+    assert report['redirect']['count'] >= 2
+    assert report['auth']['count'] == 1
+    assert report['ttfb']['count'] == 2
+    assert report['parse']['count'] == 1
+    assert report['connect']['count'] >= 1
+    assert report['download']['bytes'] == 10000
+    assert report['download']['throughput'] > 0
+    assert report['ttfb']['p50'] <= report['ttfb']['p99']
+    assert 'download' in stages.summary()
+
+
+def test_cache_events(tmpdir, usgs_server, events):
+    usgs_server.add_directory('/MOTA/', {})
+    parser = MODISHtmlParser(cache=ListingCache(path=tmpdir))
+
+    parser(usgs_server.url + '/MOTA/')
+    parser(usgs_server.url + '/MOTA/')
+
+    stages = [event.stage for event in events if event.stage.startswith('cache')]
+    assert stages == ['cache_miss', 'cache_hit']
+
+
+def test_fetch_error_is_reported(tmpdir, usgs_server, events, capsys):
+    downloader = ModisBurntAreaDownloader()
+
+    assert downloader.fetch(usgs_server.url + '/missing.hdf', path=tmpdir) is None
+
+    error, = [event for event in events if event.stage == 'error']
+    assert error.details['error'].code == 404
+    assert capsys.readouterr().out == ''
+
+
+def test_failed_stage_is_reported(tmpdir, usgs_server):
+    with StageAggregator() as stages:
+        ModisBurntAreaDownloader().fetch(usgs_server.url + '/missing.hdf', path=tmpdir)
+
+    report = stages.report()
+
+    assert report['ttfb']['count'] == 1
+    assert report['ttfb']['errors'] == 1
+    assert report['error']['count'] == 1
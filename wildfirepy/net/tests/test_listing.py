@@ -0,0 +1,85 @@
+import datetime
+import pytest
+from wildfirepy.net.util import Listing
+
+
+def modis_row(name, modified, size):
+    return (f'<tr><td><a href="{name}">{name}</a></td>'
+            f'<td align="right">{modified}  </td><td align="right">{size}</td></tr>')
+
+
+def viirs_row(name, modified, size):
+    return f'<a href="{name}">{name}</a>   {modified}   {size}'
+
+
+MODIS_PAGE = '\n'.join([
+    '<table>',
+    '<tr><th><a href="?C=N;O=D">Name</a></th><th><a href="?C=M;O=A">Last modified</a></th></tr>',
+    '<tr><td><a href="/MOTA/MCD64A1.006/">Parent Directory</a></td>'
+    '<td>&nbsp;</td><td align="right">  - </td></tr>',
+    modis_row('BROWSE.MCD64A1.A2020032.h35v10.006.2020102114146.1.jpg', '2020-04-11 13:59', ' 48K'),
+    modis_row('MCD64A1.A2020032.h24v06.006.2020102113321.hdf', '2020-04-11 13:33', '1.4M'),
+    modis_row('MCD64A1.A2020032.h24v06.006.2020102113321.hdf.xml', '2020-04-11 13:33', '7.9K'),
+    modis_row('MCD64A1.A2020032.h35v10.006.2020102114146.hdf', '2020-04-11 13:59', '212'),
+    '</table>',
+])
+
+VIIRS_PAGE = '\n'.join([
+    viirs_row('VNP03MODLL.A2020032.0636.001.2020033040526.h5', '2020-02-02 04:05', '51M'),
+    viirs_row('VNP03MODLL.A2020032.0642.001.2020033040609.h5', '2020-02-02 04:06:30', '52M'),
+    viirs_row('VNP03MODLL.A2020032.0642.001.2020033040609.h5.xml', '2020-02-02 04:06', '9.1K'),
+])
+
+
+@pytest.fixture
+def modis_listing():
+    return Listing.from_html(MODIS_PAGE)
+
+
+def test_entries(modis_listing):
+    entry = modis_listing.get(tile='h24v06', extension='hdf')
+
+    assert len(modis_listing) == 4
+    assert entry.name == 'MCD64A1.A2020032.h24v06.006.2020102113321.hdf'
+    assert entry.product == 'MCD64A1'
+    assert entry.date == 'A2020032'
+    assert entry.collection == '006'
+    assert entry.size == int(1.4 * 1024 ** 2)
+    assert entry.modified == datetime.datetime(2020, 4, 11, 13, 33)
+    assert modis_listing.get(tile='h35v10', extension='hdf').size == 212
+
+
+def test_extensions(modis_listing):
+    assert modis_listing.get(tile='h24v06', extension='hdf.xml').name.endswith('.hdf.xml')
+    assert modis_listing.get(tile='h35v10', extension='jpg').name.startswith('BROWSE.')
+    assert modis_listing.get(tile='h35v10', extension='hdf.xml') is None
+    assert modis_listing.tiles() == [(24, 6), (35, 10)]
+
+
+def test_dates():
+    listing = Listing.from_html('<a href="2020.01.01/">2020.01.01/</a>\n'
+                                '<a href="2020.02.01/">2020.02.01/</a>')
+
+    assert listing.dates == ['2020.01.01', '2020.02.01']
+
+
+def test_find_prefix():
+    listing = Listing.from_html(VIIRS_PAGE)
+
+    entry = listing.find_prefix('VNP03MODLL.A2020032.0642.001.', extension='h5')
+
+    assert entry.name == 'VNP03MODLL.A2020032.0642.001.2020033040609.h5'
+    assert entry.time == '0642'
+    assert entry.size == 52 * 1024 ** 2
+    assert entry.modified == datetime.datetime(2020, 2, 2, 4, 6, 30)
+    assert listing.find_prefix('VNP03MODLL.A2020032.0648.001.') is None
+
+
+def test_granules():
+    listing = Listing.from_html(VIIRS_PAGE)
+
+    assert [entry.time for entry in listing.granules()] == ['0636', '0642']
+    assert [entry.time for entry in listing.granules('0637', '0700')] == ['0642']
+    assert [entry.time for entry in listing.granules(end='0636')] == ['0636']
+    assert [entry.time for entry in listing.granules(extension='h5.xml')] == ['0642']
+    assert listing.granules('0700') == []
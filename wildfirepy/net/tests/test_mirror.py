@@ -0,0 +1,83 @@
+import datetime
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from wildfirepy.net.usgs import ModisBurntAreaDownloader, VIIRSBurntAreaDownloader
+from wildfirepy.net.util import URLOpenerWithRedirect, USGSMirror, PosixChecksum, EarthdataSession
+
+
+@pytest.fixture
+def mirror():
+    with USGSMirror(login=True) as mirror:
+        yield mirror
+
+
+def test_modis_through_login(tmpdir, mirror):
+    base_url = mirror.add_modis(months=[(2020, 1), (2020, 2)], tiles=[(24, 6), (35, 10)], size=5000)
+    downloader = ModisBurntAreaDownloader(session=URLOpenerWithRedirect(top_level_url=mirror.url))
+    downloader.base_url = base_url
+
+    path = downloader.get_hdf(year=2020, month=2, latitude=28.7041, longitude=77.1025,
+                              verify=True, path=tmpdir)
+
+    assert downloader.get_available_dates() == ['2020.01.01', '2020.02.01']
+    assert path.endswith('MCD64A1.A2020032.h24v06.006.2020032000000.hdf')
+    with open(path, 'rb') as file:
+        assert len(file.read()) == 5000
+    assert mirror.hits['/login?next=/MOTA/MCD64A1.006/2020.02.01/'] == 2
+
+
+def test_login_requires_credentials(mirror):
+    mirror.add_file('/data.hdf', b'data')
+    opener = URLOpenerWithRedirect(top_level_url=mirror.url, password='wrong')
+
+    with pytest.raises(HTTPError) as error:
+        opener(mirror.url + '/data.hdf')
+    assert error.value.code == 401
+
+
+def test_range():
+    with USGSMirror() as mirror:
+        mirror.add_file('/data.hdf', b'0123456789')
+        opener = URLOpenerWithRedirect()
+
+        response = opener(mirror.url + '/data.hdf', headers={'Range': 'bytes=4-'})
+        assert response.status == 206
+        assert response.headers.get('Content-Range') == 'bytes 4-9/10'
+        assert response.read() == b'456789'
+
+        with pytest.raises(HTTPError) as error:
+            opener(mirror.url + '/data.hdf', headers={'Range': 'bytes=10-'})
+        assert error.value.code == 416
+
+
+def test_concurrent_hits_are_counted():
+    with USGSMirror() as mirror:
+        mirror.add_file('/data.hdf', b'data')
+        session = EarthdataSession(pool_size=8)
+
+        def read(_):
+            return session(mirror.url + '/data.hdf').read()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            contents = list(pool.map(read, range(200)))
+
+    assert contents == [b'data'] * 200
+    assert mirror.hits['/data.hdf'] == len(mirror.requests) == 200
+    assert mirror.sent == 800
+
+
+def test_viirs_sidecar_checksum(tmpdir):
+    with USGSMirror() as mirror:
+        downloader = VIIRSBurntAreaDownloader()
+        downloader.base_url = mirror.add_viirs(days=[datetime.date(2020, 2, 1)], size=3000)
+
+        granules = downloader.find_granules([(2020, 2, 1)], start_time=datetime.time(6),
+                                            end_time=datetime.time(7))
+        checksum, size = downloader.get_sidecar_checksum(downloader.base_url + '2020.02.01/' +
+                                                         granules[0].name + '.xml')
+        digest = PosixChecksum()
+        digest.update(mirror.get_content('/VIIRS/VNP03MODLL.001/2020.02.01/' + granules[0].name))
+
+    assert len(granules) == 11
+    assert (checksum, size) == (digest.checksum, 3000)
@@ -1,8 +1,15 @@
+import numpy as np
 import pytest
+import time
+import threading
+from urllib.error import HTTPError
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from xml.dom import minidom
-from wildfirepy.net.usgs import ModisBurntAreaDownloader
-from wildfirepy.net.util import URLOpenerWithRedirect, MODISHtmlParser
+from pathlib import Path
+from wildfirepy.net.usgs import ModisBurntAreaDownloader, DownloadManifest, read_points
+from wildfirepy.net.util import (URLOpenerWithRedirect, MODISHtmlParser, USGSMirror, ListingCache,
+                                 TileStore)
 
 opener = URLOpenerWithRedirect()
 downloader = ModisBurntAreaDownloader()
@@ -80,3 +87,324 @@ def test_filename_does_not_exists(parser):
 
     with pytest.raises(ValueError):
         parser.get_filename(35, 11)
+
+
+def test_filename_from_listing(usgs_server):
+    usgs_server.add_directory('/MOTA/MCD64A1.006/2020.02.01/', {
+        'MCD64A1.A2020032.h24v06.006.2020102113321.hdf': b'delhi',
+    })
+    listing_parser = MODISHtmlParser(product="MCD64A1")
+
+    listing = listing_parser.get_listing(usgs_server.url + '/MOTA/MCD64A1.006/2020.02.01/')
+
+    assert listing_parser.get_filename(24, 6, listing=listing) == \
+        'MCD64A1.A2020032.h24v06.006.2020102113321.hdf'
+    with pytest.raises(ValueError):
+        listing_parser.get_filename(35, 10, listing=listing)
+
+
+def test_get_batch(tmpdir, usgs_server):
+    usgs_server.add_directory('/MOTA/MCD64A1.006/2020.02.01/', {
+        'MCD64A1.A2020032.h24v06.006.2020102113321.hdf': b'delhi',
+        'MCD64A1.A2020032.h35v10.006.2020102114146.hdf': b'fiji',
+    })
+    usgs_server.add_directory('/MOTA/MCD64A1.006/2020.03.01/', {
+        'MCD64A1.A2020061.h24v06.006.2020133113321.hdf': b'delhi in march',
+    })
+    batch_downloader = ModisBurntAreaDownloader()
+    batch_downloader.base_url = usgs_server.url + '/MOTA/MCD64A1.006/'
+
+    results = batch_downloader.get_batch([
+        (2020, 2, 28.7041, 77.1025),
+        {'year': 2020, 'month': 2, 'latitude': 28.6, 'longitude': 77.2},
+        (2020, 3, 28.7041, 77.1025),
+        (2020, 3, 0, 0),
+    ], path=tmpdir, max_workers=4)
+
+    contents = [open(r.path, 'rb').read() for r in results[:3]]
+    assert contents == [b'delhi', b'delhi', b'delhi in march']
+    assert results[0].path == results[1].path
+    assert results[3].path is None
+    assert isinstance(results[3].error, ValueError)
+    assert usgs_server.hits['/MOTA/MCD64A1.006/2020.02.01/'] == 1
+    assert usgs_server.hits['/MOTA/MCD64A1.006/2020.03.01/'] == 1
+    tile_file = 'MCD64A1.A2020032.h24v06.006.2020102113321.hdf'
+    assert usgs_server.hits['/MOTA/MCD64A1.006/2020.02.01/' + tile_file] == 1
+
+
+def test_get_batch_missing_date(tmpdir, usgs_server):
+    batch_downloader = ModisBurntAreaDownloader()
+    batch_downloader.base_url = usgs_server.url + '/MOTA/MCD64A1.006/'
+
+    results = batch_downloader.get_batch([(2020, 2, 28.7041, 77.1025)], path=tmpdir)
+
+    assert results[0].path is None
+    assert results[0].error.code == 404
+
+
+@pytest.fixture
+def monthly_server(usgs_server):
+    for month, day in ((1, '001'), (2, '032'), (3, '061')):
+        usgs_server.add_directory(f'/MOTA/MCD64A1.006/2020.{month:02d}.01/', {
+            f'MCD64A1.A2020{day}.h24v06.006.2020102113321.hdf': f'delhi {month}'.encode(),
+        })
+    return usgs_server
+
+
+def test_get_hdf_for_another_month(tmpdir, monthly_server):
+    month_downloader = ModisBurntAreaDownloader()
+    month_downloader.base_url = monthly_server.url + '/MOTA/MCD64A1.006/'
+
+    paths = [month_downloader.get_hdf(year=2020, month=month, latitude=28.7041,
+                                      longitude=77.1025, path=tmpdir) for month in (1, 2)]
+
+    assert [open(path, 'rb').read() for path in paths] == [b'delhi 1', b'delhi 2']
+
+
+def test_shared_downloader_serves_months_concurrently(tmpdir, monthly_server):
+    shared = ModisBurntAreaDownloader()
+    shared.base_url = monthly_server.url + '/MOTA/MCD64A1.006/'
+    months = [1, 2, 3] * 8
+
+    def get_filename(month):
+        return shared.get_filename(28.7041, 77.1025, year=2020, month=month)
+
+    def get_hdf(i):
+        return shared.get_hdf(year=2020, month=months[i], latitude=28.7041, longitude=77.1025,
+                              path=tmpdir.mkdir(str(i)))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        names = list(pool.map(get_filename, months))
+        paths = list(pool.map(get_hdf, range(len(months))))
+
+    assert [name.split('.')[1] for name in names] == ['A2020001', 'A2020032', 'A2020061'] * 8
+    assert [open(path, 'rb').read() for path in paths] == \
+        [b'delhi 1', b'delhi 2', b'delhi 3'] * 8
+    for month in (1, 2, 3):
+        assert monthly_server.hits[f'/MOTA/MCD64A1.006/2020.{month:02d}.01/'] == 1
+
+
+def test_files_of_the_default_month(monthly_server):
+    month_downloader = ModisBurntAreaDownloader()
+    month_downloader.base_url = monthly_server.url + '/MOTA/MCD64A1.006/'
+
+    february = 'MCD64A1.A2020032.h24v06.006.2020102113321.hdf'
+    march = 'MCD64A1.A2020061.h24v06.006.2020102113321.hdf'
+
+    with pytest.raises(ValueError):
+        month_downloader.get_available_hdf_files()
+    assert month_downloader.get_files_from_date(2020, 2) == [february]
+    assert month_downloader.get_filename(28.7041, 77.1025) == february
+    assert month_downloader.get_available_hdf_files(2020, 3) == [march]
+    assert month_downloader.get_available_hdf_files() == [february]
+
+    # Another thread has its own default month.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(month_downloader.get_files_from_date, 2020, 3).result() == [march]
+        assert pool.submit(month_downloader.get_available_hdf_files).result() == [march]
+    assert month_downloader.files_date == (2020, 2)
+    assert month_downloader.get_available_hdf_files() == [february]
+    with pytest.raises(AttributeError):
+        month_downloader.files_date = (2020, 3)
+
+
+def test_memoized_listings_are_bounded_and_expire(monthly_server):
+    memo_downloader = ModisBurntAreaDownloader()
+    memo_downloader.base_url = monthly_server.url + '/MOTA/MCD64A1.006/'
+    memo_downloader.listing_memo_size = 2
+
+    for month in (1, 2, 3, 1):
+        memo_downloader.get_listing(2020, month)
+    hits = [monthly_server.hits[f'/MOTA/MCD64A1.006/2020.{month:02d}.01/'] for month in (1, 2, 3)]
+    assert hits == [2, 1, 1]
+
+    memo_downloader.listing_ttl = 0
+    memo_downloader.get_listing(2020, 2)
+    memo_downloader.get_listing(2020, 2)
+    assert monthly_server.hits['/MOTA/MCD64A1.006/2020.02.01/'] == 3
+
+
+def test_iter_hdf_prefetches(tmpdir, monthly_server):
+    month_downloader = ModisBurntAreaDownloader()
+    month_downloader.base_url = monthly_server.url + '/MOTA/MCD64A1.006/'
+    months = month_downloader.iter_hdf(start=(2019, 12), end=(2020, 3),
+                                       locations=[(28.7041, 77.1025)], path=tmpdir, lookahead=2)
+
+    year, month, results = next(months)
+    for _ in range(100):
+        if monthly_server.hits['/MOTA/MCD64A1.006/2020.02.01/']:
+            break
+        time.sleep(0.01)
+
+    assert (year, month) == (2019, 12)
+    assert isinstance(results[0].error, HTTPError)
+    assert monthly_server.hits['/MOTA/MCD64A1.006/2020.02.01/'] == 1
+    assert monthly_server.hits['/MOTA/MCD64A1.006/2020.03.01/'] == 0
+
+    rest = [(year, month, open(results[0].path, 'rb').read()) for year, month, results in months]
+    assert rest == [(2020, 1, b'delhi 1'), (2020, 2, b'delhi 2'), (2020, 3, b'delhi 3')]
+
+
+def test_closing_iter_hdf_stops_prefetching(tmpdir, usgs_server):
+    started, release = threading.Event(), threading.Event()
+
+    class BlockingDownloader(ModisBurntAreaDownloader):
+        def _fetch(self, **kwargs):
+            started.set()
+            release.wait(5)
+            return super()._fetch(**kwargs)
+
+    locations = [(28.7041, 77.1025), (0.5, 0.5)]
+    h, v, _, _ = downloader.converter.get_modis_grid_coords(*zip(*locations))
+    names = [f'MCD64A1.A2020001.h{i:02d}v{j:02d}.006.2020102113321.hdf' for i, j in zip(h, v)]
+    usgs_server.add_directory('/MOTA/MCD64A1.006/2020.01.01/', {name: b'tile' for name in names})
+    blocking = BlockingDownloader()
+    blocking.base_url = usgs_server.url + '/MOTA/MCD64A1.006/'
+
+    months = blocking.iter_hdf(start=(2019, 12), end=(2020, 2), locations=locations,
+                               path=tmpdir, lookahead=1, max_workers=1)
+    assert next(months)[:2] == (2019, 12)
+    assert started.wait(5)
+    threading.Timer(0.2, release.set).start()
+    months.close()
+
+    assert sum(usgs_server.hits['/MOTA/MCD64A1.006/2020.01.01/' + name] for name in names) == 1
+    assert usgs_server.hits['/MOTA/MCD64A1.006/2020.02.01/'] == 0
+
+
+@pytest.fixture(scope='module')
+def delhi_tile(tmp_path_factory):
+    SD = pytest.importorskip('pyhdf.SD')
+    path = str(tmp_path_factory.mktemp('hdf') / 'tile.hdf')
+    file = SD.SD(path, SD.SDC.WRITE | SD.SDC.CREATE)
+    rows, cols = np.mgrid[0:2400, 0:2400]
+    for name, dtype, value in (('Burn Date', SD.SDC.INT16, rows.astype(np.int16)),
+                               ('QA', SD.SDC.UINT8, (cols % 256).astype(np.uint8))):
+        dataset = file.create(name, dtype, (2400, 2400))
+        dataset[:] = value
+        dataset.endaccess()
+    file.end()
+    with open(path, 'rb') as tile:
+        return tile.read()
+
+
+def test_query_burn_date(tmpdir, usgs_server, delhi_tile):
+    usgs_server.add_directory('/MOTA/MCD64A1.006/2020.02.01/', {
+        'MCD64A1.A2020032.h24v06.006.2020102113321.hdf': delhi_tile,
+    })
+    query_downloader = ModisBurntAreaDownloader()
+    query_downloader.base_url = usgs_server.url + '/MOTA/MCD64A1.006/'
+
+    burn_date, qa = query_downloader.query_burn_date([28.7041, 28.6, -17.71],
+                                                     [77.1025, 77.2, 178.07],
+                                                     year=2020, month=2, path=tmpdir)
+    again, _ = query_downloader.query_burn_date([28.7041], [77.1025], year=2020, month=2,
+                                                path=tmpdir)
+
+    converter = query_downloader.converter
+    _, _, row, col = converter.get_modis_grid_coords([28.7041, 28.6], [77.1025, 77.2])
+
+    assert burn_date.tolist() == row.tolist() + [-2]
+    assert qa.tolist() == (col % 256).tolist() + [0]
+    assert again.tolist() == row[:1].tolist()
+    assert len(query_downloader.array_cache) == 1
+
+
+def test_get_mosaic(tmpdir, usgs_server, delhi_tile):
+    usgs_server.add_directory('/MOTA/MCD64A1.006/2020.02.01/', {
+        'MCD64A1.A2020032.h24v06.006.2020102113321.hdf': delhi_tile,
+        'MCD64A1.A2020032.h25v06.006.2020102113321.hdf': delhi_tile,
+    })
+    mosaic_downloader = ModisBurntAreaDownloader()
+    mosaic_downloader.base_url = usgs_server.url + '/MOTA/MCD64A1.006/'
+
+    # The region straddles the boundary between h24v06 and h25v06.
+    mosaic, row, col = mosaic_downloader.get_mosaic(year=2020, month=2,
+                                                    lat_min=25.01, lat_max=25.99,
+                                                    lon_min=77.01, lon_max=77.99,
+                                                    dataset='Burn Date',
+                                                    output=str(tmpdir / 'mosaic.npy'), path=tmpdir)
+
+    assert row // 2400 == 6
+    assert col < 25 * 2400 < col + mosaic.shape[1]
+    assert (mosaic == (np.arange(row, row + mosaic.shape[0]) % 2400)[:, None]).all()
+
+
+def test_get_cube_appends_new_months(tmpdir, usgs_server, delhi_tile):
+    for month, day in ((1, '001'), (2, '032')):
+        usgs_server.add_directory(f'/MOTA/MCD64A1.006/2020.{month:02d}.01/', {
+            f'MCD64A1.A2020{day}.h24v06.006.2020102113321.hdf': delhi_tile,
+        })
+    cube_downloader = ModisBurntAreaDownloader()
+    cube_downloader.base_url = usgs_server.url + '/MOTA/MCD64A1.006/'
+    region = {'lat_min': 28.51, 'lat_max': 28.79, 'lon_min': 77.01, 'lon_max': 77.29}
+
+    cube_path = str(tmpdir / 'cube')
+    cube = cube_downloader.get_cube(cube_path, start=(2020, 1), end=(2020, 1), path=tmpdir,
+                                    **region)
+    cube = cube_downloader.get_cube(cube_path, start=(2020, 1), end=(2020, 2), path=tmpdir)
+
+    assert cube.months == [(2020, 1), (2020, 2)]
+    assert cube.time_series(0, 0).tolist() == [cube.origin[0] % 2400] * 2
+    assert usgs_server.hits['/MOTA/MCD64A1.006/2020.01.01/'] == 1
+    assert sorted(path.basename for path in (tmpdir / 'cube').listdir()) == \
+        ['manifest.json', 't0000_r0000_c0000.npy']
+    with pytest.raises(ValueError):
+        cube_downloader.get_cube(cube_path, start=(2020, 4), end=(2020, 4), path=tmpdir)
+    assert usgs_server.hits['/MOTA/MCD64A1.006/2020.04.01/'] == 0
+
+
+def test_plan_downloads(tmpdir):
+    points = Path(tmpdir, 'fires.csv')
+    points.write_text('latitude,longitude,acq_date\n'
+                      '28.7041,77.1025,2020-02-14\n'
+                      '28.6,77.2,2020-02-20\n'
+                      '28.7041,77.1025,2020-03-01\n'
+                      '-17.7134,178.065,2020-02-02\n'
+                      '0,0,2020-02-02\n'
+                      '28.7041,77.1025,2020-04-01\n'
+                      'n/a,77.1025,2020-02-14\n')
+    with USGSMirror() as mirror:
+        store = TileStore(root=str(Path(tmpdir, 'store')))
+        cache = ListingCache(path=str(Path(tmpdir, 'cache')))
+        planner = ModisBurntAreaDownloader(cache=cache, store=store)
+        planner.base_url = mirror.add_modis(months=[(2020, 2), (2020, 3)],
+                                            tiles=[(24, 6), (34, 10)], size=5000)
+        key = planner._get_store_key(2020, 2, 34, 10)
+        stored = Path(store.get_directory(key), 'fiji.hdf')
+        stored.write_bytes(b'fiji')
+        store.put(key, str(stored))
+
+        manifest = planner.plan_downloads(read_points(points), chunk_size=2)
+
+        assert [(entry.year, entry.month, entry.h, entry.v, entry.points)
+                for entry in manifest] == \
+            [(2020, 2, 24, 6, 2), (2020, 2, 34, 10, 1), (2020, 3, 24, 6, 1)]
+        assert manifest.missing == [(2020, 2, 18, 9), (2020, 4, 24, 6)]
+        assert (manifest.points, manifest.skipped) == (7, 1)
+        assert manifest.total_size == 2 * 5000
+        assert manifest.urls() == [
+            planner.base_url + '2020.02.01/MCD64A1.A2020032.h24v06.006.2020032000000.hdf',
+            planner.base_url + '2020.03.01/MCD64A1.A2020061.h24v06.006.2020061000000.hdf']
+        assert not any(path.endswith('.hdf') for path in mirror.hits)
+
+        manifest.save(Path(tmpdir, 'manifest.json'))
+        loaded = DownloadManifest.load(Path(tmpdir, 'manifest.json'))
+        assert loaded.entries == manifest.entries and loaded.missing == manifest.missing
+
+        planner.plan_downloads(read_points(points))
+        assert mirror.hits['/MOTA/MCD64A1.006/2020.02.01/'] == 1
+
+
+def test_plan_downloads_listing_error(tmpdir):
+    points = Path(tmpdir, 'fires.csv')
+    points.write_text('latitude,longitude,acq_date\n'
+                      '28.7041,77.1025,2020-02-14\n')
+    with USGSMirror() as mirror:
+        planner = ModisBurntAreaDownloader()
+        planner.base_url = mirror.add_modis(months=[(2020, 2)], tiles=[(24, 6)])
+        mirror.fail('/MOTA/MCD64A1.006/2020.02.01/', status=403)
+
+        with pytest.raises(HTTPError) as err:
+            planner.plan_downloads(read_points(points))
+        assert err.value.code == 403
@@ -0,0 +1,216 @@
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from email.utils import format_datetime
+from pathlib import Path
+from urllib.error import HTTPError
+import datetime
+import threading
+import time
+import pytest
+import requests
+import urllib3
+from wildfirepy.net.usgs import AbstractUSGSDownloader, ModisBurntAreaDownloader
+from wildfirepy.net.util import RequestScheduler, USGSMirror
+from wildfirepy.net.util.instrument import add_hook, remove_hook
+from wildfirepy.net.util.scheduler import _get_retry_after
+
+
+def overloaded(code=503, retry_after=None):
+    headers = Message()
+    if retry_after is not None:
+        headers['Retry-After'] = retry_after
+    return HTTPError('http://example.com/', code, 'Service Unavailable', headers, None)
+
+
+class Flaky:
+    """
+    Raises the given errors on its first calls, then returns `'done'`.
+    """
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'done'
+
+
+@pytest.fixture
+def events():
+    events = []
+    add_hook(events.append)
+    yield events
+    remove_hook(events.append)
+
+
+def test_retries_overloaded_requests(events):
+    scheduler = RequestScheduler(backoff=0)
+    request = Flaky(overloaded(503), overloaded(429), ConnectionResetError())
+
+    assert scheduler.run('http://example.com/', request) == 'done'
+    assert request.calls == 4
+    assert [event.details['reason'] for event in events if event.stage == 'retry'] == \
+        [503, 429, 'ConnectionResetError']
+
+
+def test_does_not_retry_other_errors():
+    scheduler = RequestScheduler(backoff=0)
+    request = Flaky(overloaded(404))
+
+    with pytest.raises(HTTPError):
+        scheduler.run('http://example.com/', request)
+    assert request.calls == 1
+    assert scheduler.connections == scheduler.max_connections
+
+
+def test_other_errors_keep_the_limit():
+    scheduler = RequestScheduler(max_connections=8, retries=0)
+    with pytest.raises(HTTPError):
+        scheduler.run('http://example.com/', Flaky(overloaded()))
+    assert scheduler._limit == 4
+
+    for code in (401, 403, 404):
+        with pytest.raises(HTTPError):
+            scheduler.run('http://example.com/', Flaky(overloaded(code)))
+    assert scheduler._limit == 4
+    assert scheduler.active == 0
+
+
+def test_releases_on_interrupt():
+    scheduler = RequestScheduler(max_connections=8)
+
+    with pytest.raises(KeyboardInterrupt):
+        scheduler.run('http://example.com/', Flaky(KeyboardInterrupt()))
+    assert scheduler.active == 0
+    assert scheduler.connections == 8
+
+
+def test_gives_up_after_retries():
+    scheduler = RequestScheduler(retries=2, backoff=0)
+    request = Flaky(*[overloaded() for _ in range(5)])
+
+    with pytest.raises(HTTPError):
+        scheduler.run('http://example.com/', request)
+    assert request.calls == 3
+
+
+def test_honours_retry_after():
+    scheduler = RequestScheduler(backoff=0)
+    started = time.perf_counter()
+
+    scheduler.run('http://example.com/', Flaky(overloaded(429, retry_after='1')))
+
+    assert time.perf_counter() - started >= 1
+
+
+def test_retries_dropped_session_connections():
+    scheduler = RequestScheduler(backoff=0)
+    request = Flaky(requests.exceptions.ConnectionError(),
+                    requests.exceptions.ChunkedEncodingError(),
+                    urllib3.exceptions.ProtocolError('Connection broken'))
+
+    assert scheduler.run('http://example.com/', request) == 'done'
+    assert request.calls == 4
+
+
+def test_retry_after_date():
+    date = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+
+    assert 25 < _get_retry_after(overloaded(retry_after=format_datetime(date, usegmt=True))) <= 30
+    assert _get_retry_after(overloaded(retry_after='soon')) is None
+    assert _get_retry_after(overloaded()) is None
+
+
+def test_additive_increase_multiplicative_decrease():
+    scheduler = RequestScheduler(max_connections=8, backoff=0)
+
+    scheduler.run('http://example.com/', Flaky(overloaded()))
+    assert scheduler.connections == 4
+
+    # About one more connection every time a whole limit of requests succeeded.
+    for _ in range(3):
+        scheduler.run('http://example.com/', Flaky())
+    assert scheduler.connections == 4
+    for _ in range(30):
+        scheduler.run('http://example.com/', Flaky())
+    assert scheduler.connections == 8
+
+
+def test_one_decrease_per_overload():
+    scheduler = RequestScheduler(max_connections=8, retries=0)
+    barrier = threading.Barrier(8)
+
+    def request():
+        barrier.wait()
+        raise overloaded()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(scheduler.run, 'http://example.com/', request) for _ in range(8)]
+    assert all(isinstance(future.exception(), HTTPError) for future in futures)
+    assert scheduler.connections == 4
+
+
+def test_limits_concurrency():
+    scheduler = RequestScheduler(max_connections=3)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def request():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        list(pool.map(lambda _: scheduler.run('http://example.com/', request), range(30)))
+    assert peak[0] == 3
+
+
+def test_fetch_retries_overloaded_server(tmpdir):
+    with USGSMirror() as mirror:
+        mirror.add_file('/data.hdf', 1000)
+        mirror.fail('/data.hdf', 503, count=2)
+        downloader = AbstractUSGSDownloader(scheduler=RequestScheduler(backoff=0))
+
+        path = downloader.fetch(mirror.url + '/data.hdf', path=tmpdir, filename='data.hdf')
+
+        assert Path(path).read_bytes() == mirror.get_content('/data.hdf')
+        assert mirror.hits['/data.hdf'] == 3
+
+
+def test_batch_on_rate_limited_server(tmpdir):
+    with USGSMirror(max_requests=2, latency=0.01) as mirror:
+        for i in range(24):
+            mirror.add_file(f'/{i}.hdf', 1000)
+        scheduler = RequestScheduler(max_connections=8, backoff=0.01)
+        downloader = AbstractUSGSDownloader(scheduler=scheduler)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            def fetch(i):
+                return downloader._fetch(mirror.url + f'/{i}.hdf', path=tmpdir, filename=f'{i}.hdf')
+
+            paths = list(pool.map(fetch, range(24)))
+
+        assert all(Path(path).exists() for path in paths)
+        assert mirror.rejected > 0
+        assert scheduler.connections < 8
+
+
+def test_batch_retries_overloaded_listing(tmpdir):
+    with USGSMirror(retry_after=0) as mirror:
+        mirror.add_directory('/MOTA/MCD64A1.006/2020.02.01/', {
+            'MCD64A1.A2020032.h24v06.006.2020102113321.hdf': b'delhi',
+        })
+        mirror.fail('/MOTA/MCD64A1.006/2020.02.01/', 503)
+        downloader = ModisBurntAreaDownloader(scheduler=RequestScheduler(backoff=0))
+        downloader.base_url = mirror.url + '/MOTA/MCD64A1.006/'
+
+        results = downloader.get_batch([(2020, 2, 28.7041, 77.1025)], path=tmpdir)
+
+        assert results[0].error is None
+        assert Path(results[0].path).read_bytes() == b'delhi'
+        assert mirror.hits['/MOTA/MCD64A1.006/2020.02.01/'] == 2
@@ -0,0 +1,52 @@
+from pathlib import Path
+from urllib.error import HTTPError
+import pytest
+from wildfirepy.net.usgs import ModisBurntAreaDownloader
+from wildfirepy.net.util import EarthdataSession, USGSMirror
+
+
+@pytest.fixture
+def login_server():
+    with USGSMirror(login=True) as mirror:
+        mirror.add_file('/data.hdf', b'data')
+        yield mirror
+
+
+def test_login_redirect_cookies_are_shared(login_server):
+    session = EarthdataSession(top_level_url=login_server.url)
+
+    assert session(login_server.url + '/data.hdf').read() == b'data'
+    assert session(login_server.url + '/data.hdf').read() == b'data'
+    assert login_server.hits['/login?next=/data.hdf'] == 1
+
+
+def test_cookies_saved_across_sessions(tmpdir, login_server):
+    cookie_file = Path(tmpdir, 'cookies.txt')
+
+    session = EarthdataSession(top_level_url=login_server.url, cookie_file=cookie_file)
+    session(login_server.url + '/data.hdf').read()
+    session.save_cookies()
+
+    # Without the credentials, only the saved cookie gets past the login.
+    restored = EarthdataSession(cookie_file=cookie_file)
+    assert restored(login_server.url + '/data.hdf').read() == b'data'
+    with pytest.raises(HTTPError):
+        EarthdataSession()(login_server.url + '/data.hdf')
+
+
+def test_downloader_reuses_connection(tmpdir, usgs_server):
+    usgs_server.add_directory('/MOTA/MCD64A1.006/2020.02.01/', {
+        'MCD64A1.A2020032.h24v06.006.2020102113321.hdf': b'delhi',
+        'MCD64A1.A2020032.h24v06.006.2020102113321.hdf.xml': b'<xml/>',
+    })
+    downloader = ModisBurntAreaDownloader(session=EarthdataSession())
+    downloader.base_url = usgs_server.url + '/MOTA/MCD64A1.006/'
+
+    delhi = dict(year=2020, month=2, latitude=28.7041, longitude=77.1025, path=tmpdir)
+    hdf_file = downloader.get_hdf(**delhi)
+    xml_file = downloader.get_xml(**delhi)
+
+    assert Path(hdf_file).read_bytes() == b'delhi'
+    assert Path(xml_file).read_bytes() == b'<xml/>'
+    assert downloader.regex_traverser.url_opener is downloader.url_opener
+    assert len(usgs_server.connections) == 1
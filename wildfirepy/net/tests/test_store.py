@@ -0,0 +1,73 @@
+from pathlib import Path
+from wildfirepy.net.usgs import ModisBurntAreaDownloader
+from wildfirepy.net.util import TileStore
+
+
+def add_file(store, key, size):
+    path = Path(store.get_directory(key), '.'.join(key))
+    path.write_bytes(b'x' * size)
+    return store.put(key, path)
+
+
+def test_lru_eviction(tmpdir):
+    store = TileStore(root=tmpdir, max_bytes=250)
+    first = ('MCD64A1', '006', 'A2020032', 'h24v06', 'hdf')
+    second = ('MCD64A1', '006', 'A2020032', 'h25v06', 'hdf')
+    third = ('MCD64A1', '006', 'A2020032', 'h26v06', 'hdf')
+
+    add_file(store, first, 100)
+    add_file(store, second, 100)
+    store.get(first)
+    add_file(store, third, 100)
+
+    assert first in store and third in store
+    assert second not in store
+    assert store.total_bytes == 200
+    assert len(TileStore(root=tmpdir)) == 2
+
+
+def test_missing_file_is_a_miss(tmpdir):
+    store = TileStore(root=tmpdir)
+    key = ('MCD64A1', '006', 'A2020032', 'h24v06', 'hdf')
+    Path(add_file(store, key, 10)).unlink()
+
+    assert store.get(key) is None
+
+
+def test_get_hdf_uses_store(tmpdir, usgs_server):
+    usgs_server.add_directory('/MOTA/MCD64A1.006/2020.02.01/', {
+        'MCD64A1.A2020032.h24v06.006.2020102113321.hdf': b'delhi',
+    })
+    store = TileStore(root=tmpdir)
+    downloader = ModisBurntAreaDownloader(store=store)
+    downloader.base_url = usgs_server.url + '/MOTA/MCD64A1.006/'
+
+    path = downloader.get_hdf(year=2020, month=2, latitude=28.7041, longitude=77.1025)
+
+    other_downloader = ModisBurntAreaDownloader(store=TileStore(root=tmpdir))
+    other_downloader.base_url = usgs_server.url + '/MOTA/MCD64A1.006/'
+    results = other_downloader.get_batch([(2020, 2, 28.7041, 77.1025)])
+
+    assert path == results[0].path
+    assert Path(path).read_bytes() == b'delhi'
+    assert Path(path).parent == Path(tmpdir, 'MCD64A1', '006', 'A2020032')
+    assert sum(usgs_server.hits.values()) == 2
+
+
+def test_access_times_are_persisted(tmpdir):
+    first = ('MCD64A1', '006', 'A2020032', 'h24v06', 'hdf')
+    second = ('MCD64A1', '006', 'A2020032', 'h25v06', 'hdf')
+    missing = ('MCD64A1', '006', 'A2020032', 'h26v06', 'hdf')
+    with TileStore(root=tmpdir) as store:
+        add_file(store, first, 100)
+        add_file(store, second, 100)
+        Path(add_file(store, missing, 100)).unlink()
+        store.get(first)
+        store.get(missing)
+
+    reloaded = TileStore(root=tmpdir, max_bytes=250)
+    assert len(reloaded) == 2
+    add_file(reloaded, missing, 100)
+
+    assert first in reloaded
+    assert second not in reloaded
@@ -1,5 +1,7 @@
+import datetime
 import pytest
 import subprocess
+from urllib.error import HTTPError
 from xml.dom import minidom
 from wildfirepy.net.usgs import VIIRSBurntAreaDownloader
 from wildfirepy.net.util import URLOpenerWithRedirect, VIIRSHtmlParser
@@ -50,3 +52,58 @@ def test_fetch(tmpdir, obs_date, obs_time):
 
     assert checksum_upstream == checksum
     assert filesize_upstream == filesize
+
+
+@pytest.fixture
+def daily_server(usgs_server):
+    for day, julian_day in ((1, '032'), (2, '033')):
+        usgs_server.add_directory(f'/VIIRS/VNP03MODLL.001/2020.02.{day:02d}/', {
+            f'VNP03MODLL.A2020{julian_day}.{time}.001.2020034040609.h5': f'{day} {time}'.encode()
+            for time in ('0554', '0600', '0642', '1130', '1136')
+        })
+    return usgs_server
+
+
+def test_find_granules(daily_server):
+    range_downloader = VIIRSBurntAreaDownloader()
+    range_downloader.base_url = daily_server.url + '/VIIRS/VNP03MODLL.001/'
+
+    granules = range_downloader.find_granules([datetime.date(2020, 2, 2), (2020, 2, 1)],
+                                              start_time=datetime.time(6, 3),
+                                              end_time=datetime.time(11, 30))
+
+    assert [(entry.date, entry.time) for entry in granules] == [
+        ('A2020032', '0600'), ('A2020032', '0642'), ('A2020032', '1130'),
+        ('A2020033', '0600'), ('A2020033', '0642'), ('A2020033', '1130')]
+
+
+def test_get_h5_batch(tmpdir, daily_server):
+    range_downloader = VIIRSBurntAreaDownloader()
+    range_downloader.base_url = daily_server.url + '/VIIRS/VNP03MODLL.001/'
+
+    results = range_downloader.get_h5_batch(days=[(2020, 2, 1), (2020, 2, 2)],
+                                            start_time=datetime.time(6), end_time=datetime.time(7),
+                                            path=tmpdir, max_workers=4)
+    path = range_downloader.get_h5(year=2020, month=2, date=1, hours=6, minutes=45, path=tmpdir)
+
+    assert [open(result.path, 'rb').read() for result in results] == \
+        [b'1 0600', b'1 0642', b'2 0600', b'2 0642']
+    assert open(path, 'rb').read() == b'1 0642'
+    assert daily_server.hits['/VIIRS/VNP03MODLL.001/2020.02.01/'] == 1
+    assert daily_server.hits['/VIIRS/VNP03MODLL.001/2020.02.02/'] == 1
+
+
+def test_get_h5_batch_reports_missing_days(tmpdir, daily_server):
+    range_downloader = VIIRSBurntAreaDownloader()
+    range_downloader.base_url = daily_server.url + '/VIIRS/VNP03MODLL.001/'
+
+    results = range_downloader.get_h5_batch(days=[(2020, 2, 1), (2020, 2, 3)],
+                                            start_time=datetime.time(6), end_time=datetime.time(7),
+                                            path=tmpdir)
+
+    assert [open(result.path, 'rb').read() for result in results[:2]] == [b'1 0600', b'1 0642']
+    assert results[2].request == datetime.date(2020, 2, 3)
+    assert results[2].path is None
+    assert results[2].error.code == 404
+    with pytest.raises(HTTPError):
+        range_downloader.find_granules([(2020, 2, 1), (2020, 2, 3)])
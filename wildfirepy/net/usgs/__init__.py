@@ -1,3 +1,25 @@
-from wildfirepy.net.usgs.modis import *
-from wildfirepy.net.usgs.usgs_downloader import *
-from wildfirepy.net.usgs.viirs import *
+import importlib
+
+# Submodule defining each public name. Submodules are imported on first use, so that
+# importing a downloader does not load the others.
+_names = {'ModisBurntAreaDownloader': 'modis',
+          'AbstractUSGSDownloader': 'usgs_downloader', 'DownloadResult': 'usgs_downloader',
+          'VIIRSBurntAreaDownloader': 'viirs',
+          'AsyncModisBurntAreaDownloader': 'aio', 'AsyncVIIRSBurntAreaDownloader': 'aio',
+          'ManifestEntry': 'manifest', 'DownloadManifest': 'manifest', 'read_points': 'manifest'}
+
+__all__ = list(_names)
+
+
+def __getattr__(name):
+    if name in set(_names.values()):
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _names:
+        value = getattr(importlib.import_module(f'{__name__}.{_names[name]}'), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_names.values()) | set(_names))
@@ -0,0 +1,253 @@
+from wildfirepy.net.util.aio import AsyncURLOpenerWithRedirect, AsyncHtmlParser
+from wildfirepy.net.usgs.usgs_downloader import AbstractUSGSDownloader
+from wildfirepy.net.usgs.modis import Modis
+from wildfirepy.net.usgs.viirs import Viirs
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+from pathlib import Path
+import asyncio
+import os
+
+__all__ = ['AsyncModisBurntAreaDownloader', 'AsyncVIIRSBurntAreaDownloader']
+
+
+class AsyncUSGSDownloader:
+    """
+    Description
+    -----------
+    An Abstract Base Class `asyncio` Downloader for USGS products.
+    Unlike `AbstractUSGSDownloader.fetch`, errors are raised rather than logged,
+    so that they can be collected with `asyncio.gather(..., return_exceptions=True)`.
+
+    Parameters
+    ----------
+    product: `str`
+        Name of the product.
+    cache: `wildfirepy.net.util.ListingCache`
+        If given, directory listings are read through this on-disk cache.
+    url_opener: `wildfirepy.net.util.AsyncURLOpenerWithRedirect`
+        Opener shared by the listing fetches and the downloads.
+        A new one is created by default.
+    """
+    chunk_size = AbstractUSGSDownloader.chunk_size
+
+    def __init__(self, product='', cache=None, url_opener=None):
+        self.base_url = 'https://e4ftl01.cr.usgs.gov/'
+        self.url_opener = AsyncURLOpenerWithRedirect() if url_opener is None else url_opener
+        self.regex_traverser = AsyncHtmlParser(product, cache=cache, url_opener=self.url_opener)
+
+    async def fetch(self, url, path='./', filename='temp.h5', chunk_size=None):
+        """
+        Fetches data from `url`.
+        The data is streamed to a temporary `.part` file, which is renamed to
+        `filename` only once the download is complete. The file is opened and
+        written in the default executor of the event loop, so that writing to
+        disk does not block the other requests.
+        Parameters
+        ----------
+        url: `str`
+            URL to get the data from.
+        path: `str`
+            path to store the downladed file.
+        filename: `str`
+            name of the downladed file.
+        chunk_size: `int`
+            Number of bytes read from the network and written to disk at a time.
+        Returns
+        -------
+        path: `str`
+            Absolute path to the downloaded file.
+        """
+        filename = Path(path) / filename
+        partial = filename.with_name(filename.name + '.part')
+
+        loop = asyncio.get_running_loop()
+        response = await self.url_opener(url)
+        try:
+            file = await loop.run_in_executor(None, open, partial, 'wb')
+            try:
+                async for chunk in response.content.iter_chunked(chunk_size or self.chunk_size):
+                    await loop.run_in_executor(None, file.write, chunk)
+            finally:
+                await loop.run_in_executor(None, file.close)
+        except BaseException:
+            if partial.exists():
+                partial.unlink()
+            raise
+        finally:
+            response.release()
+
+        os.replace(partial, filename)
+        return filename.absolute().as_posix()
+
+    async def close(self):
+        """
+        Closes all the pooled connections.
+        """
+        await self.url_opener.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+class AsyncModis(AsyncUSGSDownloader):
+    """
+    Description
+    -----------
+    An Abstract Base Class `asyncio` Downloader for MODIS products.
+    See `wildfirepy.net.usgs.modis.Modis` for the synchronous counterpart.
+    """
+    def __init__(self, data='MOTA', product='', cache=None, url_opener=None):
+        super().__init__(product=product, cache=cache, url_opener=url_opener)
+        self.converter = SinusoidalCoordinate()
+        self.base_url += f"{data}/"
+
+    async def get_available_dates(self):
+        """
+        Returns dates for which data is available.
+        """
+        return (await self.regex_traverser.get_listing(self.base_url)).dates
+
+    async def get_listing(self, year, month):
+        """
+        Returns the `wildfirepy.net.util.Listing` of the given month.
+        """
+        url = self.base_url + Modis._get_date_dir(year, month) + '/'
+        return await self.regex_traverser.get_listing(url)
+
+    async def get_filename(self, year, month, latitude, longitude):
+        """
+        Returns name of the `hdf` file for given month, latitude and longitude.
+        """
+        listing = await self.get_listing(year, month)
+        h, v = self.converter(latitude, longitude)
+        entry = listing.get(tile=f'h{h:02d}v{v:02d}', extension='hdf',
+                            product=self.regex_traverser.product or None)
+        if entry is None:
+            raise ValueError("No file exists for given coordinates.")
+
+        return entry.name
+
+    async def _get(self, year, month, filename, **kwargs):
+        url = self.base_url + Modis._get_date_dir(year, month) + '/' + filename
+        return await self.fetch(url=url, filename=filename, **kwargs)
+
+    async def get_hdf(self, *, year, month, latitude, longitude, **kwargs):
+        """
+        Downloads the `hdf` file and stores it on the disk.
+        See `wildfirepy.net.usgs.modis.Modis.get_hdf`.
+        """
+        filename = await self.get_filename(year, month, latitude, longitude)
+        return await self._get(year, month, filename, **kwargs)
+
+    async def get_xml(self, *, year, month, latitude, longitude, **kwargs):
+        """
+        Downloads the `xml` file and stores it on the disk.
+        See `wildfirepy.net.usgs.modis.Modis.get_xml`.
+        """
+        filename = await self.get_filename(year, month, latitude, longitude) + ".xml"
+        return await self._get(year, month, filename, **kwargs)
+
+    async def get_jpg(self, *, year, month, latitude, longitude, **kwargs):
+        """
+        Downloads the `jpg` file and stores it on the disk.
+        See `wildfirepy.net.usgs.modis.Modis.get_jpg`.
+        """
+        filename = await self.get_filename(year, month, latitude, longitude)
+        filename = "BROWSE." + filename[:-3] + "1.jpg"
+        return await self._get(year, month, filename, **kwargs)
+
+
+class AsyncModisBurntAreaDownloader(AsyncModis):
+    """
+    Description
+    -----------
+    `asyncio` MODIS Class for `MCD64A1`, i.e., Burnt Area.
+    By default downloads data from the 6th collection.
+
+    Parameters
+    ----------
+    collection: `str`
+        MODIS collection to download data from.
+    cache: `wildfirepy.net.util.ListingCache`
+        If given, directory listings are read through this on-disk cache.
+    url_opener: `wildfirepy.net.util.AsyncURLOpenerWithRedirect`
+        Opener shared by the listing fetches and the downloads.
+
+    Examples
+    --------
+    >>> async with AsyncModisBurntAreaDownloader() as downloader:
+    ...     paths = await asyncio.gather(*[downloader.get_hdf(year=2020, month=2, **point)
+    ...                                    for point in points])
+    """
+    def __init__(self, collection='006', cache=None, url_opener=None):
+        super().__init__(product="MCD64A1", cache=cache, url_opener=url_opener)
+        self.base_url = self.base_url + f"MCD64A1.{collection}/"
+
+
+class AsyncViirs(AsyncUSGSDownloader):
+    """
+    Description
+    -----------
+    An Abstract Base Class `asyncio` Downloader for VIIRS products.
+    See `wildfirepy.net.usgs.viirs.Viirs` for the synchronous counterpart.
+    """
+    def __init__(self, product='', cache=None, url_opener=None):
+        super().__init__(product=product, cache=cache, url_opener=url_opener)
+        self.product = product
+        self.base_url += "VIIRS/" f'{self.product}.001/'
+
+    async def get_filename(self, *, year, month, date, hours, minutes):
+        """
+        Returns name of the `h5` file of the granule for given date and time.
+        """
+        date, julian_day = Viirs._get_date(year=year, month=month, date=date)
+        time = Viirs._get_nearest_time(hours=hours, minutes=minutes)
+
+        listing = await self.regex_traverser.get_listing(self.base_url + date + '/')
+        entry = listing.find_prefix(f"{self.product}.A{year}{'%03d' % julian_day}.{time}.001.",
+                                    extension='h5')
+        if entry is None:
+            raise ValueError("No file exists for given time.")
+
+        return date, entry.name
+
+    async def get_h5(self, *, year, month, date, hours, minutes, **kwargs):
+        """
+        Downloads the `h5` file and stores it on the disk.
+        See `wildfirepy.net.usgs.viirs.Viirs.get_h5`.
+        """
+        date, filename = await self.get_filename(year=year, month=month, date=date,
+                                                 hours=hours, minutes=minutes)
+        url = self.base_url + date + '/' + filename
+        return await self.fetch(url=url, filename=filename, **kwargs)
+
+    async def get_xml(self, *, year, month, date, hours, minutes, **kwargs):
+        """
+        Downloads the `xml` file and stores it on the disk.
+        See `wildfirepy.net.usgs.viirs.Viirs.get_xml`.
+        """
+        date, filename = await self.get_filename(year=year, month=month, date=date,
+                                                 hours=hours, minutes=minutes)
+        filename += '.xml'
+        url = self.base_url + date + '/' + filename
+        return await self.fetch(url=url, filename=filename, **kwargs)
+
+
+class AsyncVIIRSBurntAreaDownloader(AsyncViirs):
+    """
+    Description
+    -----------
+    `asyncio` VIIRS Class for `VNP03MODLL`, i.e., Burnt Area.
+
+    Parameters
+    ----------
+    cache: `wildfirepy.net.util.ListingCache`
+        If given, directory listings are read through this on-disk cache.
+    url_opener: `wildfirepy.net.util.AsyncURLOpenerWithRedirect`
+        Opener shared by the listing fetches and the downloads.
+    """
+    def __init__(self, cache=None, url_opener=None):
+        super().__init__(product="VNP03MODLL", cache=cache, url_opener=url_opener)
@@ -0,0 +1,135 @@
+from collections import namedtuple
+from pathlib import Path
+import csv
+import json
+
+__all__ = ['ManifestEntry', 'DownloadManifest', 'read_points']
+
+ManifestEntry = namedtuple('ManifestEntry', ['year', 'month', 'h', 'v', 'url', 'filename', 'size',
+                                             'points', 'path'])
+ManifestEntry.__doc__ = """
+A file planned for download, covering the observations of one tile and month.
+
+`size` is in bytes, as shown by the directory listing, and is `None` if the
+listing does not show it. `points` is the number of observations the file
+covers. `path` is the local path of the file if it is already in the store
+of the downloader, in which case it does not need to be downloaded.
+"""
+
+
+class DownloadManifest:
+    """
+    Description
+    -----------
+    The files that cover a set of observations, as planned by
+    `wildfirepy.net.usgs.modis.Modis.plan_downloads`, before anything is downloaded.
+
+    Parameters
+    ----------
+    entries: iterable of `ManifestEntry`
+        Files covering the observations, one per (year, month, h, v) tile.
+    missing: iterable
+        (year, month, h, v) tiles of observations for which no file exists,
+        e.g. tiles that only cover water, or months that are not published yet.
+    points: `int`
+        Number of observations that were planned.
+    skipped: `int`
+        Number of observations whose coordinates are not valid.
+
+    Examples
+    --------
+    >>> manifest = downloader.plan_downloads(read_points('fires.csv'))
+    >>> manifest.total_size / 1024 ** 3
+    >>> manifest.save('fires.json')
+    """
+    def __init__(self, entries=(), missing=(), points=0, skipped=0):
+        self.entries = sorted(ManifestEntry(*entry) for entry in entries)
+        self.missing = sorted(tuple(tile) for tile in missing)
+        self.points = points
+        self.skipped = skipped
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    @property
+    def pending(self):
+        """
+        Entries that are not in the store yet, and have to be downloaded.
+        """
+        return [entry for entry in self.entries if entry.path is None]
+
+    @property
+    def total_size(self):
+        """
+        Estimated number of bytes to download, i.e. the total size of the
+        pending entries whose size is known.
+        """
+        return sum(entry.size for entry in self.pending if entry.size is not None)
+
+    @property
+    def unknown_sizes(self):
+        """
+        Number of pending entries whose size is not shown by the listings.
+        """
+        return sum(entry.size is None for entry in self.pending)
+
+    def urls(self):
+        """
+        Returns the URLs of the pending entries.
+        """
+        return [entry.url for entry in self.pending]
+
+    def save(self, path):
+        """
+        Writes the manifest to a `json` file.
+        """
+        Path(path).write_text(json.dumps({'points': self.points, 'skipped': self.skipped,
+                                          'total_size': self.total_size,
+                                          'entries': [entry._asdict() for entry in self.entries],
+                                          'missing': self.missing}, indent=1))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a manifest written by `save`.
+        """
+        manifest = json.loads(Path(path).read_text())
+        return cls(entries=[ManifestEntry(**entry) for entry in manifest['entries']],
+                   missing=manifest['missing'], points=manifest['points'],
+                   skipped=manifest['skipped'])
+
+
+def read_points(path, latitude='latitude', longitude='longitude', time='acq_date'):
+    """
+    Streams the observations of a `csv` file, e.g. a FIRMS active fire file,
+    one row at a time.
+    Parameters
+    ----------
+    path: `str`
+        Path to the `csv` file, with a header row.
+    latitude: `str`
+        Name of the column of the latitudes.
+    longitude: `str`
+        Name of the column of the longitudes.
+    time: `str`
+        Name of the column of the dates, or timestamps, starting with an ISO
+        date, e.g. `2020-02-14` or `2020-02-14T06:42:00`.
+    Returns
+    -------
+    points: generator
+        (latitude, longitude, time) of every row. Rows whose coordinates are
+        not numbers are given with `nan` coordinates.
+    """
+    with open(path, newline='') as file:
+        for row in csv.DictReader(file):
+            yield _to_float(row[latitude]), _to_float(row[longitude]), row[time]
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
@@ -1,6 +1,17 @@
 from wildfirepy.net.util import MODISHtmlParser
 from wildfirepy.coordinates.util import SinusoidalCoordinate
-from wildfirepy.net.usgs.usgs_downloader import AbstractUSGSDownloader
+from wildfirepy.net.usgs.usgs_downloader import AbstractUSGSDownloader, DownloadResult
+from wildfirepy.net.usgs.manifest import DownloadManifest, ManifestEntry
+from pathlib import Path
+import tempfile
+import threading
+import os
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from collections import Counter, deque
+from itertools import islice
+from urllib.error import HTTPError
+import datetime
+import numpy as np
 
 __all__ = ['ModisBurntAreaDownloader']
 
@@ -10,23 +21,65 @@ class Modis(AbstractUSGSDownloader):
     Description
     -----------
     An Abstract Base Class Downloader for MODIS products.
+
+    Parameters
+    ----------
+    data: `str`
+        Name of the directory of the data server containing the product.
+    product: `str`
+        Name of the MODIS product.
+    cache: `wildfirepy.net.util.ListingCache`
+        If given, directory listings are read through this on-disk cache.
+    session: `wildfirepy.net.util.EarthdataSession`
+        Session shared by the listing fetches and the downloads.
+        A new `URLOpenerWithRedirect` is created by default.
+    store: `wildfirepy.net.util.TileStore`
+        If given, `hdf` files are kept in this local store, and are only
+        downloaded if they are not already in it.
+    scheduler: `wildfirepy.net.util.RequestScheduler`
+        Limits the number of concurrent downloads, and retries those that fail
+        because the server is overloaded. A new one is created by default.
     """
-    def __init__(self, data='MOTA', product=''):
-        super().__init__()
-        self.regex_traverser = MODISHtmlParser(product)
+    BATCH_EXTENSIONS = {'hdf': 'hdf', 'xml': 'hdf.xml', 'jpg': 'jpg'}
+
+    def __init__(self, data='MOTA', product='', cache=None, session=None, store=None,
+                 scheduler=None):
+        super().__init__(session=session, store=store, scheduler=scheduler)
+        self.regex_traverser = MODISHtmlParser(product, cache=cache, session=self.url_opener)
         self.converter = SinusoidalCoordinate()
         self.base_url += f"{data}/"
+        self.collection = ''
+        self._default_month = threading.local()
+
+    @property
+    def files_date(self):
+        """
+        (year, month) of the last call to `get_files_from_date` in the current
+        thread, or `None`. Kept for compatibility: it is read-only, and is
+        only the default month of the methods that are not given one.
+        """
+        return getattr(self._default_month, 'value', None)
 
     def get_available_dates(self):
         """
         Returns dates for which data is available.
         """
-        self.regex_traverser(self.base_url)
-        return self.regex_traverser.get_all_dates()
+        return list(self._fetch_listing(self.base_url).dates)
+
+    def get_listing(self, year, month):
+        """
+        Returns the `wildfirepy.net.util.Listing` of the given month.
+        Listings are memoized by the downloader, until they expire.
+        """
+        return self._get_listing(self._get_date_dir(year, month))
 
     def get_files_from_date(self, year, month):
         """
         Returns names of all available files.
+        The month becomes the default month of `get_available_hdf_files`,
+        `get_available_jpg_files`, `get_available_xml_files` and `get_filename`
+        in the calling thread only, so threads sharing the downloader do not
+        change each other's default month.
         Parameters
         ----------
         year: `int`
@@ -34,31 +87,51 @@ class Modis(AbstractUSGSDownloader):
         month: `int`
             Month for which filenames are to be retrieved.
         """
-        month = str(month) if month > 9 else "0" + str(month)
-        date = f"{str(year)}.{month}.01/"
-        self.regex_traverser(self.base_url + date)
-        self.has_files = True
-        return self.regex_traverser.get_all_files()
+        files = (self.get_available_hdf_files(year, month) +
+                 self.get_available_jpg_files(year, month) +
+                 self.get_available_xml_files(year, month))
+        self._default_month.value = (year, month)
+        return files
 
-    def get_available_jpg_files(self):
+    def _get_month(self, year, month):
         """
-        Returns names of available jpg files.
+        Returns the given month, or the month of the last call to `get_files_from_date`
+        in the current thread.
         """
-        return self.regex_traverser.get_all_jpg_files()
+        if year is None or month is None:
+            if self.files_date is None:
+                raise ValueError("The year and month must be given, "
+                                 "or set by `get_files_from_date`.")
+            return self.files_date
+        return year, month
+
+    def _get_names(self, year, month, extension):
+        listing = self.get_listing(*self._get_month(year, month))
+        product = self.regex_traverser.product or None
+        return [entry.name for entry in listing.files(product=product, extension=extension)]
 
-    def get_available_xml_files(self):
+    def get_available_jpg_files(self, year=None, month=None):
         """
-        Returns names of available xml files.
+        Returns names of available jpg files of the given month,
+        or of the month of the last call to `get_files_from_date` in the current thread.
         """
-        return self.regex_traverser.get_all_xml_files()
+        return self._get_names(year, month, 'jpg')
 
-    def get_available_hdf_files(self):
+    def get_available_xml_files(self, year=None, month=None):
         """
-        Returns names of available hdf files.
+        Returns names of available xml files of the given month,
+        or of the month of the last call to `get_files_from_date` in the current thread.
         """
-        return self.regex_traverser.get_all_hdf_files()
+        return self._get_names(year, month, 'hdf.xml')
 
-    def get_filename(self, latitude, longitude):
+    def get_available_hdf_files(self, year=None, month=None):
+        """
+        Returns names of available hdf files of the given month,
+        or of the month of the last call to `get_files_from_date` in the current thread.
+        """
+        return self._get_names(year, month, 'hdf')
+
+    def get_filename(self, latitude, longitude, year=None, month=None):
         """
         Returns name of file for given latitude and longitude.
         Parameters
@@ -67,11 +140,34 @@ class Modis(AbstractUSGSDownloader):
             latitude of the observation.
         longitude: `float`
             longitude of the observation.
+        year: `int`
+            Year of the observation.
+            Defaults to the year of the last call to `get_files_from_date`
+            in the current thread.
+        month: `int`
+            Month of the observation.
+            Defaults to the month of the last call to `get_files_from_date`
+            in the current thread.
+        """
+        year, month = self._get_month(year, month)
+        return self._get_entry(year, month, *self.converter(latitude, longitude)).name
+
+    def _get_entry(self, year, month, h, v, extension='hdf'):
+        entry = self.get_listing(year, month).get(tile=f'h{h:02d}v{v:02d}', extension=extension,
+                                                  product=self.regex_traverser.product or None)
+        if entry is None:
+            raise ValueError("No file exists for given coordinates.")
+        return entry
+
+    def _get_url(self, year, month, latitude, longitude, extension):
+        """
+        Returns the URL and name of the file of an observation.
         """
         h, v = self.converter(latitude, longitude)
-        return self.regex_traverser.get_filename(h, v)
+        filename = self._get_entry(year, month, h, v, extension=extension).name
+        return self.base_url + self._get_date_dir(year, month) + '/' + filename, filename
 
-    def get_hdf(self, *, year, month, latitude, longitude, **kwargs):
+    def get_hdf(self, *, year, month, latitude, longitude, resume=False, verify=False, **kwargs):
         """
         Downloads the `hdf` file and stores it on the disk.
         Parameters
@@ -84,20 +180,32 @@ class Modis(AbstractUSGSDownloader):
             latitude of the observation.
         longitude: `float`
             longitude of the observation.
-        kwargs: keyword arguments to be passed to `AbstractUSGSDownloader.fetch`
+        resume: `bool`
+            If `True`, resumes an interrupted download of the file with an HTTP Range request.
+        verify: `bool`
+            If `True`, the checksum and size of the file, computed while it is
+            downloaded, are checked against its `xml` sidecar, and the download
+            is retried if they do not match. A `ValueError` is raised if the
+            sidecar holds no `cksum` checksum.
+        kwargs: keyword arguments to be passed to `AbstractUSGSDownloader.fetch`.
+            If the downloader has a store, the file is saved in the store and `path` is ignored.
         Returns
         -------
         path: `str`
             Absolute path to the downloaded `hdf` file.
         """
-        if not self.has_files:
-            self.get_files_from_date(year, month)
+        if self.store is not None:
+            key = self._get_store_key(year, month, *self.converter(latitude, longitude))
+            path = self.store.get(key)
+            if path is not None:
+                return path
 
-        filename = self.get_filename(latitude, longitude)
-        month = str(month) if month > 9 else "0" + str(month)
-        date = f"{str(year)}.{month}.01/"
-        url = self.base_url + date + filename
-        return self.fetch(url=url, filename=filename, **kwargs)
+        url, filename = self._get_url(year, month, latitude, longitude, 'hdf')
+        if verify:
+            kwargs['checksum'] = self._get_required_checksum(url + '.xml')
+        if self.store is not None:
+            return self._fetch_stored(key, url=url, filename=filename, resume=resume, **kwargs)
+        return self.fetch(url=url, filename=filename, resume=resume, **kwargs)
 
     def get_xml(self, *, year, month, latitude, longitude, **kwargs):
         """
@@ -118,14 +226,7 @@ class Modis(AbstractUSGSDownloader):
         path: `str`
             Absolute path to the downloaded `xml` file.
         """
-        if not self.has_files:
-            self.get_files_from_date(year, month)
-
-        filename = self.get_filename(latitude, longitude) + ".xml"
-
-        month = str(month) if month > 9 else "0" + str(month)
-        date = f"{str(year)}.{month}.01/"
-        url = self.base_url + date + filename
+        url, filename = self._get_url(year, month, latitude, longitude, 'hdf.xml')
         return self.fetch(url=url, filename=filename, **kwargs)
 
     def get_jpg(self, *, year, month, latitude, longitude, **kwargs):
@@ -147,15 +248,351 @@ class Modis(AbstractUSGSDownloader):
         path: `str`
             Absolute path to the downloaded `jpg` file.
         """
-        if not self.has_files:
-            self.get_files_from_date(year, month)
+        url, filename = self._get_url(year, month, latitude, longitude, 'jpg')
+        return self.fetch(url=url, filename=filename, **kwargs)
+
+    def get_batch(self, requests, *, kind='hdf', max_workers=8, stop=None, **kwargs):
+        """
+        Downloads files for many observations in parallel.
+        Observations are mapped to unique (date, tile) pairs, the listing of
+        every date is fetched only once, and every file is downloaded only
+        once, by a pool of at most `max_workers` threads.
+        Parameters
+        ----------
+        requests: iterable
+            Observations, either as `dict`s with `year`, `month`, `latitude`
+            and `longitude` keys, or as (year, month, latitude, longitude) tuples.
+        kind: `str`
+            Type of the files to download: `hdf`, `xml` or `jpg`.
+        max_workers: `int`
+            Maximum number of concurrent listing fetches and downloads.
+        stop: `threading.Event`
+            If given, the downloads that have not started when it is set are
+            skipped, and reported as `concurrent.futures.CancelledError`.
+        kwargs: keyword arguments to be passed to `AbstractUSGSDownloader.fetch`.
+            If the downloader has a store, `hdf` files are looked up and saved in the store.
+        Returns
+        -------
+        results: `list` of `wildfirepy.net.usgs.DownloadResult`
+            One result per request, in the order of `requests`. Errors are
+            reported in the results instead of being raised.
+        """
+        if kind not in self.BATCH_EXTENSIONS:
+            raise ValueError(f"kind must be one of {', '.join(self.BATCH_EXTENSIONS)}.")
 
-        filename = "BROWSE." + self.get_filename(latitude, longitude)[:-3] + "1.jpg"
+        requests = list(requests)
+        if not requests:
+            return []
 
-        month = str(month) if month > 9 else "0" + str(month)
-        date = f"{str(year)}.{month}.01/"
-        url = self.base_url + date + filename
-        return self.fetch(url=url, filename=filename, **kwargs)
+        fields = [(r['year'], r['month'], r['latitude'], r['longitude'])
+                  if isinstance(r, dict) else r for r in requests]
+        years, months, latitudes, longitudes = zip(*fields)
+        h, v, _, _ = self.converter.get_modis_grid_coords(latitudes, longitudes)
+        tiles = list(zip(years, months, h.tolist(), v.tolist()))
+        downloads = self._get_tiles(set(tiles), kind=kind, max_workers=max_workers, stop=stop,
+                                    **kwargs)
+
+        results = []
+        for request, tile in zip(requests, tiles):
+            if isinstance(downloads[tile], Exception):
+                results.append(DownloadResult(request, None, downloads[tile]))
+            else:
+                results.append(DownloadResult(request, downloads[tile], None))
+        return results
+
+    def _get_tiles(self, tiles, kind='hdf', max_workers=8, stop=None, **kwargs):
+        """
+        Downloads the files of (year, month, h, v) tiles in parallel.
+        Returns a `dict` of the path of every tile, or of the exception raised for it.
+        Downloads that have not started when `stop` is set are skipped.
+        """
+        downloads = {}
+        store_keys = {}
+        if self.store is not None and kind == 'hdf':
+            for tile in tiles:
+                store_keys[tile] = self._get_store_key(*tile)
+                path = self.store.get(store_keys[tile])
+                if path is not None:
+                    downloads[tile] = path
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            dates = {self._get_date_dir(*tile[:2]) for tile in tiles if tile not in downloads}
+            listings = {date: pool.submit(self._get_listing, date) for date in dates}
+            for tile in set(tiles) - set(downloads):
+                year, month, h, v = tile
+                date = self._get_date_dir(year, month)
+                try:
+                    listing = listings[date].result()
+                    entry = listing.get(tile=f'h{h:02d}v{v:02d}',
+                                        extension=self.BATCH_EXTENSIONS[kind],
+                                        product=self.regex_traverser.product or None)
+                    if entry is None:
+                        raise ValueError("No file exists for given coordinates.")
+                except Exception as err:
+                    downloads[tile] = err
+                    continue
+                url = self.base_url + date + '/' + entry.name
+                if tile in store_keys:
+                    downloads[tile] = pool.submit(_unless_stopped, stop, self._fetch_stored,
+                                                  store_keys[tile], url=url, filename=entry.name,
+                                                  raise_errors=True, **kwargs)
+                else:
+                    downloads[tile] = pool.submit(_unless_stopped, stop, self._fetch, url=url,
+                                                  filename=entry.name, **kwargs)
+
+            for tile, download in downloads.items():
+                if not isinstance(download, (str, Exception)):
+                    downloads[tile] = download.exception() or download.result()
+
+        return downloads
+
+    def plan_downloads(self, points, *, kind='hdf', chunk_size=100000, max_workers=8):
+        """
+        Plans the download of the smallest set of files that covers a stream
+        of observations, without downloading them.
+        Observations are read `chunk_size` at a time, mapped to their
+        (year, month, h, v) tiles in a single projection per chunk, and
+        deduplicated, so only the tiles and their counts are kept in memory.
+        The listing of every month is then fetched once, through the listing
+        cache if the downloader has one, to find the file and size of every tile.
+        Parameters
+        ----------
+        points: iterable
+            (latitude, longitude, time) observations, e.g. from
+            `wildfirepy.net.usgs.read_points`. `time` is a `datetime.date`, or
+            a `str` starting with an ISO date, e.g. `2020-02-14`.
+        kind: `str`
+            Type of the files to plan: `hdf`, `xml` or `jpg`.
+        chunk_size: `int`
+            Number of observations mapped to tiles at a time.
+        max_workers: `int`
+            Maximum number of concurrent listing fetches.
+        Returns
+        -------
+        manifest: `wildfirepy.net.usgs.DownloadManifest`
+            URL and size of every file, and the estimated total transfer.
+            `hdf` files already in the store of the downloader are planned
+            with their local path, and are not counted in the transfer.
+            Tiles of months whose listing is not found are planned as missing.
+        Raises
+        ------
+        `urllib.error.HTTPError`
+            If the listing of a month fails with another error than `404`.
+        """
+        if kind not in self.BATCH_EXTENSIONS:
+            raise ValueError(f"kind must be one of {', '.join(self.BATCH_EXTENSIONS)}.")
+
+        counts = Counter()
+        total = skipped = 0
+        points = iter(points)
+        for chunk in iter(lambda: list(islice(points, chunk_size)), []):
+            latitudes, longitudes, times = zip(*chunk)
+            latitudes = np.asarray(latitudes, dtype=np.float64)
+            longitudes = np.asarray(longitudes, dtype=np.float64)
+            valid = (np.abs(latitudes) <= 90) & (np.abs(longitudes) <= 180)
+            h, v, _, _ = self.converter.get_modis_grid_coords(latitudes[valid], longitudes[valid])
+            months = [_get_year_month(time) for time, ok in zip(times, valid) if ok]
+            counts.update((year, month, tile_h, tile_v)
+                          for (year, month), tile_h, tile_v in zip(months, h.tolist(), v.tolist()))
+            total += len(chunk)
+            skipped += int((~valid).sum())
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            dates = {self._get_date_dir(year, month) for year, month, _, _ in counts}
+            listings = {date: pool.submit(self._get_listing, date) for date in dates}
+
+        entries, missing = [], []
+        for tile, count in counts.items():
+            year, month, h, v = tile
+            date = self._get_date_dir(year, month)
+            try:
+                listing = listings[date].result()
+            except HTTPError as err:
+                # Months whose listing is not found, e.g. that are not published yet,
+                # have no files. Other errors would plan existing files as missing.
+                if err.code != 404:
+                    raise
+                listing = None
+            entry = None
+            if listing is not None:
+                entry = listing.get(tile=f'h{h:02d}v{v:02d}', extension=self.BATCH_EXTENSIONS[kind],
+                                    product=self.regex_traverser.product or None)
+            if entry is None:
+                missing.append(tile)
+                continue
+            path = None
+            if self.store is not None and kind == 'hdf':
+                path = self.store.get(self._get_store_key(*tile))
+            entries.append(ManifestEntry(year, month, h, v, self.base_url + date + '/' + entry.name,
+                                         entry.name, entry.size, count, path))
+
+        return DownloadManifest(entries, missing, points=total, skipped=skipped)
+
+    def iter_hdf(self, *, start, end, locations, lookahead=2, max_workers=8, **kwargs):
+        """
+        Downloads the `hdf` files of a set of locations for every month of a range,
+        prefetching the months ahead in the background.
+        While the caller processes the files of one month, the listings and
+        files of the next `lookahead` months are being downloaded.
+        Parameters
+        ----------
+        start: `tuple`
+            (year, month) of the first month.
+        end: `tuple`
+            (year, month) of the last month, included.
+        locations: iterable
+            (latitude, longitude) pairs of the observations.
+        lookahead: `int`
+            Number of months downloaded ahead of the month being processed.
+        max_workers: `int`
+            Maximum number of concurrent downloads for each month.
+        kwargs: keyword arguments to be passed to `Modis.get_batch`
+        Yields
+        ------
+        year, month, results:
+            The month, and a `wildfirepy.net.usgs.DownloadResult` for every location,
+            in the order of `locations`.
+        Notes
+        -----
+        Closing the generator early, e.g. by breaking out of the loop, stops
+        the months being prefetched: the files that are being downloaded are
+        finished before `close` returns, and the others are skipped.
+        Examples
+        --------
+        >>> for year, month, results in downloader.iter_hdf(start=(2019, 1), end=(2020, 12),
+        ...                                                 locations=[(28.7041, 77.1025)]):
+        ...     process([result.path for result in results])
+        """
+        locations = list(locations)
+        pending = deque()
+        stop = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=lookahead + 1) as pool:
+            try:
+                for year, month in _month_range(start, end):
+                    requests = [(year, month, latitude, longitude)
+                                for latitude, longitude in locations]
+                    pending.append((year, month, pool.submit(self.get_batch, requests,
+                                                             max_workers=max_workers, stop=stop,
+                                                             **kwargs)))
+                    if len(pending) > lookahead:
+                        year, month, results = pending.popleft()
+                        yield year, month, results.result()
+
+                while pending:
+                    year, month, results = pending.popleft()
+                    yield year, month, results.result()
+            finally:
+                stop.set()
+                for _, _, results in pending:
+                    results.cancel()
+
+    def get_mosaic(self, *, year, month, lat_min, lat_max, lon_min, lon_max, dataset, output,
+                   fill_value=0, dtype=None, max_workers=4, **kwargs):
+        """
+        Builds a raster of a dataset over a region that spans several tiles.
+        The `hdf` files of the tiles are downloaded in parallel, then decoded
+        by a pool of processes and written one by one into a preallocated
+        memory-mapped `.npy` file, so the memory used does not depend on the
+        size of the region.
+        Parameters
+        ----------
+        year: `int`
+            Year of the observation.
+        month: `int`
+            Month of the observation.
+        lat_min, lat_max: `float`
+            Latitude bounds of the region, in degrees.
+        lon_min, lon_max: `float`
+            Longitude bounds of the region, in degrees.
+        dataset: `str`
+            Name of the dataset, e.g. `Burn Date`.
+        output: `str`
+            Path to the `.npy` file to write.
+        fill_value:
+            Value of the cells for which the product has no file.
+        dtype: `numpy.dtype`
+            Type of the raster. Defaults to the type of the dataset.
+        max_workers: `int`
+            Maximum number of concurrent downloads, and of processes decoding tiles.
+        kwargs: keyword arguments to be passed to `AbstractUSGSDownloader.fetch`.
+        Returns
+        -------
+        mosaic: `numpy.memmap`
+            Raster on the Sinusoidal grid, backed by `output`.
+        row, col: `int`
+            Position of the top-left cell of the raster in the whole grid.
+            Coordinates of the cell `i`, `j` of the raster are given by
+            `converter.get_geographic_coords(0, 0, row + i, col + j)`.
+        Examples
+        --------
+        >>> mosaic, row, col = downloader.get_mosaic(year=2020, month=8, lat_min=32, lat_max=49,
+        ...                                          lon_min=-125, lon_max=-104,
+        ...                                          dataset='Burn Date', output='western_us.npy',
+        ...                                          fill_value=-2)
+        """
+        bounds = self.converter.get_pixel_bounds(lat_min, lat_max, lon_min, lon_max)
+        mosaic = self._build_mosaic(year, month, bounds, dataset, output, fill_value=fill_value,
+                                    dtype=dtype, max_workers=max_workers, **kwargs)
+        return mosaic, bounds[0], bounds[2]
+
+    def _build_mosaic(self, year, month, bounds, dataset, output, fill_value=0, dtype=None,
+                      max_workers=4, **kwargs):
+        from wildfirepy.coordinates.tiles import get_tile_index
+        from wildfirepy.io.mosaic import build_mosaic
+
+        row_start, row_stop, col_start, col_stop = bounds
+        cells = self.converter.CELLS
+        index = get_tile_index()
+        tiles = [(year, month, h, v)
+                 for v in range(row_start // cells, (row_stop - 1) // cells + 1)
+                 for h in range(col_start // cells, (col_stop - 1) // cells + 1)
+                 if index.is_valid(h, v)]
+
+        downloads = self._get_tiles(tiles, max_workers=max_workers, **kwargs)
+        paths = {}
+        for (_, _, h, v), download in downloads.items():
+            if isinstance(download, ValueError):
+                continue
+            if isinstance(download, Exception):
+                raise download
+            paths[h, v] = download
+
+        if not paths and dtype is None:
+            raise ValueError("No file exists for the region.")
+        return build_mosaic(paths, bounds, dataset, output, fill_value=fill_value, dtype=dtype,
+                            cells=cells, max_workers=max_workers)
+
+    @staticmethod
+    def _get_date_dir(year, month):
+        return f"{year}.{month:02d}.01"
+
+    def _get_store_key(self, year, month, h, v, extension='hdf'):
+        julian_day = datetime.date(year, month, 1).timetuple().tm_yday
+        return (self.regex_traverser.product, self.collection, f'A{year}{julian_day:03d}',
+                f'h{h:02d}v{v:02d}', extension)
+
+
+def _get_year_month(time):
+    """
+    Returns the year and month of a `datetime.date`, or of a `str` starting with an ISO date.
+    """
+    if isinstance(time, str):
+        return int(time[:4]), int(time[5:7])
+    return time.year, time.month
+
+
+def _month_range(start, end):
+    year, month = start
+    while (year, month) <= tuple(end):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _unless_stopped(stop, function, *args, **kwargs):
+    if stop is not None and stop.is_set():
+        raise CancelledError("The download was stopped before it started.")
+    return function(*args, **kwargs)
 
 
 class ModisBurntAreaDownloader(Modis):
@@ -164,7 +601,180 @@ class ModisBurntAreaDownloader(Modis):
     -----------
     MODIS Class for `MCD64A1`, i.e., Burnt Area.
     By default downloads data from the 6th collection.
+
+    Parameters
+    ----------
+    collection: `str`
+        MODIS collection to download data from.
+    cache: `wildfirepy.net.util.ListingCache`
+        If given, directory listings are read through this on-disk cache.
+    session: `wildfirepy.net.util.EarthdataSession`
+        Session shared by the listing fetches and the downloads.
+    store: `wildfirepy.net.util.TileStore`
+        If given, `hdf` files are kept in this local store, and are only
+        downloaded if they are not already in it.
+    array_cache: `wildfirepy.io.hdf.ArrayCache`
+        In-memory cache of the decoded tiles read by `query_burn_date`.
+        A new one, with the default memory budget, is created by default.
+    scheduler: `wildfirepy.net.util.RequestScheduler`
+        Limits the number of concurrent downloads, and retries those that fail
+        because the server is overloaded. A new one is created by default.
     """
-    def __init__(self, collection='006'):
-        super().__init__(product="MCD64A1")
+    BURN_DATE = 'Burn Date'
+    QA = 'QA'
+    # Burn date of the points on tiles that have no file, which only cover water.
+    WATER = -2
+
+    def __init__(self, collection='006', cache=None, session=None, store=None, array_cache=None,
+                 scheduler=None):
+        super().__init__(product="MCD64A1", cache=cache, session=session, store=store,
+                         scheduler=scheduler)
         self.base_url = self.base_url + f"MCD64A1.{collection}/"
+        self.collection = collection
+        if array_cache is None:
+            from wildfirepy.io.hdf import ArrayCache
+            array_cache = ArrayCache()
+        self.array_cache = array_cache
+
+    def query_burn_date(self, latitude, longitude, year, month, *, max_workers=8, **kwargs):
+        """
+        Returns the burn date and quality of many observations.
+        Points are grouped by month and tile, the `hdf` file of every group is
+        downloaded once, its decoded datasets are kept in `array_cache`, and
+        the values of all the points of a group are read with a single gather.
+        Parameters
+        ----------
+        latitude: array-like
+            latitudes of the observations.
+        longitude: array-like
+            longitudes of the observations.
+        year: array-like
+            Years of the observations. A single value applies to all of them.
+        month: array-like
+            Months of the observations. A single value applies to all of them.
+        max_workers: `int`
+            Maximum number of concurrent downloads.
+        kwargs: keyword arguments to be passed to `Modis.get_batch`.
+        Returns
+        -------
+        burn_date, qa: `numpy.ndarray`
+            `Burn Date` and `QA` values of the 500m cell of every observation.
+            Points on tiles for which the product has no file get a burn date
+            of `WATER`, i.e. -2, and a QA of 0.
+
+        Examples
+        --------
+        >>> downloader = ModisBurntAreaDownloader(store=TileStore())
+        >>> burn_date, qa = downloader.query_burn_date([28.7041, -17.71],
+        ...                                            [77.1025, 178.07], year=2020, month=2)
+        """
+        from wildfirepy.io.hdf import read_hdf
+
+        latitude, longitude, year, month = np.broadcast_arrays(
+            np.asarray(latitude, dtype=np.float64), np.asarray(longitude, dtype=np.float64),
+            np.asarray(year, dtype=np.int64), np.asarray(month, dtype=np.int64))
+        h, v, row, col = self.converter.get_modis_grid_coords(latitude, longitude)
+        burn_date = np.full(latitude.shape, self.WATER, dtype=np.int16)
+        qa = np.zeros(latitude.shape, dtype=np.uint8)
+        if not latitude.size:
+            return burn_date, qa
+
+        keys = np.stack([year.ravel(), month.ravel(), h.ravel(), v.ravel()], axis=1)
+        groups, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        requests = [(int(y), int(m), float(latitude.flat[i]), float(longitude.flat[i]))
+                    for (y, m, _, _), i in zip(groups, first)]
+        results = self.get_batch(requests, max_workers=max_workers, **kwargs)
+
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(groups) + 1))
+        rows, cols = row.ravel(), col.ravel()
+        burn_date_flat, qa_flat = burn_date.reshape(-1), qa.reshape(-1)
+        for group, result in enumerate(results):
+            if result.error is not None:
+                if isinstance(result.error, ValueError):
+                    continue
+                raise result.error
+
+            datasets = [self.BURN_DATE, self.QA]
+            arrays = self.array_cache.get_or_load(result.path,
+                                                  lambda: read_hdf(result.path, datasets))
+            points = order[bounds[group]:bounds[group + 1]]
+            burn_date_flat[points] = arrays[self.BURN_DATE][rows[points], cols[points]]
+            qa_flat[points] = arrays[self.QA][rows[points], cols[points]]
+
+        return burn_date, qa
+
+    def get_cube(self, cube_path, *, start, end, lat_min=None, lat_max=None, lon_min=None,
+                 lon_max=None, chunks=(12, 512, 512), max_workers=4, **kwargs):
+        """
+        Builds, or extends, a (month, row, col) cube of the burn dates of a region.
+        The cube at `cube_path` is created if it does not exist; otherwise only the
+        months after its last month are added, each month appending its own
+        slice of the cube. As the months of a cube have no gaps, `start` must
+        not come after the month that follows the last month of an existing cube.
+        Every month is first written as a memory-mapped mosaic, so the memory
+        used does not depend on the size of the region.
+        Parameters
+        ----------
+        cube_path: `str`
+            Directory of the cube.
+        start: `tuple`
+            (year, month) of the first month.
+        end: `tuple`
+            (year, month) of the last month, included.
+        lat_min, lat_max: `float`
+            Latitude bounds of the region, in degrees. Only needed to create the cube.
+        lon_min, lon_max: `float`
+            Longitude bounds of the region, in degrees. Only needed to create the cube.
+        chunks: `tuple`
+            Number of months, rows and columns of each chunk of a new cube.
+        max_workers: `int`
+            Maximum number of concurrent downloads, and of processes decoding tiles.
+        kwargs: keyword arguments to be passed to `AbstractUSGSDownloader.fetch`.
+        Returns
+        -------
+        cube: `wildfirepy.io.cube.TimeSeriesCube`
+            The cube. Its `origin` is the position of its top-left cell in the whole grid.
+        Examples
+        --------
+        >>> cube = downloader.get_cube('western_us', start=(2019, 1), end=(2020, 12),
+        ...                            lat_min=32, lat_max=49, lon_min=-125, lon_max=-104)
+        >>> cube.time_series(1000, 2000)
+        """
+        from wildfirepy.io.cube import TimeSeriesCube
+
+        if (Path(cube_path) / TimeSeriesCube.MANIFEST).exists():
+            cube = TimeSeriesCube(cube_path)
+        else:
+            if None in (lat_min, lat_max, lon_min, lon_max):
+                raise ValueError("The bounds of the region are needed to create a cube.")
+            row_start, row_stop, col_start, col_stop = self.converter.get_pixel_bounds(
+                lat_min, lat_max, lon_min, lon_max)
+            cube = TimeSeriesCube.create(cube_path,
+                                         shape=(row_stop - row_start, col_stop - col_start),
+                                         dtype='int16', chunks=chunks, fill_value=self.WATER,
+                                         origin=(row_start, col_start))
+
+        months = [month for month in _month_range(start, end)
+                  if not cube.months or month > cube.months[-1]]
+        if cube.months and months:
+            last_year, last_month = cube.months[-1]
+            if months[0] != (last_year + last_month // 12, last_month % 12 + 1):
+                raise ValueError(f"The cube ends with {last_year}-{last_month:02d}, so it can only "
+                                 "be extended from the month after.")
+
+        bounds = (cube.origin[0], cube.origin[0] + cube.rows,
+                  cube.origin[1], cube.origin[1] + cube.cols)
+        for year, month in months:
+            fd, output = tempfile.mkstemp(dir=cube_path, prefix='.tmp', suffix='.npy')
+            os.close(fd)
+            try:
+                mosaic = self._build_mosaic(year, month, bounds, self.BURN_DATE, output,
+                                            fill_value=self.WATER, dtype=cube.dtype,
+                                            max_workers=max_workers, **kwargs)
+                cube.append(year, month, mosaic)
+                del mosaic
+            finally:
+                os.remove(output)
+        return cube
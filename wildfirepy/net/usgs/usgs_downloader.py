@@ -1,9 +1,27 @@
-from wildfirepy.net.util import URLOpenerWithRedirect
+from wildfirepy.net.util import (URLOpenerWithRedirect, PosixChecksum, RequestScheduler,
+                                 parse_sidecar)
+from wildfirepy.net.util.instrument import emit
 from wildfirepy.coordinates.util import SinusoidalCoordinate
 from pathlib import Path
 from urllib.error import HTTPError
+from http.client import IncompleteRead
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+import logging
+import os
+import threading
+import time
 
-__all__ = ['AbstractUSGSDownloader']
+__all__ = ['AbstractUSGSDownloader', 'DownloadResult']
+
+logger = logging.getLogger(__name__)
+
+DownloadResult = namedtuple('DownloadResult', ['request', 'path', 'error'])
+DownloadResult.__doc__ = """
+Outcome of one request of a batch download.
+`path` is the absolute path to the downloaded file, or `None` if the request
+failed, in which case `error` holds the exception that was raised.
+"""
 
 
 class AbstractUSGSDownloader:
@@ -11,11 +29,35 @@ class AbstractUSGSDownloader:
     Description
     -----------
     An Abstract Base Class Downloader for USGS products.
+
+    Files are streamed to disk in chunks of `chunk_size` bytes, so the memory
+    used by a download does not depend on the size of the file. Directory
+    listings are memoized, see `listing_memo_size` and `listing_ttl`.
+
+    Parameters
+    ----------
+    session: `wildfirepy.net.util.EarthdataSession`
+        Session, or opener, used for all requests.
+        A new `URLOpenerWithRedirect` is created by default.
+    store: `wildfirepy.net.util.TileStore`
+        Local store consulted before downloading data files.
+    scheduler: `wildfirepy.net.util.RequestScheduler`
+        Limits the number of concurrent downloads, and retries those that fail
+        because the server is overloaded. A new one is created by default;
+        downloaders that share a server can share a scheduler.
     """
-    def __init__(self):
+    chunk_size = 1024 * 1024
+    listing_memo_size = 256
+    listing_ttl = 3600
+
+    def __init__(self, session=None, store=None, scheduler=None):
         self.base_url = 'https://e4ftl01.cr.usgs.gov/'
-        self.url_opener = URLOpenerWithRedirect()
-        self.has_files = False
+        self.url_opener = URLOpenerWithRedirect() if session is None else session
+        self.scheduler = RequestScheduler() if scheduler is None else scheduler
+        self.store = store
+        self._listings = OrderedDict()
+        self._pending_listings = {}
+        self._lock = threading.Lock()
 
     def _get_available_dates(self):
         """
@@ -71,9 +113,74 @@ class AbstractUSGSDownloader:
         """
         raise NotImplementedError
 
-    def fetch(self, url, path='./', filename='temp.h5'):
+    def _get_listing(self, directory):
+        """
+        Returns the `wildfirepy.net.util.Listing` of a date directory of the
+        product, e.g. `2020.02.01`.
+        Listings are memoized per date, so a listing is fetched only once
+        even when the downloader is shared by threads: threads asking for a
+        date that is being fetched wait for that fetch, while other dates
+        are fetched concurrently. Fetches go through the `scheduler`, which
+        retries them if the server is overloaded. Fetches that fail are not
+        memoized.
+
+        Only the `listing_memo_size` most recently used listings are kept.
+        A listing expires after the time-to-live of its page in the
+        `ListingCache` of the parser, which then revalidates it, or after
+        `listing_ttl` seconds if the parser has no cache.
+        """
+        url = self.base_url + directory + '/'
+        with self._lock:
+            memo = self._listings.get(directory)
+            if memo is not None and (memo[1] is None or time.monotonic() < memo[1]):
+                self._listings.move_to_end(directory)
+                return memo[0]
+            pending = self._pending_listings.get(directory)
+            if pending is None:
+                fetching = self._pending_listings[directory] = Future()
+        if pending is not None:
+            return pending.result()
+
+        try:
+            listing = self._fetch_listing(url)
+        except BaseException as err:
+            with self._lock:
+                del self._pending_listings[directory]
+            fetching.set_exception(err)
+            raise
+
+        ttl = self._get_listing_ttl(url)
+        with self._lock:
+            self._listings[directory] = (listing, None if ttl is None else time.monotonic() + ttl)
+            self._listings.move_to_end(directory)
+            while len(self._listings) > self.listing_memo_size:
+                self._listings.popitem(last=False)
+            del self._pending_listings[directory]
+        fetching.set_result(listing)
+        return listing
+
+    def _get_listing_ttl(self, url):
+        """
+        Returns how long, in seconds, the listing of `url` is memoized,
+        or `None` if it never expires.
+        """
+        cache = self.regex_traverser.cache
+        return self.listing_ttl if cache is None else cache.get_ttl(url)
+
+    def _fetch_listing(self, url):
+        """
+        Fetches the `wildfirepy.net.util.Listing` of `url` through the scheduler.
+        """
+        return self.scheduler.run(url, self.regex_traverser.get_listing, url)
+
+    def fetch(self, url, path='./', filename='temp.h5', chunk_size=None, resume=False,
+              checksum=None, retries=2):
         """
         Fetches data from `url`.
+        The data is written to a temporary `.part` file, which is renamed to
+        `filename` only once the download is complete. Downloads that fail
+        because the server is overloaded, or whose connection drops, are
+        retried by the `scheduler` of the downloader.
         Parameters
         ----------
         url: `str`
@@ -82,22 +189,200 @@ class AbstractUSGSDownloader:
             path to store the downladed file.
         filename: `str`
             name of the downladed file.
+        chunk_size: `int`
+            Number of bytes read from the network and written to disk at a time.
+            Defaults to `AbstractUSGSDownloader.chunk_size`.
+        resume: `bool`
+            If `True`, an existing `.part` file left by an interrupted download
+            is completed with an HTTP Range request instead of being downloaded
+            again, and the `.part` file is kept if this download is interrupted too.
+            Falls back to a full download if the server ignores the Range request.
+        checksum: `tuple`
+            Expected POSIX `cksum` CRC and size of the file, e.g. from
+            `get_sidecar_checksum`. They are computed while the data is
+            streamed, and the download is started over if they do not match.
+        retries: `int`
+            Number of times a download with a wrong checksum is started over,
+            before a `ValueError` is raised.
         Returns
         -------
         path: `str`
-            Absolute path to the downloaded file.
+            Absolute path to the downloaded file, or `None` if the server
+            answered with an error, and still did after the retries of the
+            scheduler, which is logged and emitted as an `error` event.
+        """
+        try:
+            return self._fetch(url, path=path, filename=filename, chunk_size=chunk_size,
+                               resume=resume, checksum=checksum, retries=retries)
+
+        except HTTPError as err:
+            emit('error', url, error=err)
+            logger.error("Could not download %s: %s", url, err)
+
+    def _fetch(self, url, path='./', filename='temp.h5', chunk_size=None, resume=False,
+               checksum=None, retries=2):
+        """
+        Same as `fetch`, but raises errors instead of logging them.
         """
         data_folder = Path(path)
         filename = data_folder / filename
-        try:
-            response = self.url_opener(url)
-            print("Download Successful!")
-            print("Writing file!")
-            with open(filename, 'wb') as file:
-                file.write(response.read())
-            response.close()
+        if checksum is None:
+            self._download_scheduled(url, filename, chunk_size=chunk_size, resume=resume)
             return filename.absolute().as_posix()
 
+        for attempt in range(retries + 1):
+            digest = self._download_scheduled(url, filename, chunk_size=chunk_size,
+                                              resume=resume and attempt == 0, verify=True)
+            if (digest.checksum, digest.size) == tuple(checksum):
+                return filename.absolute().as_posix()
+            filename.unlink()
+            if attempt < retries:
+                emit('retry', url, reason='checksum', attempt=attempt + 1)
+
+        raise ValueError(f"Checksum of {url} does not match after {retries + 1} attempts.")
+
+    def get_sidecar_checksum(self, url):
+        """
+        Returns the POSIX `cksum` CRC and the size of a file from its `xml` sidecar.
+        Parameters
+        ----------
+        url: `str`
+            URL of the `xml` file.
+        Returns
+        -------
+        checksum: `tuple`
+            (checksum, size), or `None` if the sidecar does not hold a `cksum` checksum.
+        """
+        def read():
+            response = self.url_opener(url)
+            try:
+                return response.read()
+            finally:
+                response.close()
+
+        return parse_sidecar(self.scheduler.run(url, read))
+
+    def _get_required_checksum(self, url):
+        """
+        Same as `get_sidecar_checksum`, but raises a `ValueError` if the sidecar
+        holds no `cksum` checksum, as a file cannot be verified without it.
+        """
+        checksum = self.get_sidecar_checksum(url)
+        if checksum is None:
+            raise ValueError(f"{url} holds no cksum checksum to verify the file against.")
+        return checksum
+
+    def _fetch_stored(self, key, raise_errors=False, **kwargs):
+        """
+        Fetches a file into the store, and registers it under `key`.
+        """
+        kwargs['path'] = self.store.get_directory(key)
+        path = self._fetch(**kwargs) if raise_errors else self.fetch(**kwargs)
+        if path is not None:
+            path = self.store.put(key, path)
+        return path
+
+    def _download_scheduled(self, url, filename, chunk_size=None, resume=False, verify=False):
+        """
+        Downloads `url` through the scheduler, which retries it if the server is overloaded.
+        Returns the `PosixChecksum` of the whole file if `verify`.
+        """
+        def download():
+            # Every attempt starts from a new checksum, as a resumed download adds the
+            # partial file to it.
+            digest = PosixChecksum() if verify else None
+            self._download(url, filename, chunk_size=chunk_size, resume=resume, digest=digest)
+            return digest
+
+        return self.scheduler.run(url, download)
+
+    def _download(self, url, filename, chunk_size=None, resume=False, digest=None):
+        chunk_size = chunk_size or self.chunk_size
+        partial = filename.with_name(filename.name + '.part')
+        offset = partial.stat().st_size if resume and partial.exists() else 0
+
+        try:
+            headers = {'Range': f'bytes={offset}-'} if offset else None
+            response = self.url_opener(url, headers=headers)
         except HTTPError as err:
-            output = format(err)
-            print(output)
+            if err.code != 416:
+                raise
+            # The partial file is either already complete, or larger than the remote file.
+            total = _parse_content_range(err.headers.get('Content-Range'))[1]
+            err.close()
+            if total != offset:
+                partial.unlink()
+                emit('retry', url, reason='range')
+                return self._download(url, filename, chunk_size=chunk_size, resume=resume,
+                                      digest=digest)
+            _update_from_file(digest, partial, chunk_size)
+            os.replace(partial, filename)
+            return
+
+        if response.status == 206:
+            start, expected = _parse_content_range(response.headers.get('Content-Range'))
+            if start != offset:
+                response.close()
+                partial.unlink()
+                emit('retry', url, reason='range')
+                return self._download(url, filename, chunk_size=chunk_size, resume=resume,
+                                      digest=digest)
+
+        logger.debug("Writing %s to %s", url, filename)
+        started = time.perf_counter()
+        try:
+            if response.status == 206:
+                _update_from_file(digest, partial, chunk_size)
+                mode = 'ab'
+            else:
+                # The server ignored the Range request and sent the whole file.
+                offset = 0
+                mode = 'wb'
+                expected = response.headers.get('Content-Length')
+
+            written = 0
+            with open(partial, mode) as file:
+                while True:
+                    chunk = response.read(chunk_size)
+                    if not chunk:
+                        break
+                    file.write(chunk)
+                    written += len(chunk)
+                    if digest is not None:
+                        digest.update(chunk)
+
+            if expected is not None and offset + written != int(expected):
+                raise IncompleteRead(b'', int(expected) - offset - written)
+        except BaseException:
+            if not resume and partial.exists():
+                partial.unlink()
+            raise
+        finally:
+            response.close()
+
+        emit('download', url, time.perf_counter() - started, bytes=written, offset=offset)
+        os.replace(partial, filename)
+
+
+def _update_from_file(digest, path, chunk_size):
+    """
+    Adds the content of an already downloaded part of a file to `digest`.
+    """
+    if digest is None:
+        return
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+
+
+def _parse_content_range(content_range):
+    """
+    Returns the first byte and the total size from a `Content-Range` header,
+    e.g. `bytes 100-199/1000` or `bytes */1000`. Unknown values are `None`.
+    """
+    if not content_range:
+        return None, None
+    span, _, total = content_range.split(' ')[-1].partition('/')
+    start = span.split('-')[0]
+    return (int(start) if start.isdigit() else None,
+            int(total) if total.isdigit() else None)
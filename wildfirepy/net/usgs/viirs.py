@@ -1,5 +1,6 @@
-from wildfirepy.net.usgs.usgs_downloader import AbstractUSGSDownloader
+from wildfirepy.net.usgs.usgs_downloader import AbstractUSGSDownloader, DownloadResult
 from wildfirepy.net.util.usgs import VIIRSHtmlParser
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 
 __all__ = ['VIIRSBurntAreaDownloader']
@@ -10,14 +11,33 @@ class Viirs(AbstractUSGSDownloader):
     Description
     -----------
     An Abstract Base Class Downloader for VIIRS products.
+
+    Parameters
+    ----------
+    product: `str`
+        Name of the VIIRS product.
+    cache: `wildfirepy.net.util.ListingCache`
+        If given, directory listings are read through this on-disk cache.
+    session: `wildfirepy.net.util.EarthdataSession`
+        Session shared by the listing fetches and the downloads.
+        A new `URLOpenerWithRedirect` is created by default.
+    store: `wildfirepy.net.util.TileStore`
+        If given, `h5` files are kept in this local store, and are only
+        downloaded if they are not already in it.
+    scheduler: `wildfirepy.net.util.RequestScheduler`
+        Limits the number of concurrent downloads, and retries those that fail
+        because the server is overloaded. A new one is created by default.
     """
-    def __init__(self, product=''):
-        super().__init__()
+    def __init__(self, product='', cache=None, session=None, store=None, scheduler=None):
+        super().__init__(session=session, store=store, scheduler=scheduler)
         self.product = product
-        self.base_url += "VIIRS/" f'{self.product}.001/'
-        self.regex_traverser = VIIRSHtmlParser(product=product)
+        self.collection = '001'
+        self.base_url += "VIIRS/" f'{self.product}.{self.collection}/'
+        self.regex_traverser = VIIRSHtmlParser(product=product, cache=cache,
+                                               session=self.url_opener)
 
-    def _get_nearest_time(self, hours, minutes):
+    @staticmethod
+    def _get_nearest_time(hours, minutes):
 
         if not 0 <= minutes < 60:
             raise ValueError("Minutes must be between 0 and 60")
@@ -31,7 +51,8 @@ class Viirs(AbstractUSGSDownloader):
 
         return f'{hours}{minutes}'
 
-    def _get_date(self, year, month, date):
+    @staticmethod
+    def _get_date(year, month, date):
         """
 
         """
@@ -46,7 +67,161 @@ class Viirs(AbstractUSGSDownloader):
 
         return f'{year}.{month}.{date}', julian_day
 
-    def get_h5(self, *, year, month, date, hours, minutes, **kwargs):
+    @staticmethod
+    def _get_day(day):
+        return day if isinstance(day, datetime.date) else datetime.date(*day)
+
+    @staticmethod
+    def _get_day_dir(day):
+        return Viirs._get_day(day).strftime('%Y.%m.%d')
+
+    def get_listing(self, year, month, date):
+        """
+        Returns the `wildfirepy.net.util.Listing` of the given day.
+        Listings are memoized by the downloader, until they expire.
+        """
+        return self._get_listing(self._get_date(year=year, month=month, date=date)[0])
+
+    def _get_entry(self, year, month, date, hours, minutes, extension):
+        date, julian_day = self._get_date(year=year, month=month, date=date)
+        time = self._get_nearest_time(hours=hours, minutes=minutes)
+        prefix = f"{self.product}.A{year}{'%03d' % julian_day}.{time}.001."
+        entry = self._get_listing(date).find_prefix(prefix, extension=extension)
+        if entry is None:
+            raise ValueError("No file exists for given time.")
+
+        return date, entry
+
+    def find_granules(self, days, start_time=None, end_time=None, extension='h5', max_workers=8):
+        """
+        Returns the granules acquired within a window of time on each of the given days.
+        The listing of every day is fetched only once, and granules are looked
+        up in it with a binary search over their acquisition times.
+        Parameters
+        ----------
+        days: iterable
+            Days of the observations, as `datetime.date`s or (year, month, date) tuples.
+        start_time: `datetime.time`
+            Start of the window, UTC time. Defaults to the start of the day.
+        end_time: `datetime.time`
+            End of the window, included, UTC time. Defaults to the end of the day.
+        extension: `str`
+            Extension of the files, `h5` or `h5.xml`.
+        max_workers: `int`
+            Maximum number of concurrent listing fetches.
+        Returns
+        -------
+        granules: `list` of `wildfirepy.net.util.ListingEntry`
+            Granules of all the days, in order of day and acquisition time.
+            The error of the first day whose listing cannot be fetched is raised.
+        Examples
+        --------
+        >>> downloader.find_granules([(2020, 2, 1), (2020, 2, 2)],
+        ...                          start_time=datetime.time(6, 0), end_time=datetime.time(11, 30))
+        """
+        granules = []
+        for day, found, error in self._find_granules(days, start_time, end_time, extension,
+                                                     max_workers):
+            if error is not None:
+                raise error
+            granules.extend(found)
+        return granules
+
+    def _find_granules(self, days, start_time, end_time, extension, max_workers):
+        """
+        Returns the day, the granules and the error of the listing fetch of each of the given days,
+        in order. Either the granules or the error is `None`.
+        """
+        # A granule starts every 6 minutes, so the first one of the window may start before it.
+        start = None
+        if start_time is not None:
+            start = self._get_nearest_time(start_time.hour, start_time.minute)
+        end = None if end_time is None else f'{end_time.hour:02d}{end_time.minute:02d}'
+
+        days = sorted({self._get_day(day) for day in days})
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            listings = [pool.submit(self._get_listing, self._get_day_dir(day)) for day in days]
+
+        found = []
+        for day, listing in zip(days, listings):
+            if listing.exception() is not None:
+                found.append((day, None, listing.exception()))
+            else:
+                granules = listing.result().granules(start, end, extension=extension,
+                                                     product=self.product)
+                found.append((day, granules, None))
+        return found
+
+    def get_h5_batch(self, *, days, start_time=None, end_time=None, max_workers=8, **kwargs):
+        """
+        Downloads the `h5` files of all the granules acquired within a window
+        of time on each of the given days, in parallel.
+        Parameters
+        ----------
+        days: iterable
+            Days of the observations, as `datetime.date`s or (year, month, date) tuples.
+        start_time: `datetime.time`
+            Start of the window, UTC time. Defaults to the start of the day.
+        end_time: `datetime.time`
+            End of the window, included, UTC time. Defaults to the end of the day.
+        max_workers: `int`
+            Maximum number of concurrent listing fetches and downloads.
+        kwargs: `dict`
+            keyword arguments to be passed to `AbstractUSGSDownloader.fetch`.
+            If the downloader has a store, files are looked up and saved in the store.
+        Returns
+        -------
+        results: `list` of `wildfirepy.net.usgs.DownloadResult`
+            One result per granule, as returned by `find_granules`, which is
+            the `request` of the result. A day whose listing cannot be fetched,
+            e.g. a day that is not published, has a single result instead,
+            whose `request` is the day, as a `datetime.date`. Errors are
+            reported in the results instead of being raised.
+        """
+        days = self._find_granules(days, start_time, end_time, 'h5', max_workers)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            requests, downloads = [], []
+            for day, granules, error in days:
+                if error is not None:
+                    requests.append(day)
+                    downloads.append(error)
+                    continue
+                for entry in granules:
+                    requests.append(entry)
+                    downloads.append(self._submit_h5(pool, entry, kwargs))
+
+            results = []
+            for request, download in zip(requests, downloads):
+                if isinstance(download, Exception):
+                    results.append(DownloadResult(request, None, download))
+                elif isinstance(download, str):
+                    results.append(DownloadResult(request, download, None))
+                elif download.exception() is not None:
+                    results.append(DownloadResult(request, None, download.exception()))
+                else:
+                    results.append(DownloadResult(request, download.result(), None))
+
+        return results
+
+    def _submit_h5(self, pool, entry, kwargs):
+        """
+        Submits the download of the `h5` file of a granule to `pool`, and returns its future,
+        or returns the path of the file if it is already in the store.
+        """
+        date = datetime.datetime.strptime(entry.date[1:], '%Y%j').strftime('%Y.%m.%d')
+        url = self.base_url + date + '/' + entry.name
+        if self.store is None:
+            return pool.submit(self._fetch, url=url, filename=entry.name, **kwargs)
+
+        key = (self.product, self.collection, entry.date, entry.time, 'h5')
+        path = self.store.get(key)
+        if path is not None:
+            return path
+        return pool.submit(self._fetch_stored, key, url=url, filename=entry.name,
+                           raise_errors=True, **kwargs)
+
+    def get_h5(self, *, year, month, date, hours, minutes, resume=False, verify=False, **kwargs):
         """
         Downloads the `h5` file and stores it on the disk.
 
@@ -62,23 +237,38 @@ class Viirs(AbstractUSGSDownloader):
             Hour of observation. UTC time.
         minutes: `int`
             Minute of observation. UTC time.
+        resume: `bool`
+            If `True`, resumes an interrupted download of the file with an HTTP Range request.
+        verify: `bool`
+            If `True`, the checksum and size of the file, computed while it is
+            downloaded, are checked against its `xml` sidecar, and the download
+            is retried if they do not match. A `ValueError` is raised if the
+            sidecar holds no `cksum` checksum.
         kwargs: `dict`
-            keyword arguments to be passed to `AbstractUSGSDownloader.fetch`
+            keyword arguments to be passed to `AbstractUSGSDownloader.fetch`.
+            If the downloader has a store, the file is saved in the store and `path` is ignored.
 
         Returns
         -------
         path: `str`
             Absolute path to the downloaded `h5` file.
         """
-        date, julian_day = self._get_date(year=year, month=month, date=date)
-        time = self._get_nearest_time(hours=hours, minutes=minutes)
-
-        self.regex_traverser(self.base_url + date)
+        if self.store is not None:
+            julian_day = self._get_date(year=year, month=month, date=date)[1]
+            time = self._get_nearest_time(hours=hours, minutes=minutes)
+            key = (self.product, self.collection, f"A{year}{'%03d' % julian_day}", time, 'h5')
+            path = self.store.get(key)
+            if path is not None:
+                return path
 
-        filename = f"{self.product}.A{year}{'%03d' % julian_day}.{time}.001."
-        filename = self.regex_traverser.get_filename(filename)
+        date, entry = self._get_entry(year, month, date, hours, minutes, extension='h5')
+        filename = entry.name
         url = self.base_url + date + '/' + filename
-        return self.fetch(url=url, filename=filename, **kwargs)
+        if verify:
+            kwargs['checksum'] = self._get_required_checksum(url + '.xml')
+        if self.store is not None:
+            return self._fetch_stored(key, url=url, filename=filename, resume=resume, **kwargs)
+        return self.fetch(url=url, filename=filename, resume=resume, **kwargs)
 
     def get_xml(self, *, year, month, date, hours, minutes, **kwargs):
         """
@@ -104,11 +294,8 @@ class Viirs(AbstractUSGSDownloader):
         path: `str`
             Absolute path to the downloaded `xml` file.
         """
-        date, julian_day = self._get_date(year=year, month=month, date=date)
-        time = self._get_nearest_time(hours=hours, minutes=minutes)
-
-        filename = f"{self.product}.A{year}{'%03d' % julian_day}.{time}.001."
-        filename = self.regex_traverser.get_filename(filename) + '.xml'
+        date, entry = self._get_entry(year, month, date, hours, minutes, extension='h5')
+        filename = entry.name + '.xml'
         url = self.base_url + date + '/' + filename
         return self.fetch(url=url, filename=filename, **kwargs)
 
@@ -118,6 +305,20 @@ class VIIRSBurntAreaDownloader(Viirs):
     Description
     -----------
     VIIRS Class for `VNP03MODLL`, i.e., Burnt Area.
+
+    Parameters
+    ----------
+    cache: `wildfirepy.net.util.ListingCache`
+        If given, directory listings are read through this on-disk cache.
+    session: `wildfirepy.net.util.EarthdataSession`
+        Session shared by the listing fetches and the downloads.
+    store: `wildfirepy.net.util.TileStore`
+        If given, `h5` files are kept in this local store, and are only
+        downloaded if they are not already in it.
+    scheduler: `wildfirepy.net.util.RequestScheduler`
+        Limits the number of concurrent downloads, and retries those that fail
+        because the server is overloaded. A new one is created by default.
     """
-    def __init__(self):
-        super().__init__(product="VNP03MODLL")
+    def __init__(self, cache=None, session=None, store=None, scheduler=None):
+        super().__init__(product="VNP03MODLL", cache=cache, session=session, store=store,
+                         scheduler=scheduler)
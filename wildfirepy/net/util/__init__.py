@@ -1,3 +1,32 @@
-from wildfirepy.net.util.usgs import *
+import importlib
 
-__all__ = ['usgs']
+__all__ = ['usgs', 'cache', 'listing', 'aio', 'session', 'store', 'checksum', 'mirror',
+           'instrument', 'scheduler']
+
+# Submodule defining each public name. Submodules are imported on first use, so that
+# `requests`, `asyncio` and `http.server` are only loaded by the code that needs them.
+_names = {'URLOpenerWithRedirect': 'usgs', 'MODISHtmlParser': 'usgs', 'VIIRSHtmlParser': 'usgs',
+          'ListingCache': 'cache',
+          'ListingEntry': 'listing', 'Listing': 'listing', 'parse_listing': 'listing',
+          'AsyncURLOpenerWithRedirect': 'aio', 'AsyncHtmlParser': 'aio',
+          'EarthdataSession': 'session',
+          'TileStore': 'store',
+          'PosixChecksum': 'checksum', 'parse_sidecar': 'checksum',
+          'USGSMirror': 'mirror',
+          'Event': 'instrument', 'add_hook': 'instrument', 'remove_hook': 'instrument',
+          'emit': 'instrument', 'timed': 'instrument', 'StageAggregator': 'instrument',
+          'RequestScheduler': 'scheduler'}
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _names:
+        value = getattr(importlib.import_module(f'{__name__}.{_names[name]}'), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_names))
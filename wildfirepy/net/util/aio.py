@@ -0,0 +1,179 @@
+from wildfirepy.net.util.instrument import emit
+from wildfirepy.net.util.listing import parse_listing
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+import asyncio
+import base64
+import functools
+import time
+
+__all__ = ['AsyncURLOpenerWithRedirect', 'AsyncHtmlParser']
+
+
+class AsyncURLOpenerWithRedirect:
+    """
+    Description
+    -----------
+    An `asyncio` counterpart of `URLOpenerWithRedirect`, based on `aiohttp`.
+    Follows the login redirects itself, sending the credentials only to the
+    host of `top_level_url`, and keeps the resulting cookies in a cookie jar
+    shared by all requests. Connections are pooled, so thousands of requests
+    can be in flight on a single event loop.
+
+    Parameters
+    ----------
+    username: `str`
+        The login username required to open the URL.
+    password: `str`
+        The login password required to open the URL.
+    top_level_url: `str`
+        Base URL that leads to the login redirects.
+    limit: `int`
+        Maximum number of simultaneous connections.
+
+    Returns
+    -------
+    response: `aiohttp.ClientResponse`
+        When awaited with a URL, returns the response object for the URL.
+        Responses with an error status raise `urllib.error.HTTPError`,
+        like `URLOpenerWithRedirect`.
+
+    Examples
+    --------
+    >>> async with AsyncURLOpenerWithRedirect() as opener:
+    ...     response = await opener(url)
+    ...     content = await response.read()
+    """
+    MAX_REDIRECTS = 10
+
+    def __init__(self, *, username='RaahulSingh', password='WildFire_Bad.100',
+                 top_level_url="https://urs.earthdata.nasa.gov/", limit=100):
+        self.auth_host = urlsplit(top_level_url).hostname
+        self.authorization = 'Basic ' + base64.b64encode(f'{username}:{password}'.encode()).decode()
+        self.limit = limit
+        self.session = None
+
+    def _get_session(self):
+        if self.session is None:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError("The asyncio download engine requires `aiohttp` "
+                                  "to be installed.") from None
+
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.limit),
+                                                 cookie_jar=aiohttp.CookieJar(unsafe=True))
+        return self.session
+
+    async def __call__(self, url, headers=None):
+        session = self._get_session()
+        started = time.perf_counter()
+        for _ in range(self.MAX_REDIRECTS + 1):
+            request_headers = dict(headers or {})
+            if urlsplit(url).hostname == self.auth_host:
+                request_headers['Authorization'] = self.authorization
+            response = await session.get(url, headers=request_headers, allow_redirects=False)
+
+            if response.status in (301, 302, 303, 307, 308) and 'Location' in response.headers:
+                location = urljoin(url, response.headers['Location'])
+                emit('redirect', url, code=response.status, location=location)
+                url = location
+                response.release()
+                continue
+
+            if response.status >= 300:
+                response.release()
+                raise HTTPError(url, response.status, response.reason, response.headers, None)
+            emit('ttfb', url, time.perf_counter() - started, status=response.status)
+            return response
+
+        raise HTTPError(url, response.status, "Too many redirects", response.headers, None)
+
+    async def close(self):
+        """
+        Closes all the pooled connections.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+class AsyncHtmlParser:
+    """
+    Description
+    -----------
+    An `asyncio` counterpart of `MODISHtmlParser` and `VIIRSHtmlParser`.
+    Fetches directory pages of the USGS data server as `wildfirepy.net.util.Listing`s.
+    Concurrent requests for the same page share a single fetch. The reads and
+    writes of the on-disk cache run in the default executor of the event
+    loop, so that they do not block it.
+
+    Parameters
+    ----------
+    product: `str`
+        Name of the product.
+    cache: `wildfirepy.net.util.ListingCache`
+        If given, pages are read through this on-disk cache.
+    url_opener: `AsyncURLOpenerWithRedirect`
+        Opener used to fetch the pages. A new one is created by default.
+    """
+    def __init__(self, product='', cache=None, url_opener=None):
+        self.product = product
+        self.cache = cache
+        self.url_opener = AsyncURLOpenerWithRedirect() if url_opener is None else url_opener
+        self._pending = {}
+
+    async def get_listing(self, url):
+        """
+        Returns the page at `url` as a `wildfirepy.net.util.Listing`.
+        """
+        task = self._pending.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._get_listing(url))
+            self._pending[url] = task
+            task.add_done_callback(lambda _: self._pending.pop(url, None))
+        return await asyncio.shield(task)
+
+    async def _get_listing(self, url):
+        return parse_listing((await self._read_page(url)).decode('cp1252'), url)
+
+    async def _read_page(self, url):
+        headers = None
+        if self.cache is not None:
+            content = await _run_in_executor(self.cache.get_fresh, url)
+            if content is not None:
+                return content
+            headers = await _run_in_executor(self.cache.get_revalidation_headers, url)
+
+        try:
+            response = await self.url_opener(url, headers=headers)
+        except HTTPError as err:
+            if self.cache is None or err.code != 304:
+                raise
+            content = await _run_in_executor(self.cache.refresh, url)
+            if content is not None:
+                return content
+            # The page was removed from the cache since the conditional request was made.
+            response = await self.url_opener(url)
+
+        content = await response.read()
+        response.release()
+        if self.cache is not None:
+            await _run_in_executor(self.cache.store, url, content,
+                                   etag=response.headers.get('ETag'),
+                                   last_modified=response.headers.get('Last-Modified'))
+        return content
+
+
+def _run_in_executor(function, *args, **kwargs):
+    """
+    Runs a blocking call, e.g. to the file system, in the default executor of the running loop.
+    """
+    call = functools.partial(function, *args, **kwargs)
+    return asyncio.get_running_loop().run_in_executor(None, call)
@@ -0,0 +1,196 @@
+from wildfirepy.net.util.instrument import emit
+from pathlib import Path
+from urllib.error import HTTPError
+import datetime
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+__all__ = ['ListingCache']
+
+
+class ListingCache:
+    """
+    Description
+    -----------
+    A persistent, on-disk cache for the HTML directory listings of the USGS data server.
+
+    Pages are keyed by URL. A cached page is served without any network access
+    while it is younger than its time-to-live; after that it is revalidated
+    with a conditional request (`If-None-Match`/`If-Modified-Since`), so an
+    unchanged page is not downloaded again.
+
+    Pages whose URL contains a date (e.g. `.../2020.02.01/`) older than
+    `historical_after` use `historical_ttl` instead, which by default never expires.
+
+    Parameters
+    ----------
+    path: `str`
+        Directory in which the cached pages are stored.
+        Defaults to `~/.wildfirepy/listings`.
+    ttl: `float`
+        Time-to-live of recent pages, in seconds.
+    historical_ttl: `float` or `None`
+        Time-to-live of historical pages, in seconds. `None` means they never expire.
+    historical_after: `datetime.timedelta`
+        Age of the date in the URL after which a page is considered historical.
+
+    Examples
+    --------
+    >>> cache = ListingCache(ttl=600)
+    >>> parser = MODISHtmlParser(product="MCD64A1", cache=cache)
+    """
+    DATE_PATTERN = re.compile(r'(\d{4})\.(\d{2})\.(\d{2})')
+
+    def __init__(self, path=None, ttl=3600, historical_ttl=None,
+                 historical_after=datetime.timedelta(days=180)):
+        self.path = Path.home() / '.wildfirepy' / 'listings' if path is None else Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.historical_ttl = historical_ttl
+        self.historical_after = historical_after
+
+    def get_ttl(self, url):
+        """
+        Returns the time-to-live, in seconds, of the page at `url`, or `None` if it never expires.
+        """
+        match = self.DATE_PATTERN.search(url)
+        if match is None:
+            return self.ttl
+
+        date = datetime.datetime(*map(int, match.groups()))
+        if datetime.datetime.now() - date > self.historical_after:
+            return self.historical_ttl
+        return self.ttl
+
+    def get(self, url, url_opener):
+        """
+        Returns the content of the page at `url`, as `bytes`.
+        Parameters
+        ----------
+        url: `str`
+            URL of the page.
+        url_opener: `wildfirepy.net.util.URLOpenerWithRedirect`
+            Opener used when the page has to be downloaded or revalidated.
+        """
+        content = self.get_fresh(url)
+        if content is not None:
+            return content
+
+        try:
+            response = url_opener(url, headers=self.get_revalidation_headers(url))
+        except HTTPError as err:
+            if err.code != 304:
+                raise
+            content = self.refresh(url)
+            if content is not None:
+                return content
+            # The page was removed from the cache since the conditional request was made.
+            response = url_opener(url)
+
+        content = response.read()
+        self.store(url, content, etag=response.headers.get('ETag'),
+                   last_modified=response.headers.get('Last-Modified'))
+        response.close()
+        return content
+
+    def get_fresh(self, url):
+        """
+        Returns the cached content of the page at `url` if it has not expired, else `None`.
+        """
+        meta, content = self._load(url)
+        if meta is not None:
+            ttl = self.get_ttl(url)
+            if ttl is None or time.time() - meta['fetched'] < ttl:
+                emit('cache_hit', url)
+                return content
+        emit('cache_miss', url)
+        return None
+
+    def get_revalidation_headers(self, url):
+        """
+        Returns the headers of a conditional request for the page at `url`.
+        """
+        meta, _ = self._load(url)
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def refresh(self, url):
+        """
+        Marks the cached page at `url` as just revalidated and returns its content.
+        To be used when the server answers a conditional request with `304 Not Modified`.
+        Returns `None` if the page is no longer in the cache, e.g. because it was
+        invalidated meanwhile, in which case it has to be fetched again.
+        """
+        meta, content = self._load(url)
+        if meta is None:
+            return None
+        meta['fetched'] = time.time()
+        self._write(self._key(url) + '.json', json.dumps(meta).encode())
+        emit('cache_revalidated', url)
+        return content
+
+    def store(self, url, content, etag=None, last_modified=None):
+        """
+        Stores the content of the page at `url`, with its validators.
+        """
+        meta = {'url': url,
+                'fetched': time.time(),
+                'etag': etag,
+                'last_modified': last_modified}
+        key = self._key(url)
+        # Content goes first, so that metadata never points to a missing page.
+        self._write(key + '.html', content)
+        self._write(key + '.json', json.dumps(meta).encode())
+
+    def invalidate(self, url):
+        """
+        Removes the page at `url` from the cache.
+        """
+        key = self._key(url)
+        for suffix in ('.json', '.html'):
+            try:
+                os.remove(self.path / (key + suffix))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """
+        Removes all pages from the cache.
+        """
+        for file in self.path.iterdir():
+            if file.suffix in ('.json', '.html'):
+                file.unlink()
+
+    def _key(self, url):
+        return hashlib.sha1(url.encode()).hexdigest()
+
+    def _load(self, url):
+        key = self._key(url)
+        try:
+            meta = json.loads((self.path / (key + '.json')).read_text())
+            content = (self.path / (key + '.html')).read_bytes()
+        except (FileNotFoundError, ValueError):
+            return None, None
+
+        if meta.get('url') != url:
+            return None, None
+        return meta, content
+
+    def _write(self, name, data):
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp, self.path / name)
+        except BaseException:
+            os.remove(tmp)
+            raise
@@ -0,0 +1,80 @@
+from xml.dom import minidom
+import binascii
+
+__all__ = ['PosixChecksum', 'parse_sidecar']
+
+# Bit-reversed value of every byte.
+_REVERSED = bytes(int(f'{i:08b}'[::-1], 2) for i in range(256))
+
+
+def _reverse32(value):
+    return int(f'{value:032b}'[::-1], 2)
+
+
+class PosixChecksum:
+    """
+    Description
+    -----------
+    Incremental POSIX `cksum` CRC, as listed in the `Checksum` field of the
+    `xml` sidecar files of the USGS data server.
+
+    The CRC is computed with the C implementation of `binascii.crc32`, by
+    reversing the bits of every byte, so it keeps up with network transfers.
+
+    Examples
+    --------
+    >>> digest = PosixChecksum()
+    >>> digest.update(b'hello world\\n')
+    >>> digest.checksum, digest.size
+    (3733384285, 12)
+    """
+    def __init__(self):
+        self._crc = 0xFFFFFFFF
+        self.size = 0
+
+    def update(self, data):
+        """
+        Adds `data` to the checksum.
+        """
+        self._crc = binascii.crc32(data.translate(_REVERSED), self._crc)
+        self.size += len(data)
+
+    @property
+    def checksum(self):
+        """
+        The `cksum` CRC of all the data added so far.
+        """
+        # cksum also feeds the length of the data, least significant byte first.
+        length = self.size
+        trailer = bytearray()
+        while length:
+            trailer.append(length & 0xFF)
+            length >>= 8
+        crc = binascii.crc32(bytes(trailer).translate(_REVERSED), self._crc)
+        return ~_reverse32(crc ^ 0xFFFFFFFF) & 0xFFFFFFFF
+
+
+def parse_sidecar(content):
+    """
+    Returns the checksum and the size of a file from the content of its `xml` sidecar.
+    Parameters
+    ----------
+    content: `bytes`
+        Content of the `xml` file.
+    Returns
+    -------
+    checksum, size: `int`
+        `None` if the sidecar does not hold a `cksum` checksum.
+    """
+    xml_data = minidom.parseString(content)
+
+    checksum_type = xml_data.getElementsByTagName('ChecksumType')
+    if checksum_type and checksum_type[0].firstChild.nodeValue.strip().upper() != 'CKSUM':
+        return None
+    checksum = xml_data.getElementsByTagName('Checksum')
+    if not checksum:
+        return None
+
+    checksum = checksum[0].firstChild.nodeValue
+    filesize = xml_data.getElementsByTagName('FileSize')[0].firstChild.nodeValue
+    return int(checksum), int(filesize)
@@ -0,0 +1,158 @@
+from collections import Counter, defaultdict, namedtuple
+from contextlib import contextmanager
+import threading
+import time
+
+__all__ = ['Event', 'add_hook', 'remove_hook', 'emit', 'timed', 'StageAggregator']
+
+Event = namedtuple('Event', ['stage', 'url', 'duration', 'bytes', 'details'])
+Event.__doc__ = """
+A measurement emitted by the network layer.
+
+`stage` is one of:
+
+- `connect`: DNS lookup and TCP (and TLS) connection of a new connection.
+- `redirect`: a redirect was followed; `details` holds its `code` and `location`.
+- `auth`: a request was sent again with the login credentials.
+- `ttfb`: time to the response headers of a request, redirects included.
+- `download`: a file was streamed to disk; `bytes` is the amount transferred.
+- `parse`: a directory page was parsed.
+- `cache_hit`, `cache_miss`, `cache_revalidated`: a directory page was looked up in a
+  `ListingCache`.
+- `retry`: a download was started over; `details` holds the `reason`.
+- `error`: a download failed; `details` holds the `error`.
+
+`duration` is in seconds, and is `None` for events that are only counted.
+Timed stages that failed hold the exception in the `error` of their `details`.
+"""
+
+_hooks = []
+
+
+def add_hook(hook):
+    """
+    Registers `hook`, a callable that is called with every `Event`, and returns it.
+    Hooks are called in the thread that emits the event, so they should be quick.
+    """
+    _hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook):
+    """
+    Unregisters a hook registered with `add_hook`.
+    """
+    _hooks.remove(hook)
+
+
+def emit(stage, url=None, duration=None, bytes=None, **details):
+    """
+    Sends an `Event` to all the registered hooks.
+    """
+    if not _hooks:
+        return
+    event = Event(stage, url, duration, bytes, details)
+    for hook in list(_hooks):
+        hook(event)
+
+
+@contextmanager
+def timed(stage, url=None, **details):
+    """
+    Emits an `Event` for `stage` with the duration of the `with` block.
+    The `dict` of details is yielded, so that the block can add to it,
+    e.g. the number of `bytes` transferred. If the block raises, the
+    exception is added to the details as `error`, and is propagated.
+    """
+    started = time.perf_counter()
+    try:
+        yield details
+    except BaseException as err:
+        details['error'] = err
+        raise
+    finally:
+        emit(stage, url, time.perf_counter() - started, **details)
+
+
+class StageAggregator:
+    """
+    Description
+    -----------
+    A hook that collects the events of every stage and reports their
+    count, number of errors, latency percentiles, bytes transferred and throughput.
+    Can be used as a context manager, which registers it while the block runs.
+
+    Examples
+    --------
+    >>> with StageAggregator() as stages:
+    ...     downloader.get_batch(requests)
+    >>> stages.report()['ttfb']['p99']
+    >>> print(stages.summary())
+    """
+    def __init__(self):
+        self.counts = Counter()
+        self.errors = Counter()
+        self.bytes = Counter()
+        self.durations = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        with self._lock:
+            self.counts[event.stage] += 1
+            if 'error' in event.details:
+                self.errors[event.stage] += 1
+            if event.duration is not None:
+                self.durations[event.stage].append(event.duration)
+            if event.bytes:
+                self.bytes[event.stage] += event.bytes
+
+    def __enter__(self):
+        return add_hook(self)
+
+    def __exit__(self, *exc_info):
+        remove_hook(self)
+
+    def report(self):
+        """
+        Returns a `dict` of statistics for every stage: `count`, `errors`, `p50`
+        and `p99` latency in seconds, and, for stages that transfer data, `bytes`
+        and `throughput` in bytes per second.
+        """
+        import numpy as np
+
+        with self._lock:
+            report = {}
+            for stage, count in self.counts.items():
+                stats = {'count': count, 'errors': self.errors[stage]}
+                durations = self.durations.get(stage)
+                if durations:
+                    stats['p50'], stats['p99'] = np.percentile(durations, [50, 99]).tolist()
+                if self.bytes[stage]:
+                    stats['bytes'] = self.bytes[stage]
+                    if durations and sum(durations):
+                        stats['throughput'] = self.bytes[stage] / sum(durations)
+                report[stage] = stats
+            return report
+
+    def summary(self):
+        """
+        Returns the report as a table.
+        """
+        lines = [f"{'stage':20s} {'count':>8s} {'p50 (ms)':>10s} {'p99 (ms)':>10s} {'MB/s':>10s}"]
+        for stage, stats in sorted(self.report().items()):
+            p50 = f"{stats['p50'] * 1000:10.2f}" if 'p50' in stats else f"{'-':>10s}"
+            p99 = f"{stats['p99'] * 1000:10.2f}" if 'p99' in stats else f"{'-':>10s}"
+            throughput = (f"{stats['throughput'] / 1024 ** 2:10.2f}" if 'throughput' in stats
+                          else f"{'-':>10s}")
+            lines.append(f"{stage:20s} {stats['count']:8d} {p50} {p99} {throughput}")
+        return '\n'.join(lines)
+
+    def clear(self):
+        """
+        Drops all the collected events.
+        """
+        with self._lock:
+            self.counts.clear()
+            self.errors.clear()
+            self.bytes.clear()
+            self.durations.clear()
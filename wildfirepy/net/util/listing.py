@@ -0,0 +1,200 @@
+from wildfirepy.net.util.instrument import timed
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+import datetime
+import re
+
+__all__ = ['ListingEntry', 'Listing', 'parse_listing']
+
+ListingEntry = namedtuple('ListingEntry', ['name', 'product', 'date', 'tile', 'time', 'collection',
+                                           'production', 'extension', 'size', 'modified'])
+ListingEntry.__doc__ = """
+A file on a directory page of the USGS data server.
+
+`date` is the acquisition date as it appears in the name (e.g. `A2020032`),
+`tile` is the MODIS tile (e.g. `h35v10`) and `time` the VIIRS granule time
+(e.g. `0642`); whichever does not apply is `None`. `size` is in bytes and,
+like `modified`, is `None` if the page does not show it.
+"""
+
+_HREF = re.compile(r'href="([^"?/][^"]*)"')
+_TAG = re.compile(r'<[^>]*>')
+_MODIFIED = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}(?::\d{2})?)\s+(\d+(?:\.\d+)?)([KMGT]?)\b')
+_DIRECTORY = re.compile(r'^(\d{4}\.\d{2}\.\d{2})/$')
+_FILENAME = re.compile(r'^(?:BROWSE\.)?(?P<product>[A-Za-z0-9_]+)\.(?P<date>A\d{7})\.'
+                       r'(?:(?P<tile>h\d{2}v\d{2})|(?P<time>\d{4}))\.(?P<collection>\d{3})\.'
+                       r'(?P<production>\d{13})\.(?:\d+\.)?(?P<extension>[a-z0-9]+(?:\.xml)?)$')
+_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+class Listing:
+    """
+    Description
+    -----------
+    Structured model of a directory page of the USGS data server.
+
+    The page is scanned once; files are then indexed by tile (or granule time)
+    and extension, their names are kept sorted for prefix lookups, and VIIRS
+    granules are kept sorted by acquisition time for range queries,
+    so queries never rescan the page.
+
+    Parameters
+    ----------
+    entries: iterable of `ListingEntry`
+        Files on the page.
+    dates: iterable of `str`
+        Date directories on the page, e.g. `2020.02.01`.
+
+    Examples
+    --------
+    >>> listing = Listing.from_html(html)
+    >>> listing.get(tile='h35v10', extension='hdf').name
+    """
+    def __init__(self, entries=(), dates=()):
+        self.entries = list(entries)
+        self.dates = list(dates)
+        self._index = {}
+        for entry in self.entries:
+            self._index.setdefault((entry.tile or entry.time, entry.extension), []).append(entry)
+        self._names = sorted(entry.name for entry in self.entries)
+        self._by_name = {entry.name: entry for entry in self.entries}
+        self._granules = {}
+        for entry in sorted((entry for entry in self.entries if entry.time is not None),
+                            key=lambda entry: (entry.time, entry.name)):
+            times, granules = self._granules.setdefault(entry.extension, ([], []))
+            times.append(entry.time)
+            granules.append(entry)
+
+    @classmethod
+    def from_html(cls, html):
+        """
+        Parses the HTML content of a directory page.
+        """
+        entries = []
+        dates = []
+        matches = list(_HREF.finditer(html))
+        for i, match in enumerate(matches):
+            name = match.group(1)
+            directory = _DIRECTORY.match(name)
+            if directory:
+                dates.append(directory.group(1))
+                continue
+
+            fields = _FILENAME.match(name)
+            if fields is None:
+                continue
+
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(html)
+            tail = _TAG.sub(' ', html[match.end():end])
+            size = modified = None
+            details = _MODIFIED.search(tail)
+            if details:
+                modified = details.group(1)
+                modified = datetime.datetime.strptime(
+                    modified, '%Y-%m-%d %H:%M:%S' if len(modified) > 16 else '%Y-%m-%d %H:%M')
+                size = int(float(details.group(2)) * _UNITS[details.group(3)])
+
+            entries.append(ListingEntry(name=name, size=size, modified=modified,
+                                        **fields.groupdict()))
+
+        return cls(entries, dates)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    def files(self, product=None, extension=None):
+        """
+        Returns list of entries, optionally filtered by product and extension.
+        """
+        return [entry for entry in self.entries
+                if (product is None or entry.product == product) and
+                (extension is None or entry.extension == extension)]
+
+    def get(self, *, tile=None, time=None, extension, product=None, date=None):
+        """
+        Returns the entry of a MODIS tile or a VIIRS granule, or `None` if it does not exist.
+        Parameters
+        ----------
+        tile: `str`
+            MODIS tile, e.g. `h35v10`.
+        time: `str`
+            VIIRS granule time, e.g. `0642`.
+        extension: `str`
+            Extension of the file, e.g. `hdf`, `hdf.xml` or `jpg`.
+        product: `str`
+            Name of the product. Only needed if the page holds several products.
+        date: `str`
+            Acquisition date, e.g. `A2020032`. Only needed if the page holds several dates.
+        """
+        for entry in self._index.get((tile or time, extension), ()):
+            if ((product is None or entry.product == product) and
+                    (date is None or entry.date == date)):
+                return entry
+        return None
+
+    def tiles(self, product=None, extension='hdf'):
+        """
+        Returns list of (h, v) pairs of the MODIS tiles on the page.
+        """
+        return [(int(entry.tile[1:3]), int(entry.tile[4:6]))
+                for entry in self.files(product, extension) if entry.tile is not None]
+
+    def granules(self, start=None, end=None, extension='h5', product=None):
+        """
+        Returns the entries of the VIIRS granules acquired between `start` and `end`,
+        both included, sorted by acquisition time.
+        Parameters
+        ----------
+        start: `str`
+            Earliest granule time, e.g. `0600`. Defaults to the start of the day.
+        end: `str`
+            Latest granule time, e.g. `1130`. Defaults to the end of the day.
+        extension: `str`
+            Extension of the files, e.g. `h5` or `h5.xml`.
+        product: `str`
+            Name of the product. Only needed if the page holds several products.
+        """
+        times, granules = self._granules.get(extension, ((), ()))
+        lower = 0 if start is None else bisect_left(times, start)
+        upper = len(times) if end is None else bisect_right(times, end)
+        return [entry for entry in granules[lower:upper]
+                if product is None or entry.product == product]
+
+    def find_prefix(self, prefix, extension=None):
+        """
+        Returns the first entry, in name order, whose name starts with `prefix`,
+        or `None` if there is none.
+        """
+        i = bisect_left(self._names, prefix)
+        while i < len(self._names) and self._names[i].startswith(prefix):
+            entry = self._by_name[self._names[i]]
+            if extension is None or entry.extension == extension:
+                return entry
+            i += 1
+        return None
+
+
+def parse_listing(html, url=None):
+    """
+    Parses a directory page of the USGS data server, and emits a `parse` event.
+    Parameters
+    ----------
+    html: `str`
+        Content of the page.
+    url: `str`
+        URL of the page, for the event.
+    Returns
+    -------
+    listing: `Listing`
+        The files and date directories of the page.
+    """
+    with timed('parse', url) as details:
+        listing = Listing.from_html(html)
+        details['files'] = len(listing)
+    return listing
@@ -0,0 +1,452 @@
+from wildfirepy.net.util.checksum import PosixChecksum
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, quote
+import base64
+import datetime
+import hashlib
+import re
+import threading
+import time
+import zlib
+
+__all__ = ['USGSMirror']
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+_SIDECAR = """<?xml version="1.0" encoding="UTF-8"?>
+<GranuleMetaDataFile>
+  <GranuleURMetaData>
+    <GranuleUR>{name}</GranuleUR>
+    <DataFiles>
+      <DataFileContainer>
+        <DistributedFileName>{name}</DistributedFileName>
+        <FileSize>{size:012d}</FileSize>
+        <ChecksumType>CKSUM</ChecksumType>
+        <Checksum>{checksum:010d}</Checksum>
+        <ChecksumOrigin>PDR</ChecksumOrigin>
+      </DataFileContainer>
+    </DataFiles>
+  </GranuleURMetaData>
+</GranuleMetaDataFile>
+"""
+
+
+class USGSMirror:
+    """
+    Description
+    -----------
+    A local stand-in for the USGS data server, for tests and benchmarks.
+
+    Serves Apache-style directory listings of synthetic MODIS and VIIRS
+    granules, with their `xml` sidecars, over HTTP/1.1 with keep-alive.
+    Granule contents are generated from their names, on first request, so
+    thousands of granules can be listed without being held in memory.
+    Range requests and `If-None-Match` revalidation are supported, and a
+    latency before every response and a bandwidth limit can be set. Like an
+    overloaded server, the mirror can answer requests beyond `max_requests`
+    at once with `429 Too Many Requests`, fail the next requests of a path
+    with `fail`, and drop their connections half way through with `interrupt`.
+    With `login`, requests without the session cookie are redirected to a
+    Basic authentication endpoint, like the Earthdata login does.
+    The requests received are counted by path in `hits`, and recorded with
+    their headers in `requests`; the client addresses of the connections are
+    kept in `connections`, and the number of body bytes sent in `sent`.
+
+    Parameters
+    ----------
+    latency: `float`
+        Delay, in seconds, before every response is sent.
+    bandwidth: `int`
+        Maximum number of bytes sent per second on each connection. Unlimited by default.
+    login: `bool`
+        If `True`, requests are redirected to `/login` until they carry the session cookie.
+    username: `str`
+        Username expected by `/login`.
+    password: `str`
+        Password expected by `/login`.
+    max_requests: `int`
+        Maximum number of requests served at once. Unlimited by default.
+    retry_after: `int`
+        `Retry-After` delay, in seconds, sent with the `429` and `503` responses.
+        No `Retry-After` header is sent by default.
+    ranges: `bool`
+        If `False`, Range headers are ignored and whole files are sent, like
+        servers without support for them do.
+
+    Examples
+    --------
+    >>> with USGSMirror(latency=0.05, login=True) as mirror:
+    ...     mirror.add_modis(months=[(2020, 2)])
+    ...     session = URLOpenerWithRedirect(top_level_url=mirror.url)
+    ...     downloader = ModisBurntAreaDownloader(session=session)
+    ...     downloader.base_url = mirror.url + '/MOTA/MCD64A1.006/'
+    ...     downloader.get_hdf(year=2020, month=2, latitude=28.7041, longitude=77.1025)
+    """
+    COOKIE = 'session=authenticated'
+    MODIFIED = '2020-04-11 13:59'
+
+    def __init__(self, *, latency=0.0, bandwidth=None, login=False,
+                 username='RaahulSingh', password='WildFire_Bad.100', max_requests=None,
+                 retry_after=None, ranges=True):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.login = login
+        self.authorization = 'Basic ' + base64.b64encode(f'{username}:{password}'.encode()).decode()
+        self.max_requests = max_requests
+        self.retry_after = retry_after
+        self.ranges = ranges
+        self.files = {}
+        self.hits = Counter()
+        self.requests = []
+        self.connections = set()
+        self.sent = 0
+        self.rejected = 0
+        self.active = 0
+        self.failures = {}
+        self.interruptions = Counter()
+        self._lock = threading.Lock()
+
+        self.httpd = _Server(('127.0.0.1', 0), _handler(self))
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Stops the server.
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def add_file(self, path, content):
+        """
+        Serves `content` under `path`. `content` is either `bytes`, or the size of
+        a synthetic file generated from its name.
+        """
+        if not isinstance(content, (bytes, _Synthetic)):
+            content = _Synthetic(path.rsplit('/', 1)[-1], content)
+        self.files[path] = content
+
+    def get_content(self, path):
+        """
+        Returns the content served under `path`, or `None` if there is none.
+        """
+        content = self.files.get(path)
+        if isinstance(content, _Synthetic):
+            with self._lock:
+                content = self.files[path]
+                if isinstance(content, _Synthetic):
+                    content = self.files[path] = content()
+        return content
+
+    def fail(self, path, status=503, count=1):
+        """
+        Answers the next `count` requests of `path` with the error `status`.
+        """
+        with self._lock:
+            self.failures[path] = [status] * count
+
+    def interrupt(self, path, count=1):
+        """
+        Drops the connection half way through the body of the next `count` responses of `path`.
+        """
+        with self._lock:
+            self.interruptions[path] = count
+
+    def _record(self, path, client, headers):
+        with self._lock:
+            self.hits[path] += 1
+            self.requests.append((path, headers))
+            self.connections.add(client)
+
+    def _is_interrupted(self, path):
+        with self._lock:
+            if self.interruptions[path] > 0:
+                self.interruptions[path] -= 1
+                return True
+            return False
+
+    def _count_sent(self, size):
+        with self._lock:
+            self.sent += size
+
+    def _start_request(self, path):
+        """
+        Returns the error status to answer a new request of `path` with, if any.
+        """
+        with self._lock:
+            failures = self.failures.get(path)
+            if failures:
+                return failures.pop()
+            if self.max_requests is not None and self.active >= self.max_requests:
+                self.rejected += 1
+                return 429
+            self.active += 1
+
+    def _end_request(self):
+        with self._lock:
+            self.active -= 1
+
+    def add_directory(self, path, files):
+        """
+        Serves `files`, a `dict` of names and contents, and their listing under `path`.
+        Contents are either `bytes`, or the sizes of synthetic files generated
+        from their names. Names ending with `/` are listed as subdirectories.
+        """
+        rows = ['<tr><th><a href="?C=N;O=D">Name</a></th>'
+                '<th><a href="?C=M;O=A">Last modified</a></th>'
+                '<th><a href="?C=S;O=A">Size</a></th></tr>',
+                '<tr><td><a href="/">Parent Directory</a></td>'
+                '<td>&nbsp;</td><td align="right">  - </td></tr>']
+        for name, content in sorted(files.items()):
+            if name.endswith('/'):
+                size = '  - '
+            else:
+                if not isinstance(content, (bytes, _Synthetic)):
+                    content = _Synthetic(name, content)
+                self.files[path + name] = content
+                size = len(content) if isinstance(content, bytes) else content.size
+            rows.append(f'<tr><td><a href="{name}">{name}</a></td>'
+                        f'<td align="right">{self.MODIFIED}  </td>'
+                        f'<td align="right">{size}</td></tr>')
+
+        page = '<html><body><table>\n' + '\n'.join(rows) + '\n</table></body></html>'
+        self.files[path] = page.encode()
+
+    def add_modis(self, *, months, product='MCD64A1', collection='006', data='MOTA', tiles=None,
+                  size=64 * 1024):
+        """
+        Serves monthly listings of synthetic MODIS tiles.
+        Parameters
+        ----------
+        months: iterable
+            (year, month) pairs of the months.
+        product: `str`
+            Name of the product.
+        collection: `str`
+            Collection of the product.
+        data: `str`
+            Name of the directory of the data server containing the product.
+        tiles: iterable
+            (h, v) pairs of the tiles. Defaults to all the tiles on the globe.
+        size: `int`
+            Size of every granule, in bytes.
+        Returns
+        -------
+        url: `str`
+            URL of the directory of the product.
+        """
+        if tiles is None:
+            from wildfirepy.coordinates.tiles import get_tile_index
+            tiles = get_tile_index().valid_tiles()
+        tiles = list(tiles)
+
+        root = f'/{data}/{product}.{collection}/'
+        dates = {}
+        for year, month in months:
+            julian_day = datetime.date(year, month, 1).timetuple().tm_yday
+            dates[f'{year}.{month:02d}.01/'] = None
+            files = {}
+            date = f'A{year}{julian_day:03d}'
+            for h, v in tiles:
+                stem = f'{product}.{date}.h{h:02d}v{v:02d}.{collection}.{date[1:]}000000'
+                files[stem + '.hdf'] = size
+                files[stem + '.hdf.xml'] = _Sidecar(stem + '.hdf', size)
+                files[f'BROWSE.{stem}.1.jpg'] = size // 16
+            self.add_directory(root + f'{year}.{month:02d}.01/', files)
+
+        self._add_root(root, dates)
+        return self.url + root
+
+    def add_viirs(self, *, days, product='VNP03MODLL', collection='001', times=None,
+                  size=64 * 1024):
+        """
+        Serves daily listings of synthetic VIIRS granules.
+        Parameters
+        ----------
+        days: iterable
+            `datetime.date`s of the days.
+        product: `str`
+            Name of the product.
+        collection: `str`
+            Collection of the product.
+        times: iterable of `str`
+            Times of the granules, e.g. `0642`. Defaults to the 240 granules of a day.
+        size: `int`
+            Size of every granule, in bytes.
+        Returns
+        -------
+        url: `str`
+            URL of the directory of the product.
+        """
+        times = [f'{minutes // 60:02d}{minutes % 60:02d}' for minutes in range(0, 24 * 60, 6)] \
+            if times is None else list(times)
+
+        root = f'/VIIRS/{product}.{collection}/'
+        dates = {}
+        for day in days:
+            julian_day = day.timetuple().tm_yday
+            dates[day.strftime('%Y.%m.%d/')] = None
+            files = {}
+            date = f'A{day.year}{julian_day:03d}'
+            for granule_time in times:
+                name = f'{product}.{date}.{granule_time}.{collection}.{date[1:]}000000.h5'
+                files[name] = size
+                files[name + '.xml'] = _Sidecar(name, size)
+            self.add_directory(root + day.strftime('%Y.%m.%d/'), files)
+
+        self._add_root(root, dates)
+        return self.url + root
+
+    def _add_root(self, root, dates):
+        listing = self.files.get(root)
+        if listing is not None:
+            existing = re.findall(r'href="(\d{4}\.\d{2}\.\d{2}/)"', listing.decode())
+            dates.update(dict.fromkeys(existing))
+        self.add_directory(root, dates)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Benchmarks open many connections at once.
+    request_queue_size = 128
+
+
+class _Synthetic:
+    """
+    Deterministic content of a synthetic file, generated from its name.
+    """
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+    def __call__(self):
+        block = hashlib.sha256(self.name.encode()).digest() * 128
+        return (block * (self.size // len(block) + 1))[:self.size]
+
+
+class _Sidecar(_Synthetic):
+    """
+    `xml` sidecar of a synthetic granule, holding its size and `cksum` checksum.
+    """
+    def __init__(self, name, granule_size):
+        super().__init__(name, len(_SIDECAR.format(name=name, size=0, checksum=0)))
+        self.granule_size = granule_size
+
+    def __call__(self):
+        digest = PosixChecksum()
+        digest.update(_Synthetic(self.name, self.granule_size)())
+        return _SIDECAR.format(name=self.name, size=self.granule_size,
+                               checksum=digest.checksum).encode()
+
+
+def _handler(mirror):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            mirror._record(self.path, self.client_address, self.headers)
+            url = urlsplit(self.path)
+            status = mirror._start_request(url.path)
+            if status is not None:
+                return self.send_failure(status)
+            try:
+                if mirror.latency:
+                    time.sleep(mirror.latency)
+                self.serve(url)
+            finally:
+                mirror._end_request()
+
+        def serve(self, url):
+            if mirror.login and url.path == '/login':
+                return self.authenticate(parse_qs(url.query).get('next', ['/'])[0])
+            if mirror.login and mirror.COOKIE not in (self.headers.get('Cookie') or ''):
+                return self.redirect('/login?next=' + quote(self.path), cookie=False)
+
+            content = mirror.get_content(url.path)
+            if content is None:
+                return self.send_error(404)
+
+            etag = f'"{zlib.crc32(content):08x}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+
+            start, end = 0, len(content)
+            requested = mirror.ranges and _RANGE.match(self.headers.get('Range') or '')
+            if requested and requested.group(1):
+                start = int(requested.group(1))
+                if requested.group(2):
+                    end = min(int(requested.group(2)) + 1, len(content))
+                if start >= len(content):
+                    self.send_response(416)
+                    self.send_header('Content-Range', f'bytes */{len(content)}')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end - 1}/{len(content)}')
+            else:
+                self.send_response(200)
+            self.send_header('Content-Length', str(end - start))
+            self.send_header('ETag', etag)
+            self.end_headers()
+            body = content[start:end]
+            if mirror._is_interrupted(url.path):
+                body = body[:len(body) // 2]
+                self.close_connection = True
+            self.send_body(body)
+
+        def send_failure(self, status):
+            self.send_response(status)
+            if mirror.retry_after is not None and status in (429, 503):
+                self.send_header('Retry-After', str(mirror.retry_after))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def send_body(self, body):
+            # Counted first, as the client may be done before the write returns.
+            mirror._count_sent(len(body))
+            if not mirror.bandwidth:
+                self.wfile.write(body)
+                return
+
+            chunk_size = max(mirror.bandwidth // 100, 1)
+            started = time.perf_counter()
+            for offset in range(0, len(body), chunk_size):
+                self.wfile.write(body[offset:offset + chunk_size])
+                delay = (offset + chunk_size) / mirror.bandwidth - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+
+        def authenticate(self, target):
+            if self.headers.get('Authorization') != mirror.authorization:
+                self.send_response(401)
+                self.send_header('WWW-Authenticate',
+                                 'Basic realm="Please enter your Earthdata Login credentials"')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.redirect(target, cookie=True)
+
+        def redirect(self, location, cookie):
+            self.send_response(302)
+            self.send_header('Location', location)
+            if cookie:
+                self.send_header('Set-Cookie', mirror.COOKIE + '; Path=/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
@@ -0,0 +1,207 @@
+from wildfirepy.net.util.instrument import emit
+from urllib.error import HTTPError, URLError
+from http.client import IncompleteRead
+from email.utils import parsedate_to_datetime
+import datetime
+import logging
+import random
+import sys
+import threading
+import time
+
+__all__ = ['RequestScheduler']
+
+logger = logging.getLogger(__name__)
+
+# Errors of connections that are refused, reset, time out or drop in the middle of a response,
+# as raised by `urllib`.
+_CONNECTION_ERRORS = (URLError, ConnectionError, TimeoutError, IncompleteRead)
+
+
+class RequestScheduler:
+    """
+    Description
+    -----------
+    Runs requests with a limit on the number of concurrent connections, and
+    retries those that fail because the server is overloaded.
+
+    Requests answered with one of `retry_statuses`, and those whose connection
+    is refused, reset, times out or drops in the middle of the response, with
+    `urllib` or with `requests`, are retried after an exponential backoff
+    with full jitter, or after the delay of the `Retry-After` header of the
+    response, if it is longer. A `Retry-After` delay holds back every request
+    of the scheduler, not only the one that received it.
+
+    The limit is adapted to the server with additive increase, multiplicative
+    decrease: every successful request raises it by `1 / limit`, i.e. by one
+    connection once a whole limit of requests succeeded, and every failure
+    multiplies it by `decrease`. Only failures of requests started after the
+    last decrease lower it again, so that a burst of failures caused by the
+    same overload halves the limit once, instead of collapsing it to
+    `min_connections`. Throughput then stays close to the most the server
+    accepts, instead of oscillating between overload and idle connections.
+
+    Parameters
+    ----------
+    max_connections: `int`
+        Maximum, and initial, number of concurrent requests.
+    min_connections: `int`
+        Number of concurrent requests the limit never goes below.
+    retries: `int`
+        Number of times a failed request is retried, before its error is raised.
+    backoff: `float`
+        Base delay, in seconds, of the exponential backoff.
+    max_backoff: `float`
+        Maximum delay, in seconds, of the exponential backoff.
+    decrease: `float`
+        Factor the limit is multiplied by when requests fail.
+    retry_statuses: `tuple`
+        HTTP status codes of the responses that are retried.
+
+    Examples
+    --------
+    >>> scheduler = RequestScheduler(max_connections=8)
+    >>> downloader = ModisBurntAreaDownloader(scheduler=scheduler)
+    >>> downloader.get_batch(requests, max_workers=32)
+    >>> scheduler.connections
+    """
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_connections=16, min_connections=1, retries=5, backoff=1.0,
+                 max_backoff=60.0, decrease=0.5, retry_statuses=RETRY_STATUSES):
+        self.max_connections = max_connections
+        self.min_connections = min_connections
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.decrease = decrease
+        self.retry_statuses = retry_statuses
+        self.active = 0
+        self._limit = float(max_connections)
+        self._decreased_at = float('-inf')
+        self._resume_at = float('-inf')
+        self._condition = threading.Condition()
+
+    @property
+    def connections(self):
+        """
+        Current limit on the number of concurrent requests.
+        """
+        return max(int(self._limit), self.min_connections)
+
+    def run(self, url, function, *args, **kwargs):
+        """
+        Calls `function(*args, **kwargs)`, a request to `url`, once the limit
+        allows it, and retries it if it fails because the server is overloaded.
+        Parameters
+        ----------
+        url: `str`
+            URL requested by `function`, for the `retry` events.
+        function: callable
+            Makes the request. It is called again from the start on every retry.
+        Returns
+        -------
+        result:
+            Value returned by `function`.
+        """
+        for attempt in range(self.retries + 1):
+            started = self._acquire()
+            try:
+                result = function(*args, **kwargs)
+            except BaseException as err:
+                # Errors that do not come from an overloaded server, e.g. a `404`, or an
+                # interrupt, release the connection without changing the limit.
+                retry = isinstance(err, Exception) and self.is_retryable(err)
+                self._release(started, failed=True if retry else None)
+                if not retry or attempt == self.retries:
+                    raise
+                delay = self._get_delay(attempt, err)
+                if isinstance(err, HTTPError):
+                    err.close()
+                emit('retry', url, reason=_get_reason(err), attempt=attempt + 1, delay=delay)
+                logger.debug("Retrying %s in %.2fs after %s", url, delay, err)
+                time.sleep(delay)
+            else:
+                self._release(started, failed=False)
+                return result
+
+    def is_retryable(self, err):
+        """
+        Returns `True` if a request that raised `err` should be retried.
+        """
+        if isinstance(err, HTTPError):
+            return err.code in self.retry_statuses
+        return isinstance(err, _CONNECTION_ERRORS + _get_requests_errors())
+
+    def _acquire(self):
+        with self._condition:
+            while True:
+                wait = self._resume_at - time.monotonic()
+                if wait <= 0 and self.active < self.connections:
+                    break
+                self._condition.wait(wait if wait > 0 else None)
+            self.active += 1
+            return time.monotonic()
+
+    def _release(self, started, failed):
+        """
+        Frees the connection of a request, and raises the limit if the request
+        succeeded, or lowers it if it `failed` because of an overload. With
+        `failed=None`, the limit is left unchanged.
+        """
+        with self._condition:
+            self.active -= 1
+            if failed is False:
+                self._limit = min(self._limit + 1 / self._limit, self.max_connections)
+            elif failed and started > self._decreased_at:
+                self._limit = max(self._limit * self.decrease, self.min_connections)
+                self._decreased_at = time.monotonic()
+            self._condition.notify_all()
+
+    def _get_delay(self, attempt, err):
+        delay = random.uniform(0, min(self.backoff * 2 ** attempt, self.max_backoff))
+        retry_after = _get_retry_after(err)
+        if retry_after is not None:
+            with self._condition:
+                self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+            delay = max(delay, retry_after)
+        return delay
+
+
+def _get_retry_after(err):
+    """
+    Returns the delay, in seconds, of the `Retry-After` header of an `HTTPError`,
+    which is either a number of seconds or an HTTP date, or `None` if there is none.
+    """
+    value = err.headers.get('Retry-After') if isinstance(err, HTTPError) and err.headers else None
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return max((date - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
+
+
+def _get_requests_errors():
+    """
+    Returns the connection errors raised by the `requests` based `EarthdataSession`.
+    `requests` is not imported for them: if it is not imported yet, none of
+    its errors can have been raised.
+    """
+    requests = sys.modules.get('requests')
+    urllib3 = sys.modules.get('urllib3')
+    if requests is None or urllib3 is None:
+        return ()
+    return (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.Timeout, urllib3.exceptions.ProtocolError,
+            urllib3.exceptions.TimeoutError)
+
+
+def _get_reason(err):
+    return err.code if isinstance(err, HTTPError) else type(err).__name__
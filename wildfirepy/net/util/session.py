@@ -0,0 +1,140 @@
+from wildfirepy.net.util.instrument import emit
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from http.cookiejar import LWPCookieJar
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+import requests
+import time
+
+__all__ = ['EarthdataSession']
+
+
+class EarthdataSession:
+    """
+    Description
+    -----------
+    A `requests` based HTTP session that can be shared by all the parsers and
+    downloaders, in place of their own `URLOpenerWithRedirect`.
+
+    Connections are kept alive and pooled, so the listing fetches and the
+    downloads reuse the same TCP/TLS connections, and the login redirect is
+    only followed once: its cookies are kept in a single cookie store,
+    which can be saved to a file and loaded by other processes.
+    Like `URLOpenerWithRedirect`, the credentials are sent only to the host of
+    `top_level_url`, and error responses raise `urllib.error.HTTPError`.
+
+    Parameters
+    ----------
+    username: `str`
+        The login username required to open the URL.
+    password: `str`
+        The login password required to open the URL.
+    top_level_url: `str`
+        Base URL that leads to the login redirects.
+    pool_size: `int`
+        Maximum number of connections kept alive per host.
+    cookie_file: `str`
+        If given, cookies are loaded from this file, if it exists,
+        and `save_cookies` writes them back to it.
+
+    Returns
+    -------
+    response:
+        When called with a URL, returns a response object with the `status`,
+        `headers`, `read` and `close` members of `http.client.HTTPResponse`.
+
+    Examples
+    --------
+    >>> session = EarthdataSession(cookie_file='~/.wildfirepy/cookies.txt')
+    >>> modis = ModisBurntAreaDownloader(session=session)
+    >>> viirs = VIIRSBurntAreaDownloader(session=session)
+    >>> session.save_cookies()
+    """
+    def __init__(self, *, username='RaahulSingh', password='WildFire_Bad.100',
+                 top_level_url="https://urs.earthdata.nasa.gov/", pool_size=10, cookie_file=None):
+        self.session = _RedirectAuthSession(urlsplit(top_level_url).hostname, (username, password))
+        # Downloads are written as received, so compression is not requested.
+        self.session.headers['Accept-Encoding'] = 'identity'
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.cookie_file = None if cookie_file is None else Path(cookie_file).expanduser()
+        self.session.cookies = LWPCookieJar()
+        if self.cookie_file is not None and self.cookie_file.exists():
+            self.session.cookies.load(self.cookie_file.as_posix(), ignore_discard=True)
+
+    def __call__(self, url, headers=None):
+        auth = self.session.login if urlsplit(url).hostname == self.session.auth_host else None
+        started = time.perf_counter()
+        response = self.session.get(url, headers=headers, auth=auth, stream=True)
+        for redirect in response.history:
+            emit('redirect', redirect.url, code=redirect.status_code,
+                 location=redirect.headers.get('Location'))
+        if response.status_code >= 300:
+            response.close()
+            raise HTTPError(response.url, response.status_code, response.reason,
+                            response.headers, None)
+        emit('ttfb', url, time.perf_counter() - started, status=response.status_code)
+        return _SessionResponse(response)
+
+    def save_cookies(self, cookie_file=None):
+        """
+        Saves the cookies, including the login session cookies, to `cookie_file`.
+        Defaults to the file given when creating the session.
+        """
+        cookie_file = self.cookie_file if cookie_file is None else Path(cookie_file).expanduser()
+        if cookie_file is None:
+            raise ValueError("No cookie file given.")
+        cookie_file.parent.mkdir(parents=True, exist_ok=True)
+        self.session.cookies.save(cookie_file.as_posix(), ignore_discard=True)
+
+    def close(self):
+        """
+        Closes all the pooled connections.
+        """
+        self.session.close()
+
+
+class _RedirectAuthSession(requests.Session):
+    """
+    `requests.Session` that sends the credentials on redirects to the login host.
+    """
+    def __init__(self, auth_host, login):
+        super().__init__()
+        self.auth_host = auth_host
+        self.login = login
+
+    def rebuild_auth(self, prepared_request, response):
+        # requests drops the credentials on redirects to another host,
+        # but the login redirect leads to exactly that host.
+        prepared_request.headers.pop('Authorization', None)
+        if urlsplit(prepared_request.url).hostname == self.auth_host:
+            prepared_request.prepare_auth(self.login)
+
+
+class _SessionResponse:
+    """
+    Adapts a streamed `requests.Response` to the interface of `http.client.HTTPResponse`.
+    """
+    def __init__(self, response):
+        self.response = response
+        self.status = response.status_code
+        self.reason = response.reason
+        self.headers = response.headers
+        self.url = response.url
+        self.exhausted = False
+
+    def read(self, amt=None):
+        data = self.response.raw.read(amt)
+        if amt is None or not data:
+            self.exhausted = True
+        return data
+
+    def close(self):
+        if self.exhausted:
+            # The connection goes back to the pool only if the body was read completely.
+            self.response.raw.release_conn()
+        else:
+            self.response.close()
@@ -0,0 +1,175 @@
+from pathlib import Path
+import json
+import os
+import tempfile
+import threading
+import time
+
+__all__ = ['TileStore']
+
+
+class TileStore:
+    """
+    Description
+    -----------
+    A managed local store of downloaded granules, with a disk budget.
+
+    Files are keyed by (product, collection, date, tile or granule time,
+    extension), e.g. `('MCD64A1', '006', 'A2020032', 'h24v06', 'hdf')`, and are
+    kept under `root/product/collection/date/`. An index file records their
+    sizes and last access times; when the store grows beyond `max_bytes`,
+    the least recently used files are deleted.
+    Looking a file up costs a dictionary lookup and a `stat` call; the access
+    times it updates are written to the index with the next `put`, `remove`,
+    `save` or `close`.
+
+    Parameters
+    ----------
+    root: `str`
+        Directory of the store. Defaults to `~/.wildfirepy/tiles`.
+    max_bytes: `int`
+        Disk budget of the store, in bytes. `None` means unlimited.
+
+    Examples
+    --------
+    >>> with TileStore(max_bytes=10 * 1024 ** 3) as store:
+    ...     downloader = ModisBurntAreaDownloader(store=store)
+    ...     downloader.get_hdf(year=2020, month=2, latitude=28.7041, longitude=77.1025)
+    """
+    INDEX = 'index.json'
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = Path.home() / '.wildfirepy' / 'tiles' if root is None else Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Whether the index has changes, e.g. access times, that are not on disk yet.
+        self._dirty = False
+        try:
+            self._index = json.loads((self.root / self.INDEX).read_text())
+        except (FileNotFoundError, ValueError):
+            self._index = {}
+
+    @staticmethod
+    def _key(key):
+        return '/'.join(key)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def total_bytes(self):
+        """
+        Total size of the stored files, in bytes.
+        """
+        return sum(entry['size'] for entry in self._index.values())
+
+    def get(self, key):
+        """
+        Returns the absolute path of the file stored under `key`, or `None` if there is none.
+        """
+        with self._lock:
+            entry = self._index.get(self._key(key))
+            if entry is None:
+                return None
+
+            path = self.root / entry['path']
+            if not path.exists():
+                del self._index[self._key(key)]
+                self._dirty = True
+                return None
+
+            entry['last_access'] = time.time()
+            self._dirty = True
+            return path.absolute().as_posix()
+
+    def get_directory(self, key):
+        """
+        Returns the directory in which the file for `key` is to be downloaded.
+        """
+        directory = self.root.joinpath(*key[:3])
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory.as_posix()
+
+    def put(self, key, path):
+        """
+        Registers the file at `path`, which must be inside the store, under `key`,
+        and evicts the least recently used files if the store is over budget.
+        Returns the absolute path of the file.
+        """
+        path = Path(path).absolute()
+        with self._lock:
+            relative = path.relative_to(self.root.absolute()).as_posix()
+            self._index[self._key(key)] = {'path': relative,
+                                           'size': path.stat().st_size,
+                                           'last_access': time.time()}
+            self._evict(keep=self._key(key))
+            self._save()
+        return path.as_posix()
+
+    def remove(self, key):
+        """
+        Deletes the file stored under `key`.
+        """
+        with self._lock:
+            self._remove(self._key(key))
+            self._save()
+
+    def clear(self):
+        """
+        Deletes all the stored files.
+        """
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+            self._save()
+
+    def save(self):
+        """
+        Writes the index, including the latest access times, to disk.
+        """
+        with self._lock:
+            self._save()
+
+    def close(self):
+        """
+        Writes the index to disk if it has changed since it was last saved.
+        """
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _remove(self, key):
+        entry = self._index.pop(key)
+        try:
+            os.remove(self.root / entry['path'])
+        except FileNotFoundError:
+            pass
+
+    def _evict(self, keep):
+        if self.max_bytes is None:
+            return
+
+        total = sum(entry['size'] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                total -= self._index[key]['size']
+                self._remove(key)
+
+    def _save(self):
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(self._index, file)
+        os.replace(tmp, self.root / self.INDEX)
+        self._dirty = False
@@ -1,9 +1,13 @@
 import urllib
 import urllib.request
 from urllib.request import HTTPPasswordMgrWithDefaultRealm
-from urllib.request import HTTPBasicAuthHandler, HTTPCookieProcessor
+from urllib.request import HTTPBasicAuthHandler, HTTPCookieProcessor, HTTPRedirectHandler
+from urllib.request import HTTPHandler, HTTPSHandler
+from http.client import HTTPConnection, HTTPSConnection
 from http.cookiejar import CookieJar
-import re
+from wildfirepy.net.util.listing import parse_listing
+from wildfirepy.net.util.instrument import emit, timed
+import time
 
 __all__ = ['URLOpenerWithRedirect', 'MODISHtmlParser', 'VIIRSHtmlParser']
 
@@ -13,7 +17,9 @@ class URLOpenerWithRedirect:
     -----------
     A `urllib` based URL opener for URLs that require Login Authentication
     and lead to redirects.
-    Creates a minimal opener with a HTTP Password Manager, and a HTTP CookieJar
+    Creates a minimal opener with a HTTP Password Manager, and a HTTP CookieJar.
+    New connections, redirects, logins and the time to the response headers
+    are reported as `wildfirepy.net.util.instrument.Event`s.
 
     Parameters
     ----------
@@ -46,12 +52,70 @@ class URLOpenerWithRedirect:
 
         auth_manager = HTTPPasswordMgrWithDefaultRealm()
         auth_manager.add_password(None, top_level_url, username, password)
-        handler = HTTPBasicAuthHandler(auth_manager)
-        self.opener = urllib.request.build_opener(handler, HTTPCookieProcessor(CookieJar()))
+        handler = _TimedBasicAuthHandler(auth_manager)
+        self.opener = urllib.request.build_opener(handler, HTTPCookieProcessor(CookieJar()),
+                                                  _TimedRedirectHandler(), _TimedHTTPHandler(),
+                                                  _TimedHTTPSHandler())
         # TODO: Get an organisation username and password.
 
-    def __call__(self, url):
-        return self.opener.open(url)
+    def __call__(self, url, headers=None):
+        request = urllib.request.Request(url, headers=headers or {})
+        with timed('ttfb', url) as details:
+            response = self.opener.open(request)
+            details['status'] = response.status
+        return response
+
+
+class _TimedHTTPConnection(HTTPConnection):
+
+    def connect(self):
+        with timed('connect', f'http://{self.host}:{self.port}'):
+            super().connect()
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+
+    def connect(self):
+        with timed('connect', f'https://{self.host}:{self.port}'):
+            super().connect()
+
+
+class _TimedHTTPHandler(HTTPHandler):
+
+    def http_open(self, req):
+        return self.do_open(_TimedHTTPConnection, req)
+
+
+class _TimedHTTPSHandler(HTTPSHandler):
+
+    def https_open(self, req):
+        return self.do_open(_TimedHTTPSConnection, req, context=self._context)
+
+
+class _TimedRedirectHandler(HTTPRedirectHandler):
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        emit('redirect', req.full_url, code=code, location=newurl)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+class _TimedBasicAuthHandler(HTTPBasicAuthHandler):
+
+    def http_error_401(self, req, fp, code, msg, headers):
+        started = time.perf_counter()
+        response = super().http_error_401(req, fp, code, msg, headers)
+        emit('auth', req.full_url, time.perf_counter() - started)
+        return response
+
+
+def _read_page(url, url_opener, cache=None):
+    if cache is not None:
+        content = cache.get(url, url_opener)
+    else:
+        response = url_opener(url)
+        content = response.read()
+        response.close()
+    return content.decode('cp1252')
 
 
 class MODISHtmlParser:
@@ -59,32 +123,58 @@ class MODISHtmlParser:
     Description
     -----------
     A Regex based HTML parser for USGS MODIS data server.
-    When called with a URL, stores the HTML page as an `str`.
+    When called with a URL, stores the HTML page as an `str`,
+    and parses it once into a `wildfirepy.net.util.Listing`.
+    Pages fetched with `get_listing` are not stored, and can be passed to
+    `get_filename`, so that a parser can be shared by threads.
+
+    Parameters
+    ----------
+    product: `str`
+        Name of the MODIS product.
+    cache: `wildfirepy.net.util.cache.ListingCache`
+        If given, HTML pages are read through this on-disk cache.
+    session: `wildfirepy.net.util.EarthdataSession`
+        Session, or opener, used to fetch the pages.
+        A new `URLOpenerWithRedirect` is created by default.
     """
-    def __init__(self, product=''):
-        self.url_opener = URLOpenerWithRedirect()
+    def __init__(self, product='', cache=None, session=None):
+        self.url_opener = URLOpenerWithRedirect() if session is None else session
         self.product = product
+        self.cache = cache
 
     def __call__(self, url):
-        self.html_content = self.url_opener(url).read().decode('cp1252')
+        self.html_content = _read_page(url, self.url_opener, self.cache)
+        self.listing = parse_listing(self.html_content, url)
+
+    def get_listing(self, url):
+        """
+        Returns the page at `url` as a `wildfirepy.net.util.Listing`,
+        without changing the page stored by the parser.
+        """
+        return parse_listing(_read_page(url, self.url_opener, self.cache), url)
+
+    def _get_names(self, extension):
+        product = self.product or None
+        return [entry.name for entry in self.listing.files(product=product, extension=extension)]
 
     def get_all_hdf_files(self):
         """
         Returns list of all `hdf` files available for download.
         """
-        return re.findall(r'' + f'href="({self.product}.*hdf)"', self.html_content)
+        return self._get_names('hdf')
 
     def get_all_jpg_files(self):
         """
         Returns list of all `jpg` files available for download.
         """
-        return re.findall(r'href="(BROWSE.*jpg)"', self.html_content)
+        return self._get_names('jpg')
 
     def get_all_xml_files(self):
         """
         Returns list of all `xml` files available for download.
         """
-        return re.findall(r'' + f'href="({self.product}.*hdf.xml)"', self.html_content)
+        return self._get_names('hdf.xml')
 
     def get_all_files(self):
         """
@@ -96,9 +186,9 @@ class MODISHtmlParser:
         """
         Returns list of all `dates` from which files can be downloaded.
         """
-        return re.findall(r'"(2.*)/"', self.html_content)
+        return list(self.listing.dates)
 
-    def get_filename(self, h, v):
+    def get_filename(self, h, v, listing=None):
         """
         Returns full name of the file based on the Sinusoidal Grid coordinates.
         Parameters
@@ -107,6 +197,9 @@ class MODISHtmlParser:
             Sinusoidal grid longitude
         v: `int`
             Sinusoidal grid latitude
+        listing: `wildfirepy.net.util.Listing`
+            Listing to look the file up in, e.g. from `get_listing`.
+            Defaults to the page stored by the last call of the parser.
         References
         ----------
         [1] https://modis-land.gsfc.nasa.gov/MODLAND_grid.html
@@ -114,13 +207,12 @@ class MODISHtmlParser:
         h = str(h) if h > 9 else "0" + str(h)
         v = str(v) if v > 9 else "0" + str(v)
 
-        r = re.compile(r'.*' + f'.(h{h}v{v}).')
-
-        match = list(filter(r.match, self.get_all_hdf_files()))
-        if len(match) == 0:
+        listing = self.listing if listing is None else listing
+        entry = listing.get(tile=f'h{h}v{v}', extension='hdf', product=self.product or None)
+        if entry is None:
             raise ValueError("No file exists for given coordinates.")
 
-        return match[0]
+        return entry.name
 
 
 class VIIRSHtmlParser:
@@ -128,13 +220,50 @@ class VIIRSHtmlParser:
     Description
     -----------
     A Regex based HTML parser for USGS VIIRS data server.
-    When called with a URL, stores the HTML page as an `str`.
+    When called with a URL, stores the HTML page as an `str`,
+    and parses it once into a `wildfirepy.net.util.Listing`.
+    Pages fetched with `get_listing` are not stored, and can be passed to
+    `get_filename`, so that a parser can be shared by threads.
+
+    Parameters
+    ----------
+    product: `str`
+        Name of the VIIRS product.
+    cache: `wildfirepy.net.util.cache.ListingCache`
+        If given, HTML pages are read through this on-disk cache.
+    session: `wildfirepy.net.util.EarthdataSession`
+        Session, or opener, used to fetch the pages.
+        A new `URLOpenerWithRedirect` is created by default.
     """
-    def __init__(self, product=''):
-        self.url_opener = URLOpenerWithRedirect()
+    def __init__(self, product='', cache=None, session=None):
+        self.url_opener = URLOpenerWithRedirect() if session is None else session
+        self.cache = cache
 
     def __call__(self, url):
-        self.html_content = self.url_opener(url).read().decode('cp1252')
+        self.html_content = _read_page(url, self.url_opener, self.cache)
+        self.listing = parse_listing(self.html_content, url)
+
+    def get_listing(self, url):
+        """
+        Returns the page at `url` as a `wildfirepy.net.util.Listing`,
+        without changing the page stored by the parser.
+        """
+        return parse_listing(_read_page(url, self.url_opener, self.cache), url)
+
+    def get_filename(self, partial, listing=None):
+        """
+        Returns full name of the `h5` file whose name starts with `partial`.
+        Parameters
+        ----------
+        partial: `str`
+            Beginning of the name of the file, e.g. `VNP03MODLL.A2020032.0642.001.`
+        listing: `wildfirepy.net.util.Listing`
+            Listing to look the file up in, e.g. from `get_listing`.
+            Defaults to the page stored by the last call of the parser.
+        """
+        listing = self.listing if listing is None else listing
+        entry = listing.find_prefix(partial, extension='h5')
+        if entry is None:
+            raise ValueError("No file exists for given time.")
 
-    def get_filename(self, partial):
-        return re.findall(r'' + f'>({partial}.*h5)', self.html_content)[0]
+        return entry.name
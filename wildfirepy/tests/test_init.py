@@ -0,0 +1,55 @@
+from pathlib import Path
+import subprocess
+import sys
+import pytest
+import wildfirepy
+
+
+def test_import_is_lazy():
+    code = ("import sys, wildfirepy; "
+            "print(sorted(m for m in ('pyproj', 'numpy', 'requests', 'wildfirepy.net') "
+            "if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True,
+                            cwd=Path(wildfirepy.__file__).parents[1]).stdout
+
+    assert loaded.decode().strip() == '[]'
+
+
+def test_downloader_import_is_light():
+    code = ("import sys; from wildfirepy.net.usgs import ModisBurntAreaDownloader; "
+            "print(sorted(m for m in ('requests', 'asyncio', 'http.server', "
+            "'wildfirepy.io.mosaic', 'wildfirepy.net.usgs.viirs') if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True,
+                            cwd=Path(wildfirepy.__file__).parents[1]).stdout
+
+    assert loaded.decode().strip() == '[]'
+
+
+def test_subpackages_are_loaded_on_access():
+    from wildfirepy.net.usgs import ModisBurntAreaDownloader
+
+    assert wildfirepy.net.usgs.ModisBurntAreaDownloader is ModisBurntAreaDownloader
+    assert wildfirepy.coordinates.util.SinusoidalCoordinate
+    assert {'net', 'coordinates', 'io'} <= set(dir(wildfirepy))
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        wildfirepy.missing
+
+
+def test_version_is_looked_up_once(monkeypatch):
+    import importlib.metadata
+
+    calls = []
+    monkeypatch.setattr(importlib.metadata, 'version', lambda name: calls.append(name) or '1.0')
+    monkeypatch.setattr(wildfirepy, '_version_looked_up', False)
+    version = vars(wildfirepy).pop('__version__', None)
+    try:
+        assert wildfirepy.__version__ == '1.0'
+        assert wildfirepy.__version__ == '1.0'
+        assert calls == ['wildfirepy']
+    finally:
+        vars(wildfirepy).pop('__version__')
+        if version is not None:
+            wildfirepy.__version__ = version